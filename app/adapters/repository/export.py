@@ -8,9 +8,25 @@ import pyarrow as pa  # type: ignore
 import pyarrow.parquet as pq  # type: ignore
 
 from app.utils.log import Log
+from app.utils.tracing import Tracer
 from app.utils.tz import enforce_utc
 
 
+class AbstractSynthesisWriter(ABC):
+    """
+    Escritor de uma síntese produzida em partes, como os cenários
+    de um caso, que são escritas sucessivamente na mesma saída.
+    """
+
+    @abstractmethod
+    def write(self, df: pd.DataFrame):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
 class AbstractExportRepository(ABC):
     def __init__(self) -> None:
         super().__init__()
@@ -23,6 +39,57 @@ class AbstractExportRepository(ABC):
     def synthetize_df(self, df: pd.DataFrame, filename: str):
         pass
 
+    @abstractmethod
+    def open_writer(self, filename: str) -> AbstractSynthesisWriter:
+        pass
+
+
+class ParquetSynthesisWriter(AbstractSynthesisWriter):
+    """
+    Escreve cada parte da síntese como um grupo de linhas
+    do mesmo arquivo Parquet.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.__path = path
+        self.__writer: pq.ParquetWriter | None = None
+
+    def write(self, df: pd.DataFrame):
+        with Tracer.span("escrita", arquivo=self.__path.name) as span:
+            size = self.__size()
+            if self.__writer is None:
+                table = pa.Table.from_pandas(
+                    enforce_utc(df), preserve_index=False
+                )
+                self.__writer = pq.ParquetWriter(
+                    self.__path,
+                    table.schema,
+                    write_statistics=False,
+                    flavor="spark",
+                    coerce_timestamps="ms",
+                    allow_truncated_timestamps=True,
+                )
+                span.set(colunas=len(df.columns))
+            else:
+                table = pa.Table.from_pandas(
+                    enforce_utc(df),
+                    schema=self.__writer.schema,
+                    preserve_index=False,
+                )
+            self.__writer.write_table(table, row_group_size=len(df))
+            if Tracer.active():
+                span.set(linhas=len(df), bytes=self.__size() - size)
+
+    def __size(self) -> int:
+        if not Tracer.active() or not self.__path.exists():
+            return 0
+        return os.path.getsize(self.__path)
+
+    def close(self):
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+
 
 class ParquetExportRepository(AbstractExportRepository):
     def __init__(self, path: str):
@@ -40,16 +107,54 @@ class ParquetExportRepository(AbstractExportRepository):
             return None
 
     def synthetize_df(self, df: pd.DataFrame, filename: str):
-        pq.write_table(
-            pa.Table.from_pandas(enforce_utc(df)),
-            self.path.joinpath(filename + ".parquet"),
-            write_statistics=False,
-            flavor="spark",
-            coerce_timestamps="ms",
-            allow_truncated_timestamps=True,
-        )
+        path = self.path.joinpath(filename + ".parquet")
+        with Tracer.span("escrita", arquivo=path.name) as span:
+            pq.write_table(
+                pa.Table.from_pandas(enforce_utc(df)),
+                path,
+                write_statistics=False,
+                flavor="spark",
+                coerce_timestamps="ms",
+                allow_truncated_timestamps=True,
+            )
+            if Tracer.active():
+                span.set(
+                    linhas=len(df),
+                    colunas=len(df.columns),
+                    bytes=os.path.getsize(path),
+                )
         return True
 
+    def open_writer(self, filename: str) -> AbstractSynthesisWriter:
+        return ParquetSynthesisWriter(self.path.joinpath(filename + ".parquet"))
+
+
+class CSVSynthesisWriter(AbstractSynthesisWriter):
+    """
+    Escreve as partes da síntese sucessivamente no mesmo
+    arquivo CSV, com o cabeçalho apenas na primeira parte.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.__path = path
+        self.__header = True
+
+    def write(self, df: pd.DataFrame):
+        with Tracer.span("escrita", arquivo=self.__path.name) as span:
+            enforce_utc(df).to_csv(
+                self.__path,
+                index=False,
+                mode="w" if self.__header else "a",
+                header=self.__header,
+            )
+            if self.__header:
+                span.set(colunas=len(df.columns))
+            self.__header = False
+            span.set(linhas=len(df))
+
+    def close(self):
+        pass
+
 
 class CSVExportRepository(AbstractExportRepository):
     def __init__(self, path: str):
@@ -67,9 +172,39 @@ class CSVExportRepository(AbstractExportRepository):
             return None
 
     def synthetize_df(self, df: pd.DataFrame, filename: str):
-        enforce_utc(df).to_csv(
-            self.path.joinpath(filename + ".csv"), index=False
-        )
+        path = self.path.joinpath(filename + ".csv")
+        with Tracer.span("escrita", arquivo=path.name) as span:
+            enforce_utc(df).to_csv(path, index=False)
+            if Tracer.active():
+                span.set(
+                    linhas=len(df),
+                    colunas=len(df.columns),
+                    bytes=os.path.getsize(path),
+                )
+
+    def open_writer(self, filename: str) -> AbstractSynthesisWriter:
+        return CSVSynthesisWriter(self.path.joinpath(filename + ".csv"))
+
+
+class _ConcatSynthesisWriter(AbstractSynthesisWriter):
+    """
+    Acumula as partes da síntese e as fornece concatenadas
+    ao repositório ao final da escrita.
+    """
+
+    def __init__(self, repository: AbstractExportRepository, filename: str):
+        self.__repository = repository
+        self.__filename = filename
+        self.__dfs: list[pd.DataFrame] = []
+
+    def write(self, df: pd.DataFrame):
+        self.__dfs.append(df)
+
+    def close(self):
+        if self.__dfs:
+            df = pd.concat(self.__dfs, ignore_index=True)
+            self.__dfs.clear()
+            self.__repository.synthetize_df(df, self.__filename)
 
 
 class TestExportRepository(AbstractExportRepository):
@@ -86,11 +221,55 @@ class TestExportRepository(AbstractExportRepository):
     def synthetize_df(self, df: pd.DataFrame, filename: str) -> bool:
         return df
 
+    def open_writer(self, filename: str) -> AbstractSynthesisWriter:
+        return _ConcatSynthesisWriter(self, filename)
+
+
+class MemoryExportRepository(AbstractExportRepository):
+    """
+    Repositório de exportação que mantém as sínteses em memória,
+    como tabelas do Arrow, sem realizar escrita em disco.
+    """
+
+    def __init__(self, path: str = ""):
+        self.__path = path
+        self.__tables: dict[str, pa.Table] = {}
+
+    @property
+    def path(self) -> pathlib.Path:
+        return pathlib.Path(self.__path)
+
+    @property
+    def tables(self) -> dict[str, pa.Table]:
+        return self.__tables
+
+    def read_df(self, filename: str) -> pd.DataFrame | None:
+        table = self.__tables.get(filename)
+        if table is not None:
+            return table.to_pandas()
+        else:
+            return None
+
+    def synthetize_df(self, df: pd.DataFrame, filename: str):
+        with Tracer.span("escrita", arquivo=filename) as span:
+            table = pa.Table.from_pandas(enforce_utc(df), preserve_index=False)
+            span.set(
+                linhas=table.num_rows,
+                colunas=table.num_columns,
+                bytes=table.nbytes,
+            )
+        self.__tables[filename] = table
+        return True
+
+    def open_writer(self, filename: str) -> AbstractSynthesisWriter:
+        return _ConcatSynthesisWriter(self, filename)
+
 
 def factory(kind: str, *args, **kwargs) -> AbstractExportRepository:
     mapping: dict[str, Type[AbstractExportRepository]] = {
         "PARQUET": ParquetExportRepository,
         "CSV": CSVExportRepository,
+        "MEMORY": MemoryExportRepository,
         "TEST": TestExportRepository,
     }
     kind = kind.upper()
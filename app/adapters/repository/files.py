@@ -1,50 +1,156 @@
+from __future__ import annotations
+
 import asyncio
+import importlib
+import os
 import pathlib
 import platform
+import re
+import threading
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar
-
-from idessem.dessem.dadvaz import Dadvaz
-from idessem.dessem.des_log_relato import DesLogRelato
-from idessem.dessem.dessemarq import DessemArq
-from idessem.dessem.entdados import Entdados
-from idessem.dessem.log_matriz import LogMatriz
-from idessem.dessem.pdo_eolica import PdoEolica
-from idessem.dessem.pdo_hidr import PdoHidr
-from idessem.dessem.pdo_inter import PdoInter
-from idessem.dessem.pdo_oper_term import PdoOperTerm
-from idessem.dessem.pdo_oper_tviag_calha import PdoOperTviagCalha
-from idessem.dessem.pdo_oper_uct import PdoOperUct
-from idessem.dessem.pdo_operacao import PdoOperacao
-from idessem.dessem.pdo_sist import PdoSist
-from idessem.dessem.pdo_eco_usih import PdoEcoUsih
-from idessem.dessem.operuh import Operuh
-
+from concurrent.futures import Future
+from functools import wraps
+from typing import TYPE_CHECKING, Callable, Iterator, Type, TypeVar, cast
+
+import pandas as pd  # type: ignore
+
+from app.adapters.repository.manifest import (
+    DeckManifest,
+    ManifestEntry,
+    case_manifest,
+)
+from app.adapters.repository.parsing import ProcessParser, load_file
+from app.adapters.repository.registers import RegisterIndex
+from app.adapters.repository.tables import (
+    CHUNK_ROWS,
+    chunk_table,
+    iterate_table,
+    table_block,
+)
 from app.model.settings import Settings
+from app.utils.compression import is_archive
 from app.utils.encoding import converte_codificacao
-from app.utils.fs import find_file_case_insensitive
 from app.utils.log import Log
-
-if platform.system() == "Windows":
-    DessemArq.ENCODING = "iso-8859-1"
-    Dadvaz.ENCODING = "iso-8859-1"
-    PdoSist.ENCODING = "iso-8859-1"
-    PdoHidr.ENCODING = "iso-8859-1"
-    PdoEolica.ENCODING = "iso-8859-1"
-    PdoInter.ENCODING = "iso-8859-1"
-    PdoOperacao.ENCODING = "iso-8859-1"
-    PdoOperUct.ENCODING = "iso-8859-1"
-    DesLogRelato.ENCODING = "iso-8859-1"
-    LogMatriz.ENCODING = "iso-8859-1"
-    PdoOperTerm.ENCODING = "iso-8859-1"
-    PdoOperTviagCalha.ENCODING = "iso-8859-1"
-    PdoEcoUsih.ENCODING = "iso-8859-1"
-    Operuh.ENCODING = "iso-8859-1"
+from app.utils.tracing import Tracer
+
+if TYPE_CHECKING:
+    from cfinterface.files.blockfile import BlockFile
+    from cfinterface.files.registerfile import RegisterFile
+    from cfinterface.files.sectionfile import SectionFile
+    from idessem.dessem.dadvaz import Dadvaz
+    from idessem.dessem.des_log_relato import DesLogRelato
+    from idessem.dessem.dessemarq import DessemArq
+    from idessem.dessem.entdados import Entdados
+    from idessem.dessem.log_matriz import LogMatriz
+    from idessem.dessem.operuh import Operuh
+    from idessem.dessem.pdo_eco_usih import PdoEcoUsih
+    from idessem.dessem.pdo_eolica import PdoEolica
+    from idessem.dessem.pdo_hidr import PdoHidr
+    from idessem.dessem.pdo_inter import PdoInter
+    from idessem.dessem.pdo_oper_term import PdoOperTerm
+    from idessem.dessem.pdo_oper_tviag_calha import PdoOperTviagCalha
+    from idessem.dessem.pdo_oper_uct import PdoOperUct
+    from idessem.dessem.pdo_operacao import PdoOperacao
+    from idessem.dessem.pdo_sist import PdoSist
+
+T = TypeVar("T")
+
+# Arquivos do idessem, construídos pelo método de classe `read`
+F = TypeVar("F", bound="BlockFile | RegisterFile | SectionFile")
+
+# Arquivos de entrada compartilhados entre os cenários de um caso
+SHARED_FILES = ["ENTDADOS", "OPERUH"]
+
+# Arquivos de saída que identificam o diretório de um cenário
+SCENARIO_OUTPUT_FILES = {"PDO_OPERACAO", "PDO_SIST"}
+
+# Registros do dessem.arq com os nomes dos arquivos de entrada
+DESSEMARQ_FILES = {
+    "ENTDADOS": "dadger",
+    "DADVAZ": "vazoes",
+    "OPERUH": "operuh",
+}
+
+# Arquivos lidos conforme a versão do modelo informada no cabeçalho
+VERSIONED_FILES = {"PDO_ECO_USIH"}
+
+# Nome, módulo e classe do idessem dos arquivos de cada método de leitura
+FILE_READERS: dict[str, tuple[str, str, str]] = {
+    "get_entdados": ("ENTDADOS", "idessem.dessem.entdados", "Entdados"),
+    "get_dadvaz": ("DADVAZ", "idessem.dessem.dadvaz", "Dadvaz"),
+    "get_pdo_operacao": (
+        "PDO_OPERACAO",
+        "idessem.dessem.pdo_operacao",
+        "PdoOperacao",
+    ),
+    "get_pdo_sist": ("PDO_SIST", "idessem.dessem.pdo_sist", "PdoSist"),
+    "get_pdo_inter": ("PDO_INTER", "idessem.dessem.pdo_inter", "PdoInter"),
+    "get_pdo_hidr": ("PDO_HIDR", "idessem.dessem.pdo_hidr", "PdoHidr"),
+    "get_pdo_eolica": (
+        "PDO_EOLICA",
+        "idessem.dessem.pdo_eolica",
+        "PdoEolica",
+    ),
+    "get_pdo_oper_uct": (
+        "PDO_OPER_UCT",
+        "idessem.dessem.pdo_oper_uct",
+        "PdoOperUct",
+    ),
+    "get_des_log_relato": (
+        "DES_LOG_RELATO",
+        "idessem.dessem.des_log_relato",
+        "DesLogRelato",
+    ),
+    "get_log_matriz": (
+        "LOG_MATRIZ",
+        "idessem.dessem.log_matriz",
+        "LogMatriz",
+    ),
+    "get_pdo_oper_term": (
+        "PDO_OPER_TERM",
+        "idessem.dessem.pdo_oper_term",
+        "PdoOperTerm",
+    ),
+    "get_pdo_oper_tviag_calha": (
+        "PDO_OPER_TVIAG_CALHA",
+        "idessem.dessem.pdo_oper_tviag_calha",
+        "PdoOperTviagCalha",
+    ),
+    "get_pdo_eco_usih": (
+        "PDO_ECO_USIH",
+        "idessem.dessem.pdo_eco_usih",
+        "PdoEcoUsih",
+    ),
+    "get_operuh": ("OPERUH", "idessem.dessem.operuh", "Operuh"),
+}
+
+
+def _set_windows_encoding(file_class):
+    """
+    Os arquivos do DESSEM são lidos com a codificação `iso-8859-1`
+    no Windows. As classes do idessem são importadas apenas na
+    leitura de cada arquivo, quando a codificação é ajustada.
+    """
+    if platform.system() == "Windows":
+        file_class.ENCODING = "iso-8859-1"
+
+
+def _synchronized(func: Callable) -> Callable:
+    """
+    Serializa as chamadas concorrentes de um método de leitura, de modo
+    que sínteses executadas em paralelo sobre um mesmo repositório leiam
+    cada arquivo uma única vez e nunca obtenham um arquivo em leitura.
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._lock(func.__name__):
+            return func(self, *args, **kwargs)
+
+    return wrapper
 
 
 class AbstractFilesRepository(ABC):
-    T = TypeVar("T")
-
     def _validate_data(self, data, type: Type[T]) -> T:
         if not isinstance(data, type):
             raise RuntimeError()
@@ -59,6 +165,19 @@ class AbstractFilesRepository(ABC):
     def get_entdados(self) -> Entdados | None:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_entdados_registers(self, registers: list[str]) -> Entdados | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iterate_table(
+        self,
+        reader: str,
+        chunk_rows: int = CHUNK_ROWS,
+        key: str | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        raise NotImplementedError
+
     @abstractmethod
     def get_dadvaz(self) -> Dadvaz | None:
         raise NotImplementedError
@@ -111,66 +230,207 @@ class AbstractFilesRepository(ABC):
     def get_operuh(self) -> Operuh | None:
         raise NotImplementedError
 
+    @property
+    def scenarios(self) -> dict[int, str]:
+        """
+        Diretórios dos cenários do caso, indexados pelo número
+        do cenário. Vazio para casos com um único cenário.
+        """
+        return {}
+
+    @property
+    def scenario(self) -> int | None:
+        return None
+
+    def for_scenario(self, scenario: int) -> AbstractFilesRepository:
+        raise NotImplementedError
+
+    def prefetch(self, readers: list[str]):
+        """
+        Inicia a leitura antecipada dos arquivos dos métodos de
+        leitura fornecidos, quando suportada pelo repositório.
+        """
+
 
 class RawFilesRepository(AbstractFilesRepository):
-    def __init__(self, tmppath: str):
+    def __init__(self, tmppath: str, dessemarq: DessemArq | None = None):
         self.__tmppath = tmppath
-        try:
-            path = str(pathlib.Path(self.__tmppath).joinpath("dessem.arq"))
-            # TODO - realmente precisa desse converte?
-            self.__convert_utf8(path)
-            self.__dessemarq = DessemArq.read(path)
-        except FileNotFoundError as e:
-            logger = Log.log()
-            if logger is not None:
-                logger.error("Não foi encontrado o arquivo dessem.arq")
-            raise e
+        self.__manifest = case_manifest(tmppath)
+        self.__pending: dict[str, Future] = {}
+        self.__locks: dict[str, threading.RLock] = {}
+        self.__locks_guard = threading.Lock()
+        self.__converted: set[str] = set()
+        # Métodos de leitura (ex. `get_pdo_sist`) cujos arquivos já
+        # foram lidos, mantidos em cache pelo repositório
+        self.__loaded: set[str] = set()
+        if dessemarq is not None:
+            self.__dessemarq = dessemarq
+        else:
+            self.__dessemarq = self.__read_dessemarq()
         self.__extension: str | None = None
-        self.__read_dessemarq_extension = False
         self.__entdados: Entdados | None = None
-        self.__read_entdados = False
+        self.__entdados_index: RegisterIndex | None = None
         self.__dadvaz: Dadvaz | None = None
-        self.__read_dadvaz = False
         self.__pdo_sist: PdoSist | None = None
-        self.__read_pdo_sist = False
         self.__pdo_inter: PdoInter | None = None
-        self.__read_pdo_inter = False
         self.__pdo_operacao: PdoOperacao | None = None
-        self.__read_pdo_operacao = False
         self.__pdo_hidr: PdoHidr | None = None
-        self.__read_pdo_hidr = False
         self.__pdo_oper_uct: PdoOperUct | None = None
-        self.__read_pdo_oper_uct = False
         self.__des_log_relato: DesLogRelato | None = None
-        self.__read_des_log_relato = False
         self.__log_matriz: LogMatriz | None = None
-        self.__read_log_matriz = False
         self.__pdo_oper_term: PdoOperTerm | None = None
-        self.__read_pdo_oper_term = False
         self.__pdo_eolica: PdoEolica | None = None
-        self.__read_pdo_eolica = False
         self.__pdo_oper_tviag_calha: PdoOperTviagCalha | None = None
-        self.__read_pdo_oper_tviag_calha = False
         self.__pdo_eco_usih: PdoEcoUsih | None = None
-        self.__read_pdo_eco_usih = False
         self.__operuh: Operuh | None = None
-        self.__read_operuh = False
+
+    def __read_dessemarq(self) -> DessemArq:
+        try:
+            from idessem.dessem.dessemarq import DessemArq
+
+            _set_windows_encoding(DessemArq)
+            # TODO - realmente precisa desse converte?
+            return self.__read(DessemArq, self.__manifest.find("dessem.arq"))
+        except FileNotFoundError as e:
+            logger = Log.log()
+            if logger is not None:
+                logger.error("Não foi encontrado o arquivo dessem.arq")
+            raise e
+
+    def _lock(self, name: str) -> threading.RLock:
+        with self.__locks_guard:
+            return self.__locks.setdefault(name, threading.RLock())
+
+    @property
+    def path(self) -> str:
+        return self.__tmppath
 
     @property
     def dessemarq(self) -> DessemArq:
         return self.__dessemarq
 
-    def __convert_utf8(self, path: str):
+    @property
+    def manifest(self) -> DeckManifest:
+        return self.__manifest
+
+    def __entry(self, name: str) -> ManifestEntry:
+        """
+        Obtém do manifesto o arquivo `name` (ex. `PDO_HIDR`) do caso.
+        Os arquivos de entrada são buscados com o nome informado no
+        dessem.arq e, na ausência deste, com a extensão do caso.
+        """
+        filenames = [f"{name}.{self.get_extension()}"]
+        register = DESSEMARQ_FILES.get(name)
+        if register is not None:
+            reg = getattr(self.__dessemarq, register, None)
+            if reg is not None and reg.valor:
+                filenames.insert(0, reg.valor)
+        return self.__manifest.find(*filenames)
+
+    def has_file(self, name: str) -> bool:
+        try:
+            self.__entry(name)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @_synchronized
+    def __convert_utf8(self, entry: ManifestEntry) -> ManifestEntry:
+        if entry.path in self.__converted:
+            return entry
+        self.__converted.add(entry.path)
         script = str(
             pathlib.Path(Settings().installdir).joinpath(
                 Settings().encoding_script
             )
         )
-        asyncio.run(converte_codificacao(path, script))
+        with Tracer.span("conversao", arquivo=entry.name):
+            asyncio.run(converte_codificacao(entry.path, script))
+        return self.__manifest.refresh(entry)
+
+    def __version(self, entry: ManifestEntry) -> str:
+        version = self.__manifest.version(entry)
+        if version is None:
+            raise FileNotFoundError(
+                f"Versão do modelo não encontrada em {entry.name}"
+            )
+        return version
+
+    def __read(
+        self,
+        file_class: Type[F],
+        entry: ManifestEntry,
+        version: str | None = None,
+    ) -> F:
+        local = self.__manifest.is_local(entry)
+        if local:
+            entry = self.__convert_utf8(entry)
+        future = self.__pending.pop(entry.path, None)
+        with Tracer.span(
+            "leitura",
+            arquivo=entry.name,
+            bytes=entry.size,
+            processo=future is not None,
+        ):
+            if future is not None:
+                return load_file(future.result())
+            # Arquivos compactados são descompactados em memória
+            content = entry.path
+            if not local:
+                content = self.__decode(file_class, self.__manifest.read(entry))
+            if version is not None:
+                return cast(F, file_class.read(content, version=version))
+            return cast(F, file_class.read(content))
+
+    def __first_read(self, reader: str) -> bool:
+        """
+        Registra a leitura do arquivo do método `reader`, retornando
+        se esta é a primeira leitura do arquivo.
+        """
+        if reader in self.__loaded:
+            return False
+        self.__loaded.add(reader)
+        return True
+
+    def _is_loaded(self, reader: str) -> bool:
+        """
+        Verifica se o arquivo do método de leitura `reader`
+        (ex. `get_pdo_sist`) já foi lido e se encontra em cache.
+        """
+        return reader in self.__loaded
+
+    def prefetch(self, readers: list[str]):
+        """
+        Submete a leitura dos arquivos ao pool de processos, caso
+        habilitado pela variável de ambiente `PROCESSOS_LEITURA`.
+        Os arquivos são obtidos posteriormente pelos métodos de
+        leitura, que aguardam a leitura em andamento.
+        """
+        if not ProcessParser.enabled():
+            return
+        for reader in readers:
+            if self._is_loaded(reader):
+                continue
+            filename, module, name = FILE_READERS[reader]
+            try:
+                entry = self.__entry(filename)
+                version = None
+                if filename in VERSIONED_FILES:
+                    version = self.__version(entry)
+            except FileNotFoundError:
+                continue
+            if entry.path in self.__pending:
+                continue
+            if not self.__manifest.is_local(entry):
+                continue
+            entry = self.__convert_utf8(entry)
+            self.__pending[entry.path] = ProcessParser.submit(
+                module, name, entry.path, version
+            )
 
+    @_synchronized
     def get_extension(self) -> str | None:
-        if self.__read_dessemarq_extension is False:
-            self.__read_dessemarq_extension = True
+        if self.__first_read("get_extension"):
             logger = Log.log()
             reg_caso = self.__dessemarq.caso
             if reg_caso is None:
@@ -182,216 +442,326 @@ class RawFilesRepository(AbstractFilesRepository):
             )
         return self.__extension
 
+    @_synchronized
     def get_entdados(self) -> Entdados | None:
-        if self.__read_entdados is False:
-            self.__read_entdados = True
+        if self.__first_read("get_entdados"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"ENTDADOS.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.entdados import Entdados
+
+                _set_windows_encoding(Entdados)
+                entry = self.__entry("ENTDADOS")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__entdados = Entdados.read(path)
+                self.__entdados = self.__read(Entdados, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do ENTDADOS: {e}")
                 raise e
         return self.__entdados
 
+    @_synchronized
+    def get_entdados_registers(self, registers: list[str]) -> Entdados | None:
+        """
+        Lê do ENTDADOS apenas as linhas dos registros informados
+        (ex. `["TM"]`), localizadas pelo índice de registros do
+        arquivo. Caso o arquivo já tenha sido lido por completo,
+        o mesmo é retornado.
+        """
+        if self.__entdados is not None:
+            return self.__entdados
+        logger = Log.log()
+        try:
+            from idessem.dessem.entdados import Entdados
+
+            _set_windows_encoding(Entdados)
+            entry = self.__entry("ENTDADOS")
+            filename = entry.name
+            if self.__entdados_index is None:
+                content = None
+                if self.__manifest.is_local(entry):
+                    entry = self.__convert_utf8(entry)
+                else:
+                    content = self.__manifest.read(entry)
+                with Tracer.span(
+                    "indexacao", arquivo=filename, bytes=entry.size
+                ):
+                    self.__entdados_index = RegisterIndex(entry.path, content)
+            with Tracer.span(
+                "leitura", arquivo=filename, registros=",".join(registers)
+            ) as span:
+                content = self.__entdados_index.read(registers)
+                span.set(bytes=len(content))
+                return Entdados.read(self.__decode(Entdados, content))
+        except Exception as e:
+            if logger is not None:
+                logger.error(f"Erro na leitura do ENTDADOS: {e}")
+            raise e
+
+    def iterate_table(
+        self,
+        reader: str,
+        chunk_rows: int = CHUNK_ROWS,
+        key: str | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lê em fluxo, em blocos de linhas, a tabela do arquivo de
+        saída do método de leitura `reader` (ex. `get_pdo_oper_term`),
+        sem manter a tabela completa em memória. Caso o arquivo já
+        tenha sido lido, ou esteja em leitura antecipada, a tabela
+        lida é dividida nos mesmos blocos.
+        """
+        filename, module, name = FILE_READERS[reader]
+        logger = Log.log()
+        try:
+            entry = self.__entry(filename)
+            if self._is_loaded(reader) or entry.path in self.__pending:
+                df = getattr(self, reader)().tabela
+                yield from chunk_table(df, chunk_rows, key)
+                return
+            file_class = getattr(importlib.import_module(module), name)
+            _set_windows_encoding(file_class)
+            if self.__manifest.is_local(entry):
+                entry = self.__convert_utf8(entry)
+            if logger is not None:
+                logger.info(f"Lendo arquivo {entry.name}")
+            with (
+                Tracer.span(
+                    "leitura", arquivo=entry.name, bytes=entry.size, fluxo=True
+                ),
+                self.__manifest.open(entry) as f,
+            ):
+                lines = (self.__decode(file_class, line) for line in f)
+                yield from iterate_table(
+                    lines, table_block(file_class), chunk_rows, key
+                )
+        except Exception as e:
+            if logger is not None:
+                logger.error(f"Erro na leitura do {filename}: {e}")
+            raise e
+
+    @staticmethod
+    def __decode(file_class, content: bytes) -> str:
+        encodings = file_class.ENCODING
+        if isinstance(encodings, str):
+            encodings = [encodings]
+        for encoding in encodings:
+            try:
+                return content.decode(encoding)
+            except UnicodeDecodeError:
+                pass
+        # Os arquivos não convertidos para UTF-8 são lidos como
+        # ISO-8859-1, assim como na conversão dos arquivos em disco
+        return content.decode("iso-8859-1")
+
+    @_synchronized
     def get_dadvaz(self) -> Dadvaz | None:
-        if self.__read_dadvaz is False:
-            self.__read_dadvaz = True
+        if self.__first_read("get_dadvaz"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"DADVAZ.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.dadvaz import Dadvaz
+
+                _set_windows_encoding(Dadvaz)
+                entry = self.__entry("DADVAZ")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__dadvaz = Dadvaz.read(path)
+                self.__dadvaz = self.__read(Dadvaz, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do DADVAZ: {e}")
                 raise e
         return self.__dadvaz
 
+    @_synchronized
     def get_pdo_operacao(self) -> PdoOperacao | None:
-        if self.__read_pdo_operacao is False:
-            self.__read_pdo_operacao = True
+        if self.__first_read("get_pdo_operacao"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"PDO_OPERACAO.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.pdo_operacao import PdoOperacao
+
+                _set_windows_encoding(PdoOperacao)
+                entry = self.__entry("PDO_OPERACAO")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__pdo_operacao = PdoOperacao.read(path)
+                self.__pdo_operacao = self.__read(PdoOperacao, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do PDO_OPERACAO: {e}")
                 raise e
         return self.__pdo_operacao
 
+    @_synchronized
     def get_pdo_sist(self) -> PdoSist | None:
-        if self.__read_pdo_sist is False:
-            self.__read_pdo_sist = True
+        if self.__first_read("get_pdo_sist"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"PDO_SIST.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.pdo_sist import PdoSist
+
+                _set_windows_encoding(PdoSist)
+                entry = self.__entry("PDO_SIST")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__pdo_sist = PdoSist.read(path)
+                self.__pdo_sist = self.__read(PdoSist, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do PDO_SIST: {e}")
                 raise e
         return self.__pdo_sist
 
+    @_synchronized
     def get_pdo_eolica(self) -> PdoEolica | None:
-        if self.__read_pdo_eolica is False:
-            self.__read_pdo_eolica = True
+        if self.__first_read("get_pdo_eolica"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"PDO_EOLICA.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.pdo_eolica import PdoEolica
+
+                _set_windows_encoding(PdoEolica)
+                entry = self.__entry("PDO_EOLICA")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__pdo_eolica = PdoEolica.read(path)
+                self.__pdo_eolica = self.__read(PdoEolica, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do PDO_EOLICA: {e}")
                 raise e
         return self.__pdo_eolica
 
+    @_synchronized
     def get_pdo_inter(self) -> PdoInter | None:
-        if self.__read_pdo_inter is False:
-            self.__read_pdo_inter = True
+        if self.__first_read("get_pdo_inter"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"PDO_INTER.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.pdo_inter import PdoInter
+
+                _set_windows_encoding(PdoInter)
+                entry = self.__entry("PDO_INTER")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__pdo_inter = PdoInter.read(path)
+                self.__pdo_inter = self.__read(PdoInter, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do PDO_INTER: {e}")
                 raise e
         return self.__pdo_inter
 
+    @_synchronized
     def get_pdo_hidr(self) -> PdoHidr | None:
-        if self.__read_pdo_hidr is False:
-            self.__read_pdo_hidr = True
+        if self.__first_read("get_pdo_hidr"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"PDO_HIDR.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.pdo_hidr import PdoHidr
+
+                _set_windows_encoding(PdoHidr)
+                entry = self.__entry("PDO_HIDR")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__pdo_hidr = PdoHidr.read(path)
+                self.__pdo_hidr = self.__read(PdoHidr, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do PDO_HIDR: {e}")
                 raise e
         return self.__pdo_hidr
 
+    @_synchronized
     def get_pdo_oper_uct(self) -> PdoOperUct | None:
-        if self.__read_pdo_oper_uct is False:
-            self.__read_pdo_oper_uct = True
+        if self.__first_read("get_pdo_oper_uct"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"PDO_OPER_UCT.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.pdo_oper_uct import PdoOperUct
+
+                _set_windows_encoding(PdoOperUct)
+                entry = self.__entry("PDO_OPER_UCT")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__pdo_oper_uct = PdoOperUct.read(path)
+                self.__pdo_oper_uct = self.__read(PdoOperUct, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do PDO_OPER_UCT: {e}")
                 raise e
         return self.__pdo_oper_uct
 
+    @_synchronized
     def get_des_log_relato(self) -> DesLogRelato | None:
-        if self.__read_des_log_relato is False:
-            self.__read_des_log_relato = True
+        if self.__first_read("get_des_log_relato"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"DES_LOG_RELATO.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.des_log_relato import DesLogRelato
+
+                _set_windows_encoding(DesLogRelato)
+                entry = self.__entry("DES_LOG_RELATO")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__des_log_relato = DesLogRelato.read(path)
+                self.__des_log_relato = self.__read(DesLogRelato, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do DES_LOG_RELATO: {e}")
                 raise e
         return self.__des_log_relato
 
+    @_synchronized
     def get_log_matriz(self) -> LogMatriz | None:
-        if self.__read_log_matriz is False:
-            self.__read_log_matriz = True
+        if self.__first_read("get_log_matriz"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"LOG_MATRIZ.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.log_matriz import LogMatriz
+
+                _set_windows_encoding(LogMatriz)
+                entry = self.__entry("LOG_MATRIZ")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__log_matriz = LogMatriz.read(path)
+                self.__log_matriz = self.__read(LogMatriz, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do LOG_MATRIZ: {e}")
                 raise e
         return self.__log_matriz
 
+    @_synchronized
     def get_pdo_oper_term(self) -> PdoOperTerm | None:
-        if self.__read_pdo_oper_term is False:
-            self.__read_pdo_oper_term = True
+        if self.__first_read("get_pdo_oper_term"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"PDO_OPER_TERM.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.pdo_oper_term import PdoOperTerm
+
+                _set_windows_encoding(PdoOperTerm)
+                entry = self.__entry("PDO_OPER_TERM")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__pdo_oper_term = PdoOperTerm.read(path)
+                self.__pdo_oper_term = self.__read(PdoOperTerm, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do PDO_OPER_TERM: {e}")
                 raise e
         return self.__pdo_oper_term
 
+    @_synchronized
     def get_pdo_oper_tviag_calha(self) -> PdoOperTviagCalha | None:
-        if self.__read_pdo_oper_tviag_calha is False:
-            self.__read_pdo_oper_tviag_calha = True
+        if self.__first_read("get_pdo_oper_tviag_calha"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"PDO_OPER_TVIAG_CALHA.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.pdo_oper_tviag_calha import (
+                    PdoOperTviagCalha,
+                )
+
+                _set_windows_encoding(PdoOperTviagCalha)
+                entry = self.__entry("PDO_OPER_TVIAG_CALHA")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__pdo_oper_tviag_calha = PdoOperTviagCalha.read(path)
+                self.__pdo_oper_tviag_calha = self.__read(
+                    PdoOperTviagCalha, entry
+                )
             except Exception as e:
                 if logger is not None:
                     logger.error(
@@ -400,42 +770,39 @@ class RawFilesRepository(AbstractFilesRepository):
                 raise e
         return self.__pdo_oper_tviag_calha
 
+    @_synchronized
     def get_pdo_eco_usih(self) -> PdoEcoUsih | None:
-        if self.__read_pdo_eco_usih is False:
-            self.__read_pdo_eco_usih = True
+        if self.__first_read("get_pdo_eco_usih"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"PDO_ECO_USIH.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.pdo_eco_usih import PdoEcoUsih
+
+                _set_windows_encoding(PdoEcoUsih)
+                entry = self.__entry("PDO_ECO_USIH")
+                filename = entry.name
+                version = self.__version(entry)
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__pdo_eco_usih = PdoEcoUsih.read(path)
-                if self.__pdo_eco_usih is not None:
-                    version = self.__pdo_eco_usih.versao
-                    if version is None:
-                        raise FileNotFoundError()
-                    PdoEcoUsih.set_version(version)
-                self.__pdo_eco_usih = PdoEcoUsih.read(path)
+                self.__pdo_eco_usih = self.__read(PdoEcoUsih, entry, version)
             except Exception as e:
                 if logger is not None:
-                    logger.error(f"Erro na leitura do {filename}: {e}")
+                    logger.error(f"Erro na leitura do PDO_ECO_USIH: {e}")
                 raise e
         return self.__pdo_eco_usih
 
+    @_synchronized
     def get_operuh(self) -> Operuh | None:
-        if self.__read_operuh is False:
-            self.__read_operuh = True
+        if self.__first_read("get_operuh"):
             logger = Log.log()
             try:
-                extension = self.get_extension()
-                filename = f"OPERUH.{extension}"
-                path = find_file_case_insensitive(self.__tmppath, filename)
-                self.__convert_utf8(path)
+                from idessem.dessem.operuh import Operuh
+
+                _set_windows_encoding(Operuh)
+                entry = self.__entry("OPERUH")
+                filename = entry.name
                 if logger is not None:
                     logger.info(f"Lendo arquivo {filename}")
-                self.__operuh = Operuh.read(path)
+                self.__operuh = self.__read(Operuh, entry)
             except Exception as e:
                 if logger is not None:
                     logger.error(f"Erro na leitura do OPERUH: {e}")
@@ -443,6 +810,174 @@ class RawFilesRepository(AbstractFilesRepository):
         return self.__operuh
 
 
+def find_scenarios(path: str) -> dict[int, str]:
+    """
+    Identifica os subdiretórios de um caso que contêm as saídas de
+    um cenário do DESSEM. O número do cenário é obtido dos dígitos
+    finais do nome do diretório (ex. `cenario_3`) ou, na ausência
+    destes, da ordem alfabética dos diretórios.
+    """
+    directories: list[pathlib.Path] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not entry.is_dir() or entry.name.startswith((".", "_")):
+                continue
+            with os.scandir(entry.path) as files:
+                names = {f.name.split(".")[0].upper() for f in files}
+            if names.intersection(SCENARIO_OUTPUT_FILES):
+                directories.append(pathlib.Path(entry.path))
+    directories.sort(key=lambda d: d.name)
+    numbers = [re.search(r"(\d+)$", d.name) for d in directories]
+    codes = [int(n.group(1)) for n in numbers if n is not None]
+    if len(codes) < len(directories) or len(set(codes)) < len(codes):
+        codes = list(range(1, len(directories) + 1))
+    return dict(sorted(zip(codes, [str(d) for d in directories])))
+
+
+class ScenarioFilesRepository(AbstractFilesRepository):
+    """
+    Arquivos de um cenário de um caso com múltiplos cenários. Os
+    arquivos compartilhados (`dessem.arq`, ENTDADOS e OPERUH) são
+    lidos uma única vez do diretório do caso, enquanto os demais são
+    lidos do diretório do cenário, ou do caso quando não existirem
+    no cenário.
+    """
+
+    def __init__(
+        self,
+        shared: RawFilesRepository,
+        scenarios: dict[int, str],
+        scenario: int,
+    ):
+        self.__shared = shared
+        self.__scenarios = scenarios
+        self.__scenario = scenario
+        self.__own = RawFilesRepository(
+            scenarios[scenario], dessemarq=shared.dessemarq
+        )
+        self.__loaded: list[str] = []
+
+    @property
+    def scenarios(self) -> dict[int, str]:
+        return self.__scenarios
+
+    @property
+    def scenario(self) -> int:
+        return self.__scenario
+
+    @property
+    def loaded(self) -> list[str]:
+        """
+        Métodos de leitura dos arquivos já lidos do diretório
+        do cenário.
+        """
+        return list(self.__loaded)
+
+    def for_scenario(self, scenario: int) -> ScenarioFilesRepository:
+        if scenario == self.__scenario:
+            return self
+        return ScenarioFilesRepository(
+            self.__shared, self.__scenarios, scenario
+        )
+
+    def prefetch(self, readers: list[str]):
+        for reader in readers:
+            repository = self.__repository(FILE_READERS[reader][0])
+            repository.prefetch([reader])
+
+    def load(self, readers: list[str]):
+        """
+        Realiza a leitura antecipada de arquivos do cenário.
+        """
+        self.prefetch(readers)
+        for reader in readers:
+            getattr(self, reader)()
+
+    def __repository(self, filename: str) -> RawFilesRepository:
+        if filename not in SHARED_FILES and self.__own.has_file(filename):
+            return self.__own
+        return self.__shared
+
+    def __get(self, reader: str, filename: str):
+        repository = self.__repository(filename)
+        if repository is self.__own and reader not in self.__loaded:
+            self.__loaded.append(reader)
+        return getattr(repository, reader)()
+
+    @property
+    def dessemarq(self) -> DessemArq:
+        return self.__shared.dessemarq
+
+    def get_entdados(self) -> Entdados | None:
+        return self.__get("get_entdados", "ENTDADOS")
+
+    def get_entdados_registers(self, registers: list[str]) -> Entdados | None:
+        return self.__repository("ENTDADOS").get_entdados_registers(registers)
+
+    def iterate_table(
+        self,
+        reader: str,
+        chunk_rows: int = CHUNK_ROWS,
+        key: str | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        repository = self.__repository(FILE_READERS[reader][0])
+        return repository.iterate_table(reader, chunk_rows, key)
+
+    def get_dadvaz(self) -> Dadvaz | None:
+        return self.__get("get_dadvaz", "DADVAZ")
+
+    def get_pdo_operacao(self) -> PdoOperacao | None:
+        return self.__get("get_pdo_operacao", "PDO_OPERACAO")
+
+    def get_pdo_sist(self) -> PdoSist | None:
+        return self.__get("get_pdo_sist", "PDO_SIST")
+
+    def get_pdo_inter(self) -> PdoInter | None:
+        return self.__get("get_pdo_inter", "PDO_INTER")
+
+    def get_pdo_hidr(self) -> PdoHidr | None:
+        return self.__get("get_pdo_hidr", "PDO_HIDR")
+
+    def get_pdo_eolica(self) -> PdoEolica | None:
+        return self.__get("get_pdo_eolica", "PDO_EOLICA")
+
+    def get_pdo_oper_uct(self) -> PdoOperUct | None:
+        return self.__get("get_pdo_oper_uct", "PDO_OPER_UCT")
+
+    def get_des_log_relato(self) -> DesLogRelato | None:
+        return self.__get("get_des_log_relato", "DES_LOG_RELATO")
+
+    def get_log_matriz(self) -> LogMatriz | None:
+        return self.__get("get_log_matriz", "LOG_MATRIZ")
+
+    def get_pdo_oper_term(self) -> PdoOperTerm | None:
+        return self.__get("get_pdo_oper_term", "PDO_OPER_TERM")
+
+    def get_pdo_oper_tviag_calha(self) -> PdoOperTviagCalha | None:
+        return self.__get("get_pdo_oper_tviag_calha", "PDO_OPER_TVIAG_CALHA")
+
+    def get_pdo_eco_usih(self) -> PdoEcoUsih | None:
+        return self.__get("get_pdo_eco_usih", "PDO_ECO_USIH")
+
+    def get_operuh(self) -> Operuh | None:
+        return self.__get("get_operuh", "OPERUH")
+
+
+def case_repository(path: str) -> AbstractFilesRepository:
+    """
+    Constrói o repositório de arquivos de um caso. Caso existam
+    subdiretórios de cenários, os arquivos são lidos do primeiro
+    cenário, compartilhando os arquivos de entrada do caso.
+    """
+    shared = RawFilesRepository(path)
+    if is_archive(path):
+        return shared
+    scenarios = find_scenarios(path)
+    if not scenarios:
+        return shared
+    return ScenarioFilesRepository(shared, scenarios, min(scenarios))
+
+
 def factory(kind: str, *args, **kwargs) -> AbstractFilesRepository:
     mapping: dict[str, Type[AbstractFilesRepository]] = {
         "FS": RawFilesRepository
@@ -0,0 +1,368 @@
+import io
+import os
+import tarfile
+import threading
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import PurePosixPath
+from typing import IO, Iterable, Iterator, Optional
+
+from app.utils.compression import (
+    COMPRESSED_SUFFIXES,
+    archive_suffix,
+    compression_suffix,
+    decompressing_reader,
+    is_archive,
+    open_zstd,
+)
+from app.utils.fs import files_fingerprint
+
+# Linhas iniciais dos arquivos de saída percorridas em busca da versão
+HEADER_LINES = 32
+
+# Marcadores da linha de título com a versão do modelo nas saídas
+VERSION_LINE = "MODELO DESSEM"
+VERSION_MARK = "VERSAO"
+
+# Arquivo que identifica o diretório de um caso em um arquivo compactado
+DESSEM_ARQ = "dessem.arq"
+
+# Tamanho dos blocos descartados no avanço de um fluxo descompactado
+SKIP_CHUNK_SIZE = 1 << 20
+
+
+def _decompressed(
+    fileobj: IO[bytes], compression: Optional[str]
+) -> Iterator[IO[bytes]]:
+    reader = decompressing_reader(fileobj, compression)
+    try:
+        yield reader
+    finally:
+        if reader is not fileobj:
+            reader.close()
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """
+    Arquivo existente no diretório de um caso. Em arquivos compactados
+    individualmente, `compression` contém a extensão da compressão.
+    """
+
+    name: str
+    path: str
+    size: int
+    mtime_ns: int
+    compression: Optional[str] = None
+
+
+class DeckManifest:
+    """
+    Manifesto dos arquivos do diretório de um caso, construído em uma
+    única varredura do diretório. Resolve os nomes dos arquivos sem
+    diferenciar maiúsculas de minúsculas, incluindo as suas versões
+    compactadas (`.gz` ou `.zst`), informa o tamanho e a data de
+    modificação de cada arquivo e identifica a versão do modelo
+    a partir do cabeçalho das saídas, quando solicitada.
+    """
+
+    def __init__(
+        self, directory: str, entries: Iterable[ManifestEntry] | None = None
+    ):
+        self.directory = directory
+        self.__entries: dict[str, ManifestEntry] = {}
+        self.__folded: dict[str, str] = {}
+        self.__versions: dict[str, str | None] = {}
+        if entries is None:
+            entries = self.__scan()
+        for entry in entries:
+            self.__entries[entry.name] = entry
+            self.__folded.setdefault(entry.name.casefold(), entry.name)
+
+    def __scan(self) -> list[ManifestEntry]:
+        files: list[ManifestEntry] = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+                files.append(
+                    ManifestEntry(
+                        entry.name,
+                        entry.path,
+                        st.st_size,
+                        st.st_mtime_ns,
+                        compression_suffix(entry.name),
+                    )
+                )
+        return files
+
+    def __iter__(self) -> Iterator[ManifestEntry]:
+        return iter(sorted(self.__entries.values(), key=lambda e: e.name))
+
+    def __resolve(self, filename: str) -> str | None:
+        for candidate in [filename, filename.upper(), filename.lower()]:
+            if candidate in self.__entries:
+                return candidate
+        folded = filename.casefold()
+        for suffix in [""] + COMPRESSED_SUFFIXES:
+            name = self.__folded.get(folded + suffix)
+            if name is not None:
+                return name
+        return None
+
+    def find(self, *filenames: str) -> ManifestEntry:
+        """
+        Obtém o primeiro dos arquivos informados existente no diretório,
+        sem diferenciar maiúsculas de minúsculas.
+        """
+        for filename in filenames:
+            name = self.__resolve(filename)
+            if name is not None:
+                return self.__entries[name]
+        raise FileNotFoundError(
+            f"File {filenames[0]} not found in {self.directory}"
+        )
+
+    def exists(self, filename: str) -> bool:
+        return self.__resolve(filename) is not None
+
+    def is_local(self, entry: ManifestEntry) -> bool:
+        """
+        Indica se o arquivo pode ser lido diretamente do seu caminho,
+        sem descompressão.
+        """
+        return entry.compression is None
+
+    @contextmanager
+    def open(self, entry: ManifestEntry) -> Iterator[IO[bytes]]:
+        """
+        Abre um arquivo para leitura binária, com a descompressão
+        realizada durante a leitura.
+        """
+        with open(entry.path, "rb") as f:
+            yield from _decompressed(f, entry.compression)
+
+    def read(self, entry: ManifestEntry) -> bytes:
+        """
+        Obtém o conteúdo, descompactado, de um arquivo.
+        """
+        with self.open(entry) as f:
+            return f.read()
+
+    def refresh(self, entry: ManifestEntry) -> ManifestEntry:
+        """
+        Atualiza o tamanho e a data de modificação de um arquivo
+        alterado durante o processamento (ex. na conversão para UTF-8).
+        """
+        st = os.stat(entry.path)
+        if (st.st_size, st.st_mtime_ns) == (entry.size, entry.mtime_ns):
+            return entry
+        updated = ManifestEntry(
+            entry.name,
+            entry.path,
+            st.st_size,
+            st.st_mtime_ns,
+            entry.compression,
+        )
+        self.__entries[entry.name] = updated
+        self.__versions.pop(entry.name, None)
+        return updated
+
+    def version(self, entry: ManifestEntry) -> str | None:
+        """
+        Obtém a versão do modelo informada na linha de título de um
+        arquivo de saída, lendo apenas as linhas iniciais do arquivo.
+        """
+        if entry.name not in self.__versions:
+            version = None
+            with self.open(entry) as f:
+                lines = io.TextIOWrapper(f, encoding="latin-1")
+                for _, line in zip(range(HEADER_LINES), lines):
+                    if VERSION_LINE in line and VERSION_MARK in line:
+                        version = (
+                            line.split(VERSION_MARK)[1].split("-")[0].strip()
+                        )
+                        break
+                lines.detach()
+            self.__versions[entry.name] = version or None
+        return self.__versions[entry.name]
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Assinatura dos arquivos do caso, equivalente à obtida por
+        `case_fingerprint` no momento da construção do manifesto.
+        """
+        return files_fingerprint(
+            (e.name, e.size, e.mtime_ns) for e in self.__entries.values()
+        )
+
+
+class ArchiveManifest(DeckManifest):
+    """
+    Manifesto dos arquivos de um caso contido em um arquivo compactado
+    (`.zip`, `.tar`, `.tar.gz` ou `.tar.zst`). Os arquivos do caso são
+    os do diretório do arquivo compactado que contém o `dessem.arq`,
+    e são lidos diretamente do arquivo compactado, sem extração.
+
+    Em arquivos `.tar` compactados, que não permitem acesso aleatório,
+    a leitura avança no fluxo descompactado, sendo reiniciada apenas
+    quando um arquivo anterior ao último lido é solicitado. O fluxo é
+    compartilhado, de modo que as leituras concorrentes são serializadas.
+    """
+
+    def __init__(self, path: str):
+        self.suffix = archive_suffix(path)
+        self.__lock = threading.Lock()
+        self.__stream: Optional[IO[bytes]] = None
+        self.__position = 0
+        if self.suffix == ".zip":
+            members = self.__zip_members(path)
+        else:
+            members = self.__tar_members(path)
+        super().__init__(path, self.__case_entries(members))
+
+    @staticmethod
+    def __zip_members(path: str) -> list[ManifestEntry]:
+        members: list[ManifestEntry] = []
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                mtime = datetime(*info.date_time).timestamp()
+                members.append(
+                    ManifestEntry(
+                        info.filename,
+                        info.filename,
+                        info.file_size,
+                        int(mtime * 1e9),
+                    )
+                )
+        return members
+
+    def __tar_members(self, path: str) -> list[ManifestEntry]:
+        members: list[ManifestEntry] = []
+        with self.__open_tar(path) as stream:
+            with tarfile.open(fileobj=stream, mode="r|") as tf:
+                for info in tf:
+                    if not info.isfile():
+                        continue
+                    # A posição dos dados do membro no fluxo
+                    # descompactado é mantida no caminho do membro
+                    members.append(
+                        ManifestEntry(
+                            info.name,
+                            f"{info.name}:{info.offset_data}",
+                            info.size,
+                            int(info.mtime * 1e9),
+                        )
+                    )
+        return members
+
+    def __open_tar(self, path: str) -> IO[bytes]:
+        f = open(path, "rb")
+        try:
+            if self.suffix in [".tar.gz", ".tgz"]:
+                return decompressing_reader(f, ".gz")
+            if self.suffix in [".tar.zst", ".tzst"]:
+                return open_zstd(f)
+        except Exception:
+            f.close()
+            raise
+        return f
+
+    @staticmethod
+    def __case_entries(members: list[ManifestEntry]) -> list[ManifestEntry]:
+        directories = [
+            PurePosixPath(m.name).parent
+            for m in members
+            if PurePosixPath(m.name).name.lower() == DESSEM_ARQ
+        ]
+        root = min(directories, key=lambda d: len(d.parts), default=None)
+        if root is None:
+            root = PurePosixPath(".")
+        entries: list[ManifestEntry] = []
+        for m in members:
+            member = PurePosixPath(m.name)
+            if member.parent != root:
+                continue
+            entries.append(
+                ManifestEntry(
+                    member.name,
+                    m.path,
+                    m.size,
+                    m.mtime_ns,
+                    compression_suffix(member.name),
+                )
+            )
+        return entries
+
+    def is_local(self, entry: ManifestEntry) -> bool:
+        return False
+
+    def __tar_member(self, entry: ManifestEntry) -> bytes:
+        offset = int(entry.path.rsplit(":", 1)[1])
+        if self.suffix == ".tar":
+            with open(self.directory, "rb") as f:
+                f.seek(offset)
+                return f.read(entry.size)
+        if self.__stream is None or offset < self.__position:
+            self.__close_stream()
+            self.__stream = self.__open_tar(self.directory)
+            self.__position = 0
+        while self.__position < offset:
+            skipped = self.__stream.read(
+                min(SKIP_CHUNK_SIZE, offset - self.__position)
+            )
+            if not skipped:
+                raise EOFError(f"Fim inesperado de {self.directory}")
+            self.__position += len(skipped)
+        chunks: list[bytes] = []
+        remaining = entry.size
+        while remaining > 0:
+            chunk = self.__stream.read(remaining)
+            if not chunk:
+                raise EOFError(f"Fim inesperado de {self.directory}")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        self.__position += entry.size
+        return b"".join(chunks)
+
+    @contextmanager
+    def open(self, entry: ManifestEntry) -> Iterator[IO[bytes]]:
+        if self.suffix == ".zip":
+            with (
+                zipfile.ZipFile(self.directory) as zf,
+                zf.open(entry.path) as f,
+            ):
+                yield from _decompressed(f, entry.compression)
+        else:
+            with self.__lock:
+                data = self.__tar_member(entry)
+            f = io.BytesIO(data)
+            yield from _decompressed(f, entry.compression)
+
+    def refresh(self, entry: ManifestEntry) -> ManifestEntry:
+        return entry
+
+    def close(self):
+        with self.__lock:
+            self.__close_stream()
+
+    def __close_stream(self):
+        if self.__stream is not None:
+            self.__stream.close()
+            self.__stream = None
+
+
+def case_manifest(path: str) -> DeckManifest:
+    """
+    Constrói o manifesto de um caso em um diretório ou em um
+    arquivo compactado.
+    """
+    if is_archive(path):
+        return ArchiveManifest(path)
+    return DeckManifest(path)
@@ -0,0 +1,181 @@
+import atexit
+import importlib
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from typing import Any
+
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+
+from app.model.settings import Settings
+
+# Diretório em memória compartilhada, quando disponível (Linux)
+SHARED_MEMORY_DIR = "/dev/shm"
+
+
+@dataclass
+class ParsedFile:
+    """
+    Resultado da leitura de um arquivo em outro processo: o objeto
+    serializado sem as suas tabelas, que são escritas em um arquivo
+    no formato IPC do Arrow, uma stream por tabela.
+    """
+
+    skeleton: bytes
+    tables: str | None = None
+    offsets: list[tuple[int, int]] = field(default_factory=list)
+
+
+class _TableRef:
+    """
+    Referência a uma tabela do arquivo IPC de um `ParsedFile`,
+    que ocupa o lugar da tabela no objeto serializado.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+def _components(obj: Any) -> list:
+    data = getattr(obj, "data", None)
+    try:
+        return list(data) if data is not None else []
+    except TypeError:
+        return []
+
+
+def parse_file(
+    module: str,
+    name: str,
+    path: str,
+    directory: str | None,
+    version: str | None = None,
+) -> ParsedFile:
+    """
+    Lê um arquivo com a classe `name` do idessem em um processo
+    separado, na `version` do modelo quando informada. As tabelas
+    dos blocos do arquivo são escritas em um arquivo IPC do Arrow
+    no `directory`, evitando serializar os DataFrames para o
+    processo principal.
+    """
+    from app.adapters.repository.files import _set_windows_encoding
+
+    file_class = getattr(importlib.import_module(module), name)
+    _set_windows_encoding(file_class)
+    if version is not None:
+        obj = file_class.read(path, version=version)
+    else:
+        obj = file_class.read(path)
+    tables: list[pa.Table] = []
+    for component in _components(obj):
+        df = getattr(component, "data", None)
+        if not isinstance(df, pd.DataFrame):
+            continue
+        try:
+            table = pa.Table.from_pandas(df)
+        except (pa.ArrowException, TypeError, ValueError):
+            # Tabelas que não são representáveis no Arrow seguem
+            # serializadas com o objeto
+            continue
+        component.data = _TableRef(len(tables))
+        tables.append(table)
+    if not tables:
+        return ParsedFile(pickle.dumps(obj))
+    fd, tables_path = tempfile.mkstemp(suffix=".arrow", dir=directory)
+    os.close(fd)
+    offsets: list[tuple[int, int]] = []
+    with pa.OSFile(tables_path, "wb") as sink:
+        for table in tables:
+            start = sink.tell()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            offsets.append((start, sink.tell() - start))
+    return ParsedFile(pickle.dumps(obj), tables_path, offsets)
+
+
+def load_file(parsed: ParsedFile) -> Any:
+    """
+    Reconstrói no processo principal um arquivo lido por `parse_file`.
+    As tabelas são lidas do arquivo IPC mapeado em memória e copiadas
+    uma única vez na conversão para DataFrames, de modo que o arquivo
+    pode ser removido em seguida.
+    """
+    obj = pickle.loads(parsed.skeleton)
+    if parsed.tables is None:
+        return obj
+    dfs: list[pd.DataFrame] = []
+    with pa.memory_map(parsed.tables) as source:
+        for offset, length in parsed.offsets:
+            source.seek(offset)
+            with pa.ipc.open_stream(source.read_buffer(length)) as reader:
+                dfs.append(reader.read_all().to_pandas())
+    try:
+        os.remove(parsed.tables)
+    except OSError:
+        # No Windows, o arquivo é removido ao final da execução
+        pass
+    for component in _components(obj):
+        ref = getattr(component, "data", None)
+        if isinstance(ref, _TableRef):
+            component.data = dfs[ref.index]
+    return obj
+
+
+class ProcessParser:
+    """
+    Pool de processos para a leitura dos arquivos do DESSEM, que é
+    limitada pelo GIL quando realizada em threads. O pool é criado
+    na primeira leitura, com o número de processos definido pela
+    variável de ambiente `PROCESSOS_LEITURA`, e encerrado ao final
+    da execução.
+    """
+
+    POOL: ProcessPoolExecutor | None = None
+    DIRECTORY: str | None = None
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return Settings().reading_processes > 0
+
+    @classmethod
+    def pool(cls) -> ProcessPoolExecutor:
+        if cls.POOL is None:
+            base = None
+            if os.path.isdir(SHARED_MEMORY_DIR):
+                base = SHARED_MEMORY_DIR
+            cls.DIRECTORY = tempfile.mkdtemp(prefix="sintetizador-", dir=base)
+            cls.POOL = ProcessPoolExecutor(
+                max_workers=Settings().reading_processes,
+                mp_context=get_context("spawn"),
+            )
+            atexit.register(cls.shutdown)
+        return cls.POOL
+
+    @classmethod
+    def submit(
+        cls, module: str, name: str, path: str, version: str | None = None
+    ) -> Future:
+        """
+        Submete a leitura de um arquivo ao pool de processos.
+        """
+        pool = cls.pool()
+        return pool.submit(
+            parse_file, module, name, path, cls.DIRECTORY, version
+        )
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Encerra o pool de processos e remove os arquivos temporários.
+        """
+        if cls.POOL is not None:
+            cls.POOL.shutdown(cancel_futures=True)
+            cls.POOL = None
+        if cls.DIRECTORY is not None:
+            shutil.rmtree(cls.DIRECTORY, ignore_errors=True)
+            cls.DIRECTORY = None
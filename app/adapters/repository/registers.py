@@ -0,0 +1,74 @@
+import mmap
+import os
+import re
+
+# Linha de um registro: o identificador é o primeiro campo da linha,
+# desconsiderando as linhas em branco e os comentários (`&`)
+REGISTER_LINE = re.compile(rb"^([^\s&]\S*)[^\n]*\n?", re.MULTILINE)
+
+
+class RegisterIndex:
+    """
+    Índice das posições, em bytes, das linhas de cada tipo de registro
+    de um arquivo do DESSEM composto por registros (ex. ENTDADOS).
+    O índice é construído em uma única varredura do arquivo mapeado
+    em memória, permitindo extrair posteriormente apenas as linhas
+    dos registros de interesse, sem ler o arquivo completo.
+
+    Arquivos já carregados em memória (ex. obtidos de um arquivo
+    compactado) são indexados a partir do seu `content`.
+    """
+
+    def __init__(self, path: str, content: bytes | None = None):
+        self.path = path
+        self.__content = content
+        self.__offsets: dict[str, list[tuple[int, int]]] = {}
+        if content is not None:
+            self.__scan(content)
+            return
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.__scan(mm)
+
+    def __scan(self, data: bytes | mmap.mmap):
+        for match in REGISTER_LINE.finditer(data):
+            register = match.group(1).decode("latin-1")
+            start, end = match.span()
+            offsets = self.__offsets.setdefault(register, [])
+            # Linhas consecutivas do mesmo registro são agrupadas
+            # em um único intervalo
+            if offsets and offsets[-1][1] == start:
+                offsets[-1] = (offsets[-1][0], end)
+            else:
+                offsets.append((start, end))
+
+    @property
+    def registers(self) -> list[str]:
+        """
+        Identificadores dos registros existentes no arquivo.
+        """
+        return list(self.__offsets.keys())
+
+    def read(self, registers: list[str]) -> bytes:
+        """
+        Obtém as linhas dos registros informados, na ordem em que
+        se encontram no arquivo.
+        """
+        spans = sorted(
+            span
+            for register in registers
+            for span in self.__offsets.get(register, [])
+        )
+        if not spans:
+            return b""
+        if self.__content is not None:
+            chunks = [self.__content[start:end] for start, end in spans]
+        else:
+            with (
+                open(self.path, "rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+            ):
+                chunks = [mm[start:end] for start, end in spans]
+        return b"\n".join(c.rstrip(b"\n") for c in chunks) + b"\n"
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Type
+
+import pandas as pd  # type: ignore
+
+if TYPE_CHECKING:
+    from idessem.dessem.modelos.blocos.tabelacsv import TabelaCSV
+
+# Número aproximado de linhas de cada bloco de uma tabela lida em fluxo
+CHUNK_ROWS = 100_000
+
+
+def table_block(file_class: Type[Any]) -> Type[TabelaCSV]:
+    """
+    Obtém o bloco com a tabela de dados de um arquivo de saída do
+    DESSEM no formato CSV (ex. `PdoOperTerm`).
+    """
+    from idessem.dessem.modelos.blocos.tabelacsv import TabelaCSV
+
+    for block in file_class.BLOCKS:
+        if issubclass(block, TabelaCSV):
+            return block
+    raise ValueError(f"Arquivo {file_class.__name__} não contém tabela")
+
+
+def _aligned(key: Optional[int], rows: list[list[Any]], chunk_rows: int) -> int:
+    """
+    Número de linhas do bloco a ser emitido, de modo que as linhas
+    com um mesmo valor da coluna `key` não sejam separadas.
+    Retorna 0 caso o bloco ainda não possa ser emitido.
+    """
+    if len(rows) < chunk_rows:
+        return 0
+    if key is None or rows[-1][key] != rows[-2][key]:
+        return len(rows) - 1
+    return 0
+
+
+def iterate_table(
+    lines: Iterable[str],
+    block_class: Type[TabelaCSV],
+    chunk_rows: int = CHUNK_ROWS,
+    key: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lê em fluxo a tabela de um arquivo de saída do DESSEM, emitindo
+    DataFrames com aproximadamente `chunk_rows` linhas cada. As linhas
+    são interpretadas pelo modelo de linha do bloco do idessem, assim
+    como na leitura do arquivo completo.
+
+    Caso `key` seja informada (ex. `estagio`), as linhas consecutivas
+    com um mesmo valor desta coluna são mantidas no mesmo bloco.
+    Ao menos um DataFrame, eventualmente vazio, é sempre emitido.
+    """
+    columns = block_class.COLUMN_NAMES
+    key_index = columns.index(key) if key is not None else None
+    line_model = block_class.LINE_MODEL
+    pattern = block_class.BEGIN_PATTERN
+    # O cabeçalho da tabela está entre as duas primeiras linhas
+    # de separação, seguido pelas linhas de dados
+    separators = 0
+    rows: list[list[Any]] = []
+    emitted = False
+    for line in lines:
+        if separators < 2:
+            if pattern in line:
+                separators += 1
+            continue
+        if len(line) < 3 or pattern in line:
+            break
+        rows.append(line_model.read(line))
+        size = _aligned(key_index, rows, chunk_rows + 1)
+        if size:
+            yield _frame(block_class, rows[:size])
+            emitted = True
+            rows = rows[size:]
+    if rows or not emitted:
+        yield _frame(block_class, rows)
+
+
+def _frame(block_class: Type[TabelaCSV], rows: list[list[Any]]) -> pd.DataFrame:
+    from cfinterface.components.floatfield import FloatField
+    from cfinterface.components.integerfield import IntegerField
+
+    columns = block_class.COLUMN_NAMES
+    data = {c: [row[i] for row in rows] for i, c in enumerate(columns)}
+    df = block_class()._monta_df(data)
+    # Campos numéricos vazios em todas as linhas de um bloco são
+    # mantidos como numéricos, assim como na tabela completa
+    for field, column in zip(block_class.LINE_MODEL.fields, columns):
+        if (
+            isinstance(field, (FloatField, IntegerField))
+            and df[column].dtype == object
+        ):
+            df[column] = df[column].astype(float)
+    return df
+
+
+def chunk_table(
+    df: pd.DataFrame,
+    chunk_rows: int = CHUNK_ROWS,
+    key: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Divide uma tabela já lida nos mesmos blocos emitidos pela
+    leitura em fluxo de `iterate_table`.
+    """
+    if df.empty:
+        yield df
+        return
+    start = 0
+    values = df[key].to_numpy() if key is not None else None
+    while start < len(df):
+        end = min(start + chunk_rows, len(df))
+        if values is not None:
+            while end < len(df) and values[end] == values[end - 1]:
+                end += 1
+        yield df.iloc[start:end]
+        start = end
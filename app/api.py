@@ -0,0 +1,115 @@
+"""
+API para uso do sintetizador-dessem como biblioteca, sem
+a necessidade de escrita e leitura das sínteses em disco.
+"""
+
+from typing import Optional
+
+import pyarrow as pa  # type: ignore
+
+import app.domain.commands as commands
+import app.services.handlers as handlers
+from app.services.deck.deck import Deck
+from app.services.query import DateLike, SynthesisQuery
+from app.services.synthesis.operation import OperationSynthetizer
+from app.services.unitofwork import AbstractUnitOfWork, MemoryUnitOfWork
+
+
+def synthesize(
+    path: str,
+    sistema: Optional[list[str]] = None,
+    operacao: Optional[list[str]] = None,
+    execucao: Optional[list[str]] = None,
+) -> dict[str, pa.Table]:
+    """
+    Realiza a síntese de um caso do DESSEM mantendo os resultados
+    em memória.
+
+    Para cada categoria de síntese pode ser fornecida uma lista de
+    variáveis, aceitando wildcards (`*`). Uma lista vazia sintetiza
+    todas as variáveis da categoria e `None` não sintetiza a categoria.
+    Caso nenhuma categoria seja fornecida, é feita a síntese completa.
+
+    :param path: Diretório do caso do DESSEM
+    :param sistema: Variáveis da síntese do sistema
+    :param operacao: Variáveis da síntese da operação
+    :param execucao: Variáveis da síntese da execução
+    :return: Tabelas sintetizadas, indexadas pelo nome da saída
+    :rtype: dict[str, pa.Table]
+    """
+    uow = MemoryUnitOfWork(path)
+    Deck.clear_cache()
+    OperationSynthetizer.clear_cache()
+    try:
+        run_synthesis(uow, sistema, operacao, execucao)
+    finally:
+        Deck.clear_cache()
+        OperationSynthetizer.clear_cache()
+    return dict(uow.export.tables)
+
+
+def run_synthesis(
+    uow: AbstractUnitOfWork,
+    sistema: Optional[list[str]] = None,
+    operacao: Optional[list[str]] = None,
+    execucao: Optional[list[str]] = None,
+):
+    """
+    Executa as categorias de síntese fornecidas sobre uma unidade de
+    trabalho já construída, seguindo as mesmas regras de `synthesize`.
+    """
+    if sistema is None and operacao is None and execucao is None:
+        sistema, operacao, execucao = [], [], []
+    if sistema is not None:
+        handlers.synthetize_system(
+            commands.SynthetizeSystem(list(sistema)), uow
+        )
+    if operacao is not None:
+        handlers.synthetize_operation(
+            commands.SynthetizeOperation(list(operacao)), uow
+        )
+    if execucao is not None:
+        handlers.synthetize_execution(
+            commands.SynthetizeExecution(list(execucao)), uow
+        )
+
+
+def query(
+    path: str,
+    saida: str,
+    codigos: Optional[list[int]] = None,
+    filtros: Optional[dict[str, list]] = None,
+    inicio: Optional[DateLike] = None,
+    fim: Optional[DateLike] = None,
+    estagios: Optional[tuple[int, int]] = None,
+    colunas: Optional[list[str]] = None,
+    casos: Optional[list[str]] = None,
+) -> pa.Table:
+    """
+    Consulta uma saída já sintetizada de um caso ou de um histórico
+    consolidado, aplicando os filtros e a projeção de colunas na
+    leitura dos arquivos.
+
+    :param path: Diretório do caso, da síntese ou do histórico
+    :param saida: Nome da saída (ex. `GHID_UHE`)
+    :param codigos: Códigos da entidade da saída
+    :param filtros: Valores aceitos para colunas quaisquer da saída
+    :param inicio: Data mínima do início dos estágios (inclusive)
+    :param fim: Data máxima do início dos estágios (inclusive)
+    :param estagios: Estágios inicial e final (inclusive)
+    :param colunas: Colunas projetadas no resultado
+    :param casos: Casos do histórico consolidado
+    :return: Resultado da consulta
+    :rtype: pa.Table
+    """
+    return SynthesisQuery(
+        path,
+        saida,
+        codigos=codigos,
+        filtros=filtros,
+        inicio=inicio,
+        fim=fim,
+        estagios=estagios,
+        colunas=colunas,
+        casos=casos,
+    ).to_table()
@@ -1,12 +1,15 @@
 import os
+from functools import wraps
+from typing import TYPE_CHECKING, Callable, Optional
 
 import click
 
 import app.domain.commands as commands
-import app.services.handlers as handlers
-from app.services.unitofwork import factory
 from app.utils.log import Log
 
+if TYPE_CHECKING:
+    from app.services.unitofwork import AbstractUnitOfWork
+
 
 @click.group()
 def app():
@@ -17,6 +20,69 @@ def app():
     pass
 
 
+def profiling_options(f: Callable) -> Callable:
+    """
+    Adiciona a um comando de síntese as opções de perfilamento, que
+    são fornecidas ao comando agrupadas no argumento `perfilamento`.
+    """
+
+    @click.option(
+        "--perfil",
+        is_flag=True,
+        help="exporta o perfil de tempos das etapas da síntese",
+    )
+    @click.option(
+        "--memoria",
+        is_flag=True,
+        help="mede e exporta o consumo de memória das etapas da síntese",
+    )
+    @click.option(
+        "--desempenho/--sem-desempenho",
+        default=True,
+        help="exporta o relatório de desempenho METADADOS_DESEMPENHO",
+    )
+    @click.option(
+        "--perfilar",
+        default=None,
+        help="sínteses ou etapas para execução do cProfile"
+        + " (ex. GTER_UTE,deck:pdo_oper_term)",
+    )
+    @wraps(f)
+    def wrapper(*args, perfil, memoria, desempenho, perfilar, **kwargs):
+        perfilamento = {
+            "perfil": perfil,
+            "memoria": memoria,
+            "desempenho": desempenho,
+            "perfilar": perfilar,
+        }
+        return f(*args, perfilamento=perfilamento, **kwargs)
+
+    return wrapper
+
+
+def _profiling_session(
+    uow: "AbstractUnitOfWork",
+    perfil: bool,
+    memoria: bool,
+    desempenho: bool,
+    perfilar: Optional[str],
+):
+    """
+    Combina em um único contexto os modos de perfilamento solicitados
+    pelas opções de `profiling_options`.
+    """
+    from app.model.settings import Settings
+    from app.services.profiling import profiling_session
+
+    return profiling_session(
+        Settings().synthesis_dir,
+        perfil=perfil,
+        memoria=memoria,
+        perfilar=perfilar,
+        uow=uow if desempenho else None,
+    )
+
+
 @click.command("sistema")
 @click.argument(
     "variaveis",
@@ -25,10 +91,14 @@ def app():
 @click.option(
     "--formato", default="PARQUET", help="formato para escrita da síntese"
 )
-def sistema(variaveis, formato):
+@profiling_options
+def sistema(variaveis, formato, perfilamento):
     """
     Realiza a síntese dos dados do sistema do DECOMP.
     """
+    import app.services.handlers as handlers
+    from app.services.unitofwork import factory
+
     os.environ["FORMATO_SINTESE"] = formato
     Log.log().info("# Realizando síntese do SISTEMA #")
 
@@ -36,8 +106,9 @@ def sistema(variaveis, formato):
         "FS",
         os.curdir,
     )
-    command = commands.SynthetizeSystem(variaveis)
-    handlers.synthetize_system(command, uow)
+    with _profiling_session(uow, **perfilamento):
+        command = commands.SynthetizeSystem(variaveis)
+        handlers.synthetize_system(command, uow)
 
     Log.log().info("# Fim da síntese #")
 
@@ -50,10 +121,14 @@ def sistema(variaveis, formato):
 @click.option(
     "--formato", default="PARQUET", help="formato para escrita da síntese"
 )
-def operacao(variaveis, formato):
+@profiling_options
+def operacao(variaveis, formato, perfilamento):
     """
     Realiza a síntese dos dados da operação do DESSEM.
     """
+    import app.services.handlers as handlers
+    from app.services.unitofwork import factory
+
     os.environ["FORMATO_SINTESE"] = formato
     Log.log().info("# Realizando síntese da OPERACAO #")
 
@@ -61,8 +136,9 @@ def operacao(variaveis, formato):
         "FS",
         os.curdir,
     )
-    command = commands.SynthetizeOperation(variaveis)
-    handlers.synthetize_operation(command, uow)
+    with _profiling_session(uow, **perfilamento):
+        command = commands.SynthetizeOperation(variaveis)
+        handlers.synthetize_operation(command, uow)
 
     Log.log().info("# Fim da síntese #")
 
@@ -75,10 +151,14 @@ def operacao(variaveis, formato):
 @click.option(
     "--formato", default="PARQUET", help="formato para escrita da síntese"
 )
-def execucao(variaveis, formato):
+@profiling_options
+def execucao(variaveis, formato, perfilamento):
     """
     Realiza a síntese dos dados da execução do DESSEM.
     """
+    import app.services.handlers as handlers
+    from app.services.unitofwork import factory
+
     os.environ["FORMATO_SINTESE"] = formato
     Log.log().info("# Realizando síntese da EXECUÇÃO #")
 
@@ -86,8 +166,9 @@ def execucao(variaveis, formato):
         "FS",
         os.curdir,
     )
-    command = commands.SynthetizeExecution(variaveis)
-    handlers.synthetize_execution(command, uow)
+    with _profiling_session(uow, **perfilamento):
+        command = commands.SynthetizeExecution(variaveis)
+        handlers.synthetize_execution(command, uow)
 
     Log.log().info("# Fim da síntese #")
 
@@ -97,6 +178,8 @@ def limpeza():
     """
     Realiza a limpeza dos dados resultantes de uma síntese.
     """
+    import app.services.handlers as handlers
+
     handlers.clean()
 
 
@@ -113,10 +196,14 @@ def limpeza():
 @click.option(
     "--formato", default="PARQUET", help="formato para escrita da síntese"
 )
-def completa(sistema, operacao, execucao, formato):
+@profiling_options
+def completa(sistema, operacao, execucao, formato, perfilamento):
     """
     Realiza a síntese completa do DESSEM.
     """
+    import app.services.handlers as handlers
+    from app.services.unitofwork import factory
+
     os.environ["FORMATO_SINTESE"] = formato
     Log.log().info("# Realizando síntese COMPLETA #")
 
@@ -124,18 +211,212 @@ def completa(sistema, operacao, execucao, formato):
         "FS",
         os.curdir,
     )
-    command = commands.SynthetizeSystem(sistema)
-    handlers.synthetize_system(command, uow)
-    command = commands.SynthetizeOperation(operacao)
-    handlers.synthetize_operation(command, uow)
-    command = commands.SynthetizeExecution(execucao)
-    handlers.synthetize_execution(command, uow)
+    with _profiling_session(uow, **perfilamento):
+        # As medições de memória consideram apenas a thread principal,
+        # logo as famílias são sintetizadas sequencialmente
+        command = commands.SynthetizeComplete(
+            sistema,
+            operacao,
+            execucao,
+            concurrent=not perfilamento["memoria"],
+        )
+        handlers.synthetize_complete(command, uow)
 
     Log.log().info("# Fim da síntese #")
 
 
+@click.command("servidor")
+@click.option(
+    "--host", default="127.0.0.1", help="endereço para escuta das requisições"
+)
+@click.option(
+    "--porta", default=8765, type=int, help="porta para escuta das requisições"
+)
+@click.option(
+    "--casos",
+    default=8,
+    type=int,
+    help="número máximo de casos mantidos em memória",
+)
+def servidor(host, porta, casos):
+    """
+    Inicia um servidor local que recebe requisições de síntese.
+    """
+    from app.services.server import serve
+
+    Log.log().info("# Iniciando servidor de síntese #")
+    serve(host, porta, casos)
+    Log.log().info("# Fim do servidor de síntese #")
+
+
+@click.command("monitorar")
+@click.argument("diretorio", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--sistema", multiple=True, help="variável do sistema para síntese"
+)
+@click.option(
+    "--operacao", multiple=True, help="variável da operação para síntese"
+)
+@click.option(
+    "--execucao", multiple=True, help="variável da execução para síntese"
+)
+@click.option(
+    "--formato", default="PARQUET", help="formato para escrita da síntese"
+)
+@click.option(
+    "--processos", default=2, type=int, help="número de processos de síntese"
+)
+@click.option(
+    "--estabilidade",
+    default=5.0,
+    type=float,
+    help="tempo (s) sem alterações para considerar um caso concluído",
+)
+@click.option(
+    "--intervalo",
+    default=2.0,
+    type=float,
+    help="intervalo (s) entre as varreduras do diretório",
+)
+def monitorar(
+    diretorio,
+    sistema,
+    operacao,
+    execucao,
+    formato,
+    processos,
+    estabilidade,
+    intervalo,
+):
+    """
+    Monitora um diretório, realizando a síntese completa
+    dos casos do DESSEM concluídos.
+    """
+    from app.services.monitor import CaseMonitor
+
+    os.environ["FORMATO_SINTESE"] = formato
+    Log.log().info("# Iniciando monitoramento de casos #")
+    monitor = CaseMonitor(
+        diretorio,
+        workers=processos,
+        debounce=estabilidade,
+        interval=intervalo,
+        sistema=list(sistema),
+        operacao=list(operacao),
+        execucao=list(execucao),
+    )
+    try:
+        monitor.run()
+    except KeyboardInterrupt:
+        pass
+    Log.log().info("# Fim do monitoramento #")
+
+
+@click.command("consolidar")
+@click.argument("destino", type=click.Path(file_okay=False))
+@click.argument(
+    "caminhos", nargs=-1, required=True, type=click.Path(exists=True)
+)
+def consolidar(destino, caminhos):
+    """
+    Consolida as sínteses de vários casos em um único dataset
+    particionado por síntese e data do caso.
+    """
+    from app.services.consolidation import CaseConsolidator
+
+    Log.log().info("# Consolidando sínteses de casos #")
+    consolidator = CaseConsolidator(destino)
+    entries = consolidator.consolidate(list(caminhos))
+    Log.log().info(
+        f"{len(entries)} casos consolidados em {consolidator.destination}"
+    )
+    Log.log().info("# Fim da consolidação #")
+
+
+@click.command("consulta")
+@click.argument("caminho", type=click.Path(exists=True, file_okay=False))
+@click.argument("saida")
+@click.option("--codigos", default=None, help="códigos da entidade (ex. 1,2,3)")
+@click.option(
+    "--filtro",
+    multiple=True,
+    help="valores aceitos para uma coluna (ex. patamar=1,2)",
+)
+@click.option("--inicio", default=None, help="data mínima de início")
+@click.option("--fim", default=None, help="data máxima de início")
+@click.option("--estagios", default=None, help="estágios (ex. 1-24)")
+@click.option("--colunas", default=None, help="colunas do resultado")
+@click.option("--casos", default=None, help="casos do histórico consolidado")
+@click.option(
+    "--formato",
+    default="CSV",
+    type=click.Choice(["CSV", "PARQUET", "ARROW"], case_sensitive=False),
+    help="formato do resultado escrito na saída padrão",
+)
+def consulta(
+    caminho,
+    saida,
+    codigos,
+    filtro,
+    inicio,
+    fim,
+    estagios,
+    colunas,
+    casos,
+    formato,
+):
+    """
+    Consulta uma saída sintetizada de um caso ou de um histórico
+    consolidado, escrevendo o resultado na saída padrão.
+    """
+    import sys
+
+    from app.services.query import SynthesisQuery, write_query
+
+    def split(value):
+        return [v.strip() for v in value.split(",")] if value else None
+
+    filtros = {}
+    for f in filtro:
+        column, sep, values = f.partition("=")
+        if not sep:
+            raise click.BadParameter(f, param_hint="--filtro")
+        filtros[column.strip()] = split(values)
+    stages = None
+    if estagios:
+        first, _, last = estagios.partition("-")
+        try:
+            stages = (int(first), int(last or first))
+        except ValueError:
+            raise click.BadParameter(estagios, param_hint="--estagios")
+    try:
+        codes = [int(c) for c in split(codigos) or []]
+    except ValueError:
+        raise click.BadParameter(codigos, param_hint="--codigos")
+    query = SynthesisQuery(
+        caminho,
+        saida,
+        codigos=codes,
+        filtros=filtros,
+        inicio=inicio,
+        fim=fim,
+        estagios=stages,
+        colunas=split(colunas),
+        casos=split(casos),
+    )
+    try:
+        write_query(query.reader(), formato, sys.stdout.buffer)
+    except (FileNotFoundError, ValueError) as e:
+        raise click.ClickException(str(e))
+    sys.stdout.buffer.flush()
+
+
 app.add_command(completa)
 app.add_command(sistema)
 app.add_command(operacao)
 app.add_command(execucao)
 app.add_command(limpeza)
+app.add_command(servidor)
+app.add_command(monitorar)
+app.add_command(consolidar)
+app.add_command(consulta)
@@ -20,3 +20,11 @@ class SynthetizeScenario:
 @dataclass
 class SynthetizeOperation:
     variables: List[str]
+
+
+@dataclass
+class SynthetizeComplete:
+    system: List[str]
+    operation: List[str]
+    execution: List[str]
+    concurrent: bool = True
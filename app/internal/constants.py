@@ -32,6 +32,7 @@ NODE_COL = "no"
 PROBABILITY_COL = "probabilidade"
 
 GROUPING_TMP_COL = "group"
+ORDERING_TMP_COL = "ordem"
 SYSTEM_GROUPING_COL = "sin"
 PRODUCTIVITY_TMP_COL = "prod"
 LOWER_BOUND_UNIT_COL = "unidade_limite_inferior"
@@ -119,6 +120,7 @@ SCENARIO_SYNTHESIS_METADATA_OUTPUT = "METADADOS_CENARIOS"
 SCENARIO_SYNTHESIS_STATS_ROOT = "ESTATISTICAS_CENARIOS"
 POLICY_SYNTHESIS_METADATA_OUTPUT = "METADADOS_POLITICA"
 SYSTEM_SYNTHESIS_METADATA_OUTPUT = "METADADOS_SISTEMA"
+PERFORMANCE_METADATA_OUTPUT = "METADADOS_DESEMPENHO"
 EXECUTION_SYNTHESIS_SUBDIR = ""
 OPERATION_SYNTHESIS_SUBDIR = ""
 SCENARIO_SYNTHESIS_SUBDIR = ""
@@ -127,12 +129,24 @@ SYSTEM_SYNTHESIS_SUBDIR = ""
 
 QUANTILES_FOR_STATISTICS = [0.05 * i for i in range(21)]
 
-import pandas  # type: ignore # noqa: E402
 
-__has_numba = find_spec("numba") is not None
-if pandas.__version__ >= "2.2.0" and __has_numba:
-    PANDAS_GROUPING_ENGINE = "numba"
-else:
-    PANDAS_GROUPING_ENGINE = "cython"
-
-STRING_DF_TYPE = pandas.StringDtype(storage="pyarrow")
+def __getattr__(name: str):
+    # Constantes que dependem do pandas são resolvidas apenas no
+    # primeiro acesso, evitando a importação do pandas na carga
+    # do módulo.
+    if name == "PANDAS_GROUPING_ENGINE":
+        import pandas  # type: ignore
+
+        has_numba = find_spec("numba") is not None
+        if pandas.__version__ >= "2.2.0" and has_numba:
+            value = "numba"
+        else:
+            value = "cython"
+    elif name == "STRING_DF_TYPE":
+        import pandas  # type: ignore
+
+        value = pandas.StringDtype(storage="pyarrow")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -1,12 +1,21 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from app.internal.constants import (
+    HYDRO_CODE_COL,
+    SUBMARKET_CODE_COL,
+    THERMAL_CODE_COL,
+)
 from app.model.operation.spatialresolution import SpatialResolution
+from app.model.operation.synthesissource import (
+    SynthesisBounds,
+    SynthesisSource,
+)
 from app.model.operation.unit import Unit
 from app.model.operation.variable import Variable
 
 
-@dataclass
+@dataclass(frozen=True)
 class OperationSynthesis:
     variable: Variable
     spatial_resolution: SpatialResolution
@@ -19,22 +28,6 @@ class OperationSynthesis:
             ]
         )
 
-    def __hash__(self) -> int:
-        return hash(
-            f"{self.variable.value}_" + f"{self.spatial_resolution.value}_"
-        )
-
-    def __eq__(self, o: object) -> bool:
-        if not isinstance(o, OperationSynthesis):
-            return False
-        else:
-            return all(
-                [
-                    self.variable == o.variable,
-                    self.spatial_resolution == o.spatial_resolution,
-                ]
-            )
-
     @classmethod
     def factory(cls, synthesis: str) -> Optional["OperationSynthesis"]:
         data = synthesis.split("_")
@@ -91,137 +84,456 @@ SUPPORTED_SYNTHESIS: list[str] = [
 
 SYNTHESIS_DEPENDENCIES: dict[OperationSynthesis, list[OperationSynthesis]] = {}
 
-UNITS: dict[OperationSynthesis, Unit] = {
-    OperationSynthesis(
-        Variable.CUSTO_MARGINAL_OPERACAO, SpatialResolution.SUBMERCADO
-    ): Unit.RS_MWh,
-    OperationSynthesis(Variable.MERCADO, SpatialResolution.SUBMERCADO): Unit.MW,
-    OperationSynthesis(
-        Variable.MERCADO, SpatialResolution.SISTEMA_INTERLIGADO
-    ): Unit.MW,
-    OperationSynthesis(
-        Variable.MERCADO_LIQUIDO, SpatialResolution.SUBMERCADO
-    ): Unit.MW,
-    OperationSynthesis(
-        Variable.MERCADO_LIQUIDO, SpatialResolution.SISTEMA_INTERLIGADO
-    ): Unit.MW,
-    OperationSynthesis(
-        Variable.GERACAO_HIDRAULICA, SpatialResolution.USINA_HIDROELETRICA
-    ): Unit.MW,
-    OperationSynthesis(
-        Variable.GERACAO_HIDRAULICA, SpatialResolution.SUBMERCADO
-    ): Unit.MW,
-    OperationSynthesis(
-        Variable.GERACAO_HIDRAULICA, SpatialResolution.SISTEMA_INTERLIGADO
-    ): Unit.MW,
-    OperationSynthesis(
-        Variable.GERACAO_TERMICA, SpatialResolution.USINA_TERMELETRICA
-    ): Unit.MW,
-    OperationSynthesis(
-        Variable.GERACAO_TERMICA, SpatialResolution.SUBMERCADO
-    ): Unit.MW,
+
+def _thermal_generation_bounds(
+    entity_column: Optional[str],
+) -> SynthesisBounds:
+    return SynthesisBounds(
+        "_thermal_generation_bounds",
+        {"entity_column": entity_column},
+        ["thermal_generation_bounds"],
+    )
+
+
+def _hydro_generation_bounds(entity_column: Optional[str]) -> SynthesisBounds:
+    return SynthesisBounds(
+        "_hydro_generation_bounds",
+        {"entity_column": entity_column},
+        ["hydro_generation_bounds"],
+        {"pdo_hidr": ["geracao_maxima"]},
+    )
+
+
+def _hydro_turbined_flow_bounds(
+    entity_column: Optional[str],
+) -> SynthesisBounds:
+    return SynthesisBounds(
+        "_hydro_turbined_flow_bounds",
+        {"entity_column": entity_column},
+        ["hydro_turbined_flow_bounds"],
+        {
+            "pdo_hidr": [
+                "vazao_turbinada_minima_m3s",
+                "vazao_turbinada_maxima_m3s",
+                "engolimento_maximo_m3s",
+            ]
+        },
+    )
+
+
+def _hydro_outflow_bounds(entity_column: Optional[str]) -> SynthesisBounds:
+    return SynthesisBounds(
+        "_hydro_outflow_bounds",
+        {"entity_column": entity_column},
+        ["hydro_outflow_bounds"],
+    )
+
+
+def _hydro_spilled_flow_bounds(
+    entity_column: Optional[str],
+) -> SynthesisBounds:
+    return SynthesisBounds(
+        "_hydro_spilled_flow_bounds",
+        {"entity_column": entity_column},
+        ["hydro_spilled_flow_bounds"],
+    )
+
+
+def _stored_volume_bounds(entity_column: Optional[str]) -> SynthesisBounds:
+    return SynthesisBounds(
+        "_stored_volume_bounds",
+        {"entity_column": entity_column},
+        ["stored_volume_bounds"],
+    )
+
+
+# Registro das sínteses da operação: para cada síntese, a origem dos
+# dados, a unidade e o cálculo dos limites. Os métodos e tabelas são
+# referenciados pelos seus nomes e resolvidos por quem os consome.
+SYNTHESIS_SOURCES: dict[OperationSynthesis, SynthesisSource] = {
     OperationSynthesis(
-        Variable.GERACAO_TERMICA, SpatialResolution.SISTEMA_INTERLIGADO
-    ): Unit.MW,
+        Variable.CUSTO_MARGINAL_OPERACAO,
+        SpatialResolution.SUBMERCADO,
+    ): SynthesisSource(
+        "_resolve_pdo_sist_sbm",
+        "pdo_sist",
+        "cmo",
+        Unit.RS_MWh,
+    ),
+    OperationSynthesis(
+        Variable.MERCADO,
+        SpatialResolution.SUBMERCADO,
+    ): SynthesisSource(
+        "_resolve_pdo_sist_sbm",
+        "pdo_sist",
+        "demanda",
+        Unit.MW,
+    ),
+    OperationSynthesis(
+        Variable.MERCADO,
+        SpatialResolution.SISTEMA_INTERLIGADO,
+    ): SynthesisSource(
+        "_resolve_pdo_sist_sin",
+        "pdo_sist",
+        "demanda",
+        Unit.MW,
+    ),
+    OperationSynthesis(
+        Variable.MERCADO_LIQUIDO,
+        SpatialResolution.SUBMERCADO,
+    ): SynthesisSource(
+        "_resolve_pdo_sist_sbm",
+        "pdo_sist",
+        "demanda_liquida",
+        Unit.MW,
+    ),
+    OperationSynthesis(
+        Variable.MERCADO_LIQUIDO,
+        SpatialResolution.SISTEMA_INTERLIGADO,
+    ): SynthesisSource(
+        "_resolve_pdo_sist_sin",
+        "pdo_sist",
+        "demanda_liquida",
+        Unit.MW,
+    ),
+    OperationSynthesis(
+        Variable.GERACAO_HIDRAULICA,
+        SpatialResolution.USINA_HIDROELETRICA,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "geracao",
+        Unit.MW,
+        _hydro_generation_bounds(HYDRO_CODE_COL),
+    ),
+    OperationSynthesis(
+        Variable.GERACAO_HIDRAULICA,
+        SpatialResolution.SUBMERCADO,
+    ): SynthesisSource(
+        "_resolve_hydro_submarkets_pdo_sist_sbm",
+        "pdo_sist",
+        "geracao_hidraulica",
+        Unit.MW,
+        _hydro_generation_bounds(SUBMARKET_CODE_COL),
+    ),
+    OperationSynthesis(
+        Variable.GERACAO_HIDRAULICA,
+        SpatialResolution.SISTEMA_INTERLIGADO,
+    ): SynthesisSource(
+        "_resolve_pdo_sist_sin",
+        "pdo_sist",
+        "geracao_hidraulica",
+        Unit.MW,
+        _hydro_generation_bounds(None),
+    ),
+    OperationSynthesis(
+        Variable.GERACAO_TERMICA,
+        SpatialResolution.USINA_TERMELETRICA,
+    ): SynthesisSource(
+        "_resolve_pdo_oper_term_ute",
+        "pdo_oper_term",
+        "geracao",
+        Unit.MW,
+        _thermal_generation_bounds(THERMAL_CODE_COL),
+    ),
+    OperationSynthesis(
+        Variable.GERACAO_TERMICA,
+        SpatialResolution.SUBMERCADO,
+    ): SynthesisSource(
+        "_resolve_thermal_submarkets_pdo_sist_sbm",
+        "pdo_sist",
+        "geracao_termica",
+        Unit.MW,
+        _thermal_generation_bounds(SUBMARKET_CODE_COL),
+    ),
+    OperationSynthesis(
+        Variable.GERACAO_TERMICA,
+        SpatialResolution.SISTEMA_INTERLIGADO,
+    ): SynthesisSource(
+        "_resolve_pdo_sist_sin",
+        "pdo_sist",
+        "geracao_termica",
+        Unit.MW,
+        _thermal_generation_bounds(None),
+    ),
     OperationSynthesis(
-        Variable.GERACAO_USINAS_NAO_SIMULADAS, SpatialResolution.SUBMERCADO
-    ): Unit.MW,
+        Variable.GERACAO_USINAS_NAO_SIMULADAS,
+        SpatialResolution.SUBMERCADO,
+    ): SynthesisSource(
+        "_resolve_pdo_eolica_sbm",
+        "pdo_eolica",
+        "geracao",
+        Unit.MW,
+    ),
     OperationSynthesis(
         Variable.GERACAO_USINAS_NAO_SIMULADAS,
         SpatialResolution.SISTEMA_INTERLIGADO,
-    ): Unit.MW,
+    ): SynthesisSource(
+        "_resolve_pdo_eolica_sin",
+        "pdo_eolica",
+        "geracao",
+        Unit.MW,
+    ),
     OperationSynthesis(
         Variable.GERACAO_USINAS_NAO_SIMULADAS_DISPONIVEL,
         SpatialResolution.SUBMERCADO,
-    ): Unit.MW,
+    ): SynthesisSource(
+        "_resolve_pdo_eolica_sbm",
+        "pdo_eolica",
+        "geracao_pre_definida",
+        Unit.MW,
+    ),
     OperationSynthesis(
         Variable.GERACAO_USINAS_NAO_SIMULADAS_DISPONIVEL,
         SpatialResolution.SISTEMA_INTERLIGADO,
-    ): Unit.MW,
+    ): SynthesisSource(
+        "_resolve_pdo_eolica_sin",
+        "pdo_eolica",
+        "geracao_pre_definida",
+        Unit.MW,
+    ),
     OperationSynthesis(
         Variable.CORTE_GERACAO_USINAS_NAO_SIMULADAS,
         SpatialResolution.SUBMERCADO,
-    ): Unit.MW,
+    ): SynthesisSource(
+        "_resolve_pdo_eolica_sbm",
+        "pdo_eolica",
+        "corte_geracao",
+        Unit.MW,
+    ),
     OperationSynthesis(
         Variable.CORTE_GERACAO_USINAS_NAO_SIMULADAS,
         SpatialResolution.SISTEMA_INTERLIGADO,
-    ): Unit.MW,
+    ): SynthesisSource(
+        "_resolve_pdo_eolica_sin",
+        "pdo_eolica",
+        "corte_geracao",
+        Unit.MW,
+    ),
     OperationSynthesis(
-        Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL, SpatialResolution.SUBMERCADO
-    ): Unit.MWh,
+        Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
+        SpatialResolution.SUBMERCADO,
+    ): SynthesisSource(
+        "_resolve_pdo_sist_sbm",
+        "pdo_sist",
+        "energia_armazenada",
+        Unit.MWh,
+    ),
     OperationSynthesis(
         Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
         SpatialResolution.SISTEMA_INTERLIGADO,
-    ): Unit.MWh,
+    ): SynthesisSource(
+        "_resolve_pdo_sist_sin",
+        "pdo_sist",
+        "energia_armazenada",
+        Unit.MWh,
+    ),
+    OperationSynthesis(
+        Variable.VOLUME_ARMAZENADO_PERCENTUAL_FINAL,
+        SpatialResolution.USINA_HIDROELETRICA,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "volume_final_percentual",
+        Unit.perc,
+        SynthesisBounds("_stored_volume_percentual_bounds"),
+    ),
+    OperationSynthesis(
+        Variable.VOLUME_ARMAZENADO_PERCENTUAL_INICIAL,
+        SpatialResolution.USINA_HIDROELETRICA,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "volume_inicial_percentual",
+        Unit.perc,
+        SynthesisBounds("_stored_volume_percentual_bounds"),
+    ),
     OperationSynthesis(
         Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
         SpatialResolution.USINA_HIDROELETRICA,
-    ): Unit.hm3,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "volume_final_absoluto_hm3",
+        Unit.hm3,
+        _stored_volume_bounds(HYDRO_CODE_COL),
+    ),
     OperationSynthesis(
         Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
         SpatialResolution.SUBMERCADO,
-    ): Unit.hm3,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_sbm",
+        "pdo_hidr",
+        "volume_final_absoluto_hm3",
+        Unit.hm3,
+        _stored_volume_bounds(SUBMARKET_CODE_COL),
+    ),
     OperationSynthesis(
         Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
         SpatialResolution.SISTEMA_INTERLIGADO,
-    ): Unit.hm3,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_sin",
+        "pdo_hidr",
+        "volume_final_absoluto_hm3",
+        Unit.hm3,
+        _stored_volume_bounds(None),
+    ),
     OperationSynthesis(
         Variable.VOLUME_ARMAZENADO_ABSOLUTO_INICIAL,
         SpatialResolution.USINA_HIDROELETRICA,
-    ): Unit.hm3,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "volume_inicial_absoluto_hm3",
+        Unit.hm3,
+        _stored_volume_bounds(HYDRO_CODE_COL),
+    ),
     OperationSynthesis(
         Variable.VOLUME_ARMAZENADO_ABSOLUTO_INICIAL,
         SpatialResolution.SUBMERCADO,
-    ): Unit.hm3,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_sbm",
+        "pdo_hidr",
+        "volume_inicial_absoluto_hm3",
+        Unit.hm3,
+        _stored_volume_bounds(SUBMARKET_CODE_COL),
+    ),
     OperationSynthesis(
         Variable.VOLUME_ARMAZENADO_ABSOLUTO_INICIAL,
         SpatialResolution.SISTEMA_INTERLIGADO,
-    ): Unit.hm3,
-    OperationSynthesis(
-        Variable.VOLUME_ARMAZENADO_PERCENTUAL_FINAL,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_sin",
+        "pdo_hidr",
+        "volume_inicial_absoluto_hm3",
+        Unit.hm3,
+        _stored_volume_bounds(None),
+    ),
+    OperationSynthesis(
+        Variable.VALOR_AGUA,
         SpatialResolution.USINA_HIDROELETRICA,
-    ): Unit.perc,
-    OperationSynthesis(
-        Variable.VOLUME_ARMAZENADO_PERCENTUAL_INICIAL,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "valor_agua",
+        Unit.RS_MWh,
+    ),
+    OperationSynthesis(
+        Variable.VAZAO_TURBINADA,
         SpatialResolution.USINA_HIDROELETRICA,
-    ): Unit.perc,
-    OperationSynthesis(
-        Variable.VAZAO_TURBINADA, SpatialResolution.USINA_HIDROELETRICA
-    ): Unit.m3s,
-    OperationSynthesis(
-        Variable.VAZAO_TURBINADA, SpatialResolution.SISTEMA_INTERLIGADO
-    ): Unit.m3s,
-    OperationSynthesis(
-        Variable.VAZAO_VERTIDA, SpatialResolution.USINA_HIDROELETRICA
-    ): Unit.m3s,
-    OperationSynthesis(
-        Variable.VAZAO_VERTIDA, SpatialResolution.SISTEMA_INTERLIGADO
-    ): Unit.m3s,
-    OperationSynthesis(
-        Variable.VAZAO_DEFLUENTE, SpatialResolution.USINA_HIDROELETRICA
-    ): Unit.m3s,
-    OperationSynthesis(
-        Variable.VAZAO_DEFLUENTE, SpatialResolution.SISTEMA_INTERLIGADO
-    ): Unit.m3s,
-    OperationSynthesis(
-        Variable.VAZAO_INCREMENTAL, SpatialResolution.USINA_HIDROELETRICA
-    ): Unit.m3s,
-    OperationSynthesis(
-        Variable.VAZAO_AFLUENTE, SpatialResolution.USINA_HIDROELETRICA
-    ): Unit.m3s,
-    OperationSynthesis(
-        Variable.CUSTO_OPERACAO, SpatialResolution.SISTEMA_INTERLIGADO
-    ): Unit.kRS,
-    OperationSynthesis(
-        Variable.CUSTO_FUTURO, SpatialResolution.SISTEMA_INTERLIGADO
-    ): Unit.MiRS,
-    OperationSynthesis(
-        Variable.INTERCAMBIO, SpatialResolution.PAR_SUBMERCADOS
-    ): Unit.MW,
-    OperationSynthesis(
-        Variable.VOLUME_CALHA, SpatialResolution.USINA_HIDROELETRICA
-    ): Unit.hm3,
-    OperationSynthesis(
-        Variable.VALOR_AGUA, SpatialResolution.USINA_HIDROELETRICA
-    ): Unit.RS_MWh,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "vazao_turbinada_m3s",
+        Unit.m3s,
+        _hydro_turbined_flow_bounds(HYDRO_CODE_COL),
+    ),
+    OperationSynthesis(
+        Variable.VAZAO_TURBINADA,
+        SpatialResolution.SISTEMA_INTERLIGADO,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_sin",
+        "pdo_hidr",
+        "vazao_turbinada_m3s",
+        Unit.m3s,
+        _hydro_turbined_flow_bounds(None),
+    ),
+    OperationSynthesis(
+        Variable.VAZAO_VERTIDA,
+        SpatialResolution.USINA_HIDROELETRICA,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "vazao_vertida_m3s",
+        Unit.m3s,
+        _hydro_spilled_flow_bounds(HYDRO_CODE_COL),
+    ),
+    OperationSynthesis(
+        Variable.VAZAO_VERTIDA,
+        SpatialResolution.SISTEMA_INTERLIGADO,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_sin",
+        "pdo_hidr",
+        "vazao_vertida_m3s",
+        Unit.m3s,
+        _hydro_spilled_flow_bounds(None),
+    ),
+    OperationSynthesis(
+        Variable.VAZAO_INCREMENTAL,
+        SpatialResolution.USINA_HIDROELETRICA,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "vazao_incremental_m3s",
+        Unit.m3s,
+    ),
+    OperationSynthesis(
+        Variable.VAZAO_AFLUENTE,
+        SpatialResolution.USINA_HIDROELETRICA,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "vazao_afluente_m3s",
+        Unit.m3s,
+        SynthesisBounds("_lower_bounded_bounds"),
+    ),
+    OperationSynthesis(
+        Variable.VAZAO_DEFLUENTE,
+        SpatialResolution.USINA_HIDROELETRICA,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_uhe",
+        "pdo_hidr",
+        "vazao_defluente_m3s",
+        Unit.m3s,
+        _hydro_outflow_bounds(HYDRO_CODE_COL),
+    ),
+    OperationSynthesis(
+        Variable.VAZAO_DEFLUENTE,
+        SpatialResolution.SISTEMA_INTERLIGADO,
+    ): SynthesisSource(
+        "_resolve_pdo_hidr_sin",
+        "pdo_hidr",
+        "vazao_defluente_m3s",
+        Unit.m3s,
+        _hydro_outflow_bounds(None),
+    ),
+    OperationSynthesis(
+        Variable.CUSTO_OPERACAO,
+        SpatialResolution.SISTEMA_INTERLIGADO,
+    ): SynthesisSource(
+        "_resolve_pdo_operacao_costs",
+        "pdo_operacao",
+        "custo_presente",
+        Unit.kRS,
+    ),
+    OperationSynthesis(
+        Variable.CUSTO_FUTURO,
+        SpatialResolution.SISTEMA_INTERLIGADO,
+    ): SynthesisSource(
+        "_resolve_pdo_operacao_costs",
+        "pdo_operacao",
+        "custo_futuro",
+        Unit.MiRS,
+    ),
+    OperationSynthesis(
+        Variable.INTERCAMBIO,
+        SpatialResolution.PAR_SUBMERCADOS,
+    ): SynthesisSource(
+        "_resolve_pdo_inter_sbp",
+        "pdo_inter",
+        "intercambio",
+        Unit.MW,
+    ),
+    OperationSynthesis(
+        Variable.VOLUME_CALHA,
+        SpatialResolution.USINA_HIDROELETRICA,
+    ): SynthesisSource(
+        "_resolve_pdo_oper_tviag_calha_uhe",
+        "pdo_oper_tviag_calha",
+        "volume_calha_hm3",
+        Unit.hm3,
+    ),
+}
+
+UNITS: dict[OperationSynthesis, Unit] = {
+    s: source.unit for s, source in SYNTHESIS_SOURCES.items()
 }
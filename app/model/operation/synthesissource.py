@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.model.operation.unit import Unit
+
+
+@dataclass(frozen=True)
+class SynthesisBounds:
+    """
+    Cálculo dos limites de uma variável de operação: o método de
+    `OperationVariableBounds` e os seus argumentos, as tabelas de
+    limites do Deck utilizadas e as colunas das tabelas de dados
+    das quais os limites são obtidos.
+    """
+
+    method: str
+    arguments: Dict[str, Optional[str]] = field(default_factory=dict)
+    tables: List[str] = field(default_factory=list)
+    columns: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SynthesisSource:
+    """
+    Origem dos dados de uma síntese da operação: o método de resolução
+    de `OperationSynthetizer`, a tabela do Deck e a coluna da qual os
+    valores são obtidos, a unidade da variável e, caso a variável seja
+    limitada, o cálculo dos seus limites.
+    """
+
+    resolver: str
+    table: str
+    column: str
+    unit: Unit
+    bounds: Optional[SynthesisBounds] = None
@@ -1,4 +1,5 @@
 from os import getenv
+from pathlib import Path
 
 from app.utils.singleton import Singleton
 
@@ -6,8 +7,15 @@ from app.utils.singleton import Singleton
 class Settings(metaclass=Singleton):
     def __init__(self):
         # Execution parameters
-        self.installdir = getenv("APP_INSTALLDIR")
+        self.installdir = getenv(
+            "APP_INSTALLDIR", str(Path(__file__).resolve().parents[2])
+        )
         self.basedir = getenv("APP_BASEDIR")
         self.encoding_script = "app/static/converte_utf8.sh"
         self.synthesis_format = getenv("FORMATO_SINTESE", "PARQUET")
         self.synthesis_dir = getenv("DIRETORIO_SINTESE", "sintese")
+        self.grouping_kernel = getenv("KERNEL_AGRUPAMENTO", "PANDAS").upper()
+        self.scenario_workers = int(getenv("CENARIOS_PARALELOS", "2"))
+        self.quantile_error = float(getenv("ERRO_QUANTIS", "0.01"))
+        self.reading_processes = int(getenv("PROCESSOS_LEITURA", "0"))
+        self.deck_store_dir = getenv("DIRETORIO_TABELAS", "")
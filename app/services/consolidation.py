@@ -0,0 +1,213 @@
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+
+from app.internal.constants import START_DATE_COL
+from app.model.settings import Settings
+from app.utils.fs import case_fingerprint
+
+MANIFEST_FILENAME = "_manifesto.jsonl"
+OUTPUT_PARTITION = "saida"
+DATE_PARTITION = "data_caso"
+CASE_COL = "caso"
+STAGES_OUTPUT = "EST"
+PARTITIONING = ds.partitioning(
+    pa.schema(
+        [
+            (OUTPUT_PARTITION, pa.string()),
+            (DATE_PARTITION, pa.string()),
+        ]
+    ),
+    flavor="hive",
+)
+
+
+@dataclass
+class ManifestEntry:
+    caso: str
+    caminho: str
+    data_caso: str
+    impressao: str
+    saidas: int
+    linhas: int
+    consolidado_em: str
+
+
+class CaseConsolidator:
+    """
+    Consolida as sínteses de vários casos em um único dataset do Arrow,
+    particionado pela síntese e data do caso (`saida=.../data_caso=...`),
+    com a coluna `caso` identificando a origem de cada linha.
+
+    A consolidação é incremental: um manifesto registra os casos já
+    consolidados, que são ignorados enquanto as suas sínteses não forem
+    alteradas. Os arquivos são lidos e escritos em lotes, mantendo o
+    consumo de memória independente do número de casos.
+    """
+
+    def __init__(self, destination: str):
+        self.destination = Path(destination).resolve()
+        self.manifest_path = self.destination.joinpath(MANIFEST_FILENAME)
+        self.logger = logging.getLogger("main")
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self) -> dict[str, ManifestEntry]:
+        entries: dict[str, ManifestEntry] = {}
+        if not self.manifest_path.is_file():
+            return entries
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = ManifestEntry(**json.loads(line))
+                    entries[entry.caso] = entry
+        return entries
+
+    def _append_manifest(self, entry: ManifestEntry):
+        self.destination.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(entry)) + "\n")
+        self.manifest[entry.caso] = entry
+
+    @staticmethod
+    def find_cases(paths: list[str]) -> list[Path]:
+        """
+        Encontra os diretórios de casos com sínteses em Parquet
+        nos caminhos fornecidos, buscando recursivamente.
+        """
+        synthesis_dir = Settings().synthesis_dir
+        cases: list[Path] = []
+        for path in paths:
+            for dirpath, dirnames, _ in os.walk(Path(path).resolve()):
+                if synthesis_dir in dirnames:
+                    outdir = Path(dirpath).joinpath(synthesis_dir)
+                    if any(outdir.glob("*.parquet")):
+                        cases.append(Path(dirpath))
+                dirnames[:] = sorted(d for d in dirnames if d != synthesis_dir)
+        return sorted(set(cases))
+
+    def _case_id(self, case: Path) -> str:
+        for entry in self.manifest.values():
+            if entry.caminho == str(case):
+                return entry.caso
+        case_id = case.name
+        existing = self.manifest.get(case_id)
+        if existing is not None and existing.caminho != str(case):
+            path_hash = hashlib.blake2b(str(case).encode(), digest_size=4)
+            case_id = f"{case_id}-{path_hash.hexdigest()}"
+        return case_id
+
+    @staticmethod
+    def _case_date(outdir: Path) -> str:
+        stages = outdir.joinpath(f"{STAGES_OUTPUT}.parquet")
+        if stages.is_file():
+            dates = pq.read_table(stages, columns=[START_DATE_COL])
+            first = pc.min(dates[START_DATE_COL]).as_py()
+            if first is not None:
+                return first.date().isoformat()
+        return "desconhecida"
+
+    @staticmethod
+    def _token(case_id: str) -> str:
+        return hashlib.blake2b(case_id.encode(), digest_size=8).hexdigest()
+
+    def _remove_case(self, case_id: str):
+        token = self._token(case_id)
+        for fragment in self.destination.glob(f"*/*/{token}-*.parquet"):
+            fragment.unlink()
+
+    @staticmethod
+    def _schema(path: Path) -> pa.Schema:
+        schema = pq.read_schema(path).remove_metadata()
+        for name in [CASE_COL, OUTPUT_PARTITION, DATE_PARTITION]:
+            schema = schema.append(pa.field(name, pa.string()))
+        return schema
+
+    def _write_output(
+        self, path: Path, output: str, date: str, case_id: str
+    ) -> int:
+        schema = self._schema(path)
+        rows = 0
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            nonlocal rows
+            for batch in pq.ParquetFile(path).iter_batches():
+                n = batch.num_rows
+                rows += n
+                yield pa.RecordBatch.from_arrays(
+                    batch.columns
+                    + [
+                        pa.array([case_id] * n, pa.string()),
+                        pa.array([output] * n, pa.string()),
+                        pa.array([date] * n, pa.string()),
+                    ],
+                    schema=schema,
+                )
+
+        ds.write_dataset(
+            batches(),
+            self.destination,
+            schema=schema,
+            format="parquet",
+            partitioning=PARTITIONING,
+            basename_template=f"{self._token(case_id)}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        return rows
+
+    def consolidate_case(self, case: Path) -> Optional[ManifestEntry]:
+        """
+        Consolida as sínteses de um caso, caso ainda não tenham sido
+        consolidadas ou tenham sido alteradas desde a última vez.
+        """
+        outdir = case.joinpath(Settings().synthesis_dir)
+        fingerprint = case_fingerprint(outdir)
+        case_id = self._case_id(case)
+        entry = self.manifest.get(case_id)
+        if entry is not None and entry.impressao == fingerprint:
+            return None
+        if entry is not None:
+            self.logger.info(f"Caso alterado, reconsolidando: {case}")
+            self._remove_case(case_id)
+        date = self._case_date(outdir)
+        outputs = sorted(outdir.glob("*.parquet"))
+        rows = 0
+        for output in outputs:
+            rows += self._write_output(output, output.stem, date, case_id)
+        new_entry = ManifestEntry(
+            caso=case_id,
+            caminho=str(case),
+            data_caso=date,
+            impressao=fingerprint,
+            saidas=len(outputs),
+            linhas=rows,
+            consolidado_em=datetime.now(timezone.utc).isoformat(),
+        )
+        self._append_manifest(new_entry)
+        self.logger.info(
+            f"Caso {case_id} consolidado: {len(outputs)} saídas, {rows} linhas"
+        )
+        return new_entry
+
+    def consolidate(self, paths: list[str]) -> list[ManifestEntry]:
+        """
+        Consolida todos os casos encontrados nos caminhos fornecidos,
+        retornando as entradas do manifesto dos casos consolidados.
+        """
+        consolidated: list[ManifestEntry] = []
+        for case in self.find_cases(paths):
+            if self.destination == case or self.destination in case.parents:
+                continue
+            entry = self.consolidate_case(case)
+            if entry is not None:
+                consolidated.append(entry)
+        return consolidated
@@ -1,5 +1,5 @@
 from logging import INFO, Logger
-from typing import Callable, Dict, Optional, TypeVar
+from typing import Dict, Optional, TypeVar
 
 import numpy as np
 import pandas as pd  # type: ignore
@@ -15,10 +15,11 @@ from app.internal.constants import (
     HYDRO_CODE_COL,
 )
 from app.services.deck.deck import Deck
-from app.model.operation.operationsynthesis import OperationSynthesis
+from app.model.operation.operationsynthesis import (
+    SYNTHESIS_SOURCES,
+    OperationSynthesis,
+)
 from app.services.unitofwork import AbstractUnitOfWork
-from app.model.operation.variable import Variable
-from app.model.operation.spatialresolution import SpatialResolution
 from app.utils.operations import fast_group_df
 
 
@@ -26,167 +27,13 @@ class OperationVariableBounds:
     """
     Entidade responsável por calcular os limites das variáveis de operação
     existentes nos arquivos de saída do DESSEM, que são processadas no
-    processo de síntese da operação.
+    processo de síntese da operação. O método de cálculo dos limites
+    de cada síntese é obtido do registro `SYNTHESIS_SOURCES`.
     """
 
     T = TypeVar("T")
     logger: Optional[Logger] = None
 
-    MAPPINGS: Dict[OperationSynthesis, Callable] = {
-        OperationSynthesis(
-            Variable.GERACAO_TERMICA,
-            SpatialResolution.USINA_TERMELETRICA,
-        ): lambda df,
-        uow,
-        _: OperationVariableBounds._thermal_generation_bounds(
-            df, uow, entity_column=THERMAL_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.GERACAO_TERMICA,
-            SpatialResolution.SUBMERCADO,
-        ): lambda df,
-        uow,
-        _: OperationVariableBounds._thermal_generation_bounds(
-            df, uow, entity_column=SUBMARKET_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.GERACAO_TERMICA,
-            SpatialResolution.SISTEMA_INTERLIGADO,
-        ): lambda df,
-        uow,
-        _: OperationVariableBounds._thermal_generation_bounds(
-            df, uow, entity_column=None
-        ),
-        OperationSynthesis(
-            Variable.GERACAO_HIDRAULICA,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df, uow, _: OperationVariableBounds._hydro_generation_bounds(
-            df, uow, entity_column=HYDRO_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.GERACAO_HIDRAULICA,
-            SpatialResolution.SUBMERCADO,
-        ): lambda df, uow, _: OperationVariableBounds._hydro_generation_bounds(
-            df, uow, entity_column=SUBMARKET_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.GERACAO_HIDRAULICA,
-            SpatialResolution.SISTEMA_INTERLIGADO,
-        ): lambda df, uow, _: OperationVariableBounds._hydro_generation_bounds(
-            df, uow, entity_column=None
-        ),
-        OperationSynthesis(
-            Variable.VAZAO_AFLUENTE,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df, uow, _: OperationVariableBounds._lower_bounded_bounds(
-            df, uow
-        ),
-        OperationSynthesis(
-            Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df, uow, _: OperationVariableBounds._stored_volume_bounds(
-            df, uow, entity_column=HYDRO_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.VOLUME_ARMAZENADO_ABSOLUTO_INICIAL,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df, uow, _: OperationVariableBounds._stored_volume_bounds(
-            df, uow, entity_column=HYDRO_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
-            SpatialResolution.SUBMERCADO,
-        ): lambda df, uow, _: OperationVariableBounds._stored_volume_bounds(
-            df, uow, entity_column=SUBMARKET_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.VOLUME_ARMAZENADO_ABSOLUTO_INICIAL,
-            SpatialResolution.SUBMERCADO,
-        ): lambda df, uow, _: OperationVariableBounds._stored_volume_bounds(
-            df, uow, entity_column=SUBMARKET_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
-            SpatialResolution.SISTEMA_INTERLIGADO,
-        ): lambda df, uow, _: OperationVariableBounds._stored_volume_bounds(
-            df, uow, entity_column=None
-        ),
-        OperationSynthesis(
-            Variable.VOLUME_ARMAZENADO_ABSOLUTO_INICIAL,
-            SpatialResolution.SISTEMA_INTERLIGADO,
-        ): lambda df, uow, _: OperationVariableBounds._stored_volume_bounds(
-            df, uow, entity_column=None
-        ),
-        OperationSynthesis(
-            Variable.VOLUME_ARMAZENADO_PERCENTUAL_FINAL,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df, uow, _: OperationVariableBounds._stored_volume_bounds(
-            df, uow, entity_column=HYDRO_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.VOLUME_ARMAZENADO_PERCENTUAL_INICIAL,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df,
-        uow,
-        _: OperationVariableBounds._stored_volume_percentual_bounds(
-            df,
-            uow,
-        ),
-        OperationSynthesis(
-            Variable.VOLUME_ARMAZENADO_PERCENTUAL_FINAL,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df,
-        uow,
-        _: OperationVariableBounds._stored_volume_percentual_bounds(
-            df,
-            uow,
-        ),
-        OperationSynthesis(
-            Variable.VAZAO_TURBINADA,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df,
-        uow,
-        _: OperationVariableBounds._hydro_turbined_flow_bounds(
-            df, uow, entity_column=HYDRO_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.VAZAO_TURBINADA,
-            SpatialResolution.SISTEMA_INTERLIGADO,
-        ): lambda df,
-        uow,
-        _: OperationVariableBounds._hydro_turbined_flow_bounds(
-            df, uow, entity_column=None
-        ),
-        OperationSynthesis(
-            Variable.VAZAO_DEFLUENTE,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df, uow, _: OperationVariableBounds._hydro_outflow_bounds(
-            df, uow, entity_column=HYDRO_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.VAZAO_DEFLUENTE,
-            SpatialResolution.SISTEMA_INTERLIGADO,
-        ): lambda df, uow, _: OperationVariableBounds._hydro_outflow_bounds(
-            df, uow, entity_column=None
-        ),
-        OperationSynthesis(
-            Variable.VAZAO_VERTIDA,
-            SpatialResolution.USINA_HIDROELETRICA,
-        ): lambda df,
-        uow,
-        _: OperationVariableBounds._hydro_spilled_flow_bounds(
-            df, uow, entity_column=HYDRO_CODE_COL
-        ),
-        OperationSynthesis(
-            Variable.VAZAO_VERTIDA,
-            SpatialResolution.SISTEMA_INTERLIGADO,
-        ): lambda df,
-        uow,
-        _: OperationVariableBounds._hydro_spilled_flow_bounds(
-            df, uow, entity_column=None
-        ),
-    }
-
     @classmethod
     def _log(cls, msg: str, level: int = INFO):
         if cls.logger is not None:
@@ -198,7 +45,8 @@ class OperationVariableBounds:
         Verifica se uma determinada síntese possui limites implementados
         para adição ao DataFrame.
         """
-        return s in cls.MAPPINGS
+        source = SYNTHESIS_SOURCES.get(s)
+        return source is not None and source.bounds is not None
 
     @classmethod
     def _unbounded(cls, df: pd.DataFrame) -> pd.DataFrame:
@@ -294,7 +142,8 @@ class OperationVariableBounds:
     ) -> pd.DataFrame:
         """
         Adiciona ao DataFrame da síntese os limites inferior e superior
-        para a variável de Geração Térmica (GTER) para cada UHE, submercado e SIN.
+        para a variável de Geração Térmica (GTER) para cada UHE,
+        submercado e SIN.
         """
         df_bounds = Deck.thermal_generation_bounds(uow)
         if entity_column != THERMAL_CODE_COL:
@@ -326,7 +175,8 @@ class OperationVariableBounds:
     ) -> pd.DataFrame:
         """
         Adiciona ao DataFrame da síntese os limites inferior e superior
-        para a variável de Geração Hidráulica (GHID) para cada UHE, submercado e SIN.
+        para a variável de Geração Hidráulica (GHID) para cada UHE,
+        submercado e SIN.
         """
         df_bounds = Deck.hydro_generation_bounds(uow)
         if entity_column != HYDRO_CODE_COL:
@@ -358,7 +208,8 @@ class OperationVariableBounds:
     ) -> pd.DataFrame:
         """
         Adiciona ao DataFrame da síntese os limites inferior e superior
-        para a variável de Vazão Turbinada (QTUR) para cada UHE, submercado e SIN.
+        para a variável de Vazão Turbinada (QTUR) para cada UHE,
+        submercado e SIN.
         """
         df_bounds = Deck.hydro_turbined_flow_bounds(uow)
         if entity_column != HYDRO_CODE_COL:
@@ -390,7 +241,8 @@ class OperationVariableBounds:
     ) -> pd.DataFrame:
         """
         Adiciona ao DataFrame da síntese os limites inferior e superior
-        para a variável de Vazão Turbinada (QDEF) para cada UHE, submercado e SIN.
+        para a variável de Vazão Turbinada (QDEF) para cada UHE,
+        submercado e SIN.
         """
         df_bounds = Deck.hydro_outflow_bounds(uow)
 
@@ -424,7 +276,8 @@ class OperationVariableBounds:
     ) -> pd.DataFrame:
         """
         Adiciona ao DataFrame da síntese os limites inferior e superior
-        para a variável de Vazão Turbinada (QDEF) para cada UHE, submercado e SIN.
+        para a variável de Vazão Turbinada (QDEF) para cada UHE,
+        submercado e SIN.
         """
         df_bounds = Deck.hydro_spilled_flow_bounds(uow)
 
@@ -519,9 +372,10 @@ class OperationVariableBounds:
         ou atribuindo -inf e +inf caso contrário.
 
         """
-        if cls.is_bounded(s):
+        bounds = SYNTHESIS_SOURCES[s].bounds if cls.is_bounded(s) else None
+        if bounds is not None:
             try:
-                return cls.MAPPINGS[s](df, uow, ordered_synthesis_entities)
+                return getattr(cls, bounds.method)(df, uow, **bounds.arguments)
             except Exception:
                 return cls._unbounded(df)
         else:
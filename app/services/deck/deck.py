@@ -1,7 +1,19 @@
 import logging
+import threading
 from datetime import datetime, timedelta
-from functools import partial
-from typing import Any, Dict, Optional, Type, TypeVar
+from functools import partial, wraps
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Type,
+    TypeVar,
+)
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
@@ -46,8 +58,59 @@ from app.internal.constants import (
     UPPER_BOUND_COL,
     VALUE_COL,
 )
+from app.services.deck.derived import (
+    DerivedColumn,
+    derive_columns,
+    source_columns,
+)
+from app.services.deck.entities import CodeMap, EntityRegistry
+from app.services.deck.store import DeckTableStore
 from app.services.unitofwork import AbstractUnitOfWork
-from app.utils.operations import fast_group_df
+from app.utils.operations import fast_group_df, numeric_columns
+from app.utils.tracing import Tracer, traced
+
+
+def _column(cls, col: str, *args, **kwargs) -> str:
+    return col
+
+
+def _register(cls, register: str, *args, **kwargs) -> str:
+    return register
+
+
+def _traced_table(key: str) -> Callable:
+    """
+    Registra a obtenção de uma tabela do deck em um intervalo de
+    rastreamento, indicando se a tabela já se encontrava em cache.
+    A obtenção é serializada por tabela, de modo que sínteses
+    concorrentes constroem cada tabela uma única vez, e as tabelas
+    compartilhadas entre processos são anexadas do repositório de
+    tabelas do caso ou publicadas nele após a construção.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(cls, *args, **kwargs):
+            with cls._table_lock(key):
+                publish = cls._attach_stored(key)
+                if not Tracer.active():
+                    data = func(cls, *args, **kwargs)
+                else:
+                    cached = key in cls.DECK_DATA_CACHING
+                    with Tracer.span("deck", tabela=key, cache=cached) as span:
+                        data = func(cls, *args, **kwargs)
+                        if not cached and isinstance(data, pd.DataFrame):
+                            span.set(
+                                linhas=len(data),
+                                bytes=int(data.memory_usage(index=False).sum()),
+                            )
+                if publish:
+                    cls._publish_stored(key)
+                return data
+
+        return wrapper
+
+    return decorator
 
 
 class Deck:
@@ -56,12 +119,332 @@ class Deck:
 
     DECK_DATA_CACHING: Dict[str, Any] = {}
 
+    # Travas da construção de cada tabela em cache, compartilhadas
+    # pelas sínteses executadas concorrentemente
+    TABLE_LOCKS: Dict[str, threading.RLock] = {}
+    TABLE_LOCKS_GUARD = threading.Lock()
+
+    # Repositório das tabelas do caso compartilhado entre processos e
+    # tabelas nele publicadas, que são construídas sem projeção
+    STORE: Optional[DeckTableStore] = None
+    STORED_TABLES = {
+        "pdo_sist",
+        "pdo_hidr",
+        "pdo_eolica",
+        "pdo_inter",
+        "pdo_oper_tviag_calha",
+        "pdo_oper_uct",
+        "pdo_oper_term",
+        "stages_durations",
+        "hydro_inflows",
+        "thermals",
+        "thermal_costs",
+        "submarkets",
+    }
+
+    # Cenário ao qual pertencem as saídas do DESSEM em processamento
+    SCENARIO = 1
+
+    # Linhas das tabelas por unidade geradora (PDO_OPER_TERM e
+    # PDO_OPER_UCT) lidas e agregadas por usina em cada bloco
+    UNIT_CHUNK_ROWS = 100_000
+
+    # Tabelas obtidas apenas dos arquivos compartilhados entre os
+    # cenários de um caso, que são mantidas na troca de cenário
+    SHARED_DATA_KEYS = {
+        "entdados",
+        "entdados_tm",
+        "entdados_sist",
+        "entdados_ree",
+        "entdados_uh",
+        "title",
+        "block_map",
+        "stage_block_map",
+        "eer_submarket_map",
+        "hydro_eer_map",
+        "submarkets",
+        "hydro_operative_constraints_id",
+        "hydro_operative_constraints_coefficients",
+        "hydro_operative_constraints_bounds",
+    }
+
+    # Colunas das tabelas necessárias às sínteses planejadas. As tabelas
+    # sem colunas registradas são construídas com todas as colunas. O
+    # registro e a leitura das colunas de cada tabela são feitos sob a
+    # trava da tabela, assim como a sua construção, de modo que uma
+    # síntese concorrente nunca constrói uma tabela com uma projeção
+    # registrada parcialmente.
+    REQUIRED_COLUMNS: Dict[str, Set[str]] = {}
+
+    # Colunas de identificação das tabelas, mantidas em qualquer projeção
+    KEY_COLUMNS: Dict[str, List[str]] = {
+        "pdo_sist": ["estagio", "nome_patamar", "nome_submercado"],
+        "pdo_hidr": [
+            "estagio",
+            "nome_patamar",
+            "codigo_usina",
+            "nome_usina",
+            "nome_submercado",
+            "conjunto",
+            "unidade",
+        ],
+    }
+
+    # Colunas das tabelas calculadas a partir de outras colunas, apenas
+    # quando solicitadas por alguma síntese, e mantidas na tabela em cache.
+    # O mapeamento não é alterado durante as sínteses, e as colunas são
+    # acrescentadas à tabela em cache sob a trava da tabela.
+    DERIVED_COLUMNS: Dict[str, Dict[str, DerivedColumn]] = {
+        "pdo_sist": {
+            "demanda_liquida": DerivedColumn(
+                [
+                    "demanda",
+                    "geracao_pequenas_usinas",
+                    "geracao_fixa_barra",
+                    "geracao_renovavel",
+                ],
+                lambda df, uow: (
+                    df["demanda"]
+                    - df["geracao_pequenas_usinas"]
+                    - df["geracao_fixa_barra"]
+                    - df["geracao_renovavel"]
+                ),
+            ),
+        },
+        "pdo_hidr": {
+            "volume_armazenado_minimo_hm3": DerivedColumn(
+                [],
+                lambda df, uow: Deck._hydro_storage_limit(
+                    df, uow, "volume_armazenado_minimo_hm3"
+                ),
+            ),
+            "volume_armazenado_maximo_hm3": DerivedColumn(
+                [],
+                lambda df, uow: Deck._hydro_storage_limit(
+                    df, uow, "volume_armazenado_maximo_hm3"
+                ),
+            ),
+            "volume_final_absoluto_hm3": DerivedColumn(
+                ["volume_final_hm3", "volume_armazenado_minimo_hm3"],
+                lambda df, uow: (
+                    df["volume_final_hm3"] + df["volume_armazenado_minimo_hm3"]
+                ),
+            ),
+            "volume_inicial_percentual": DerivedColumn(
+                ["volume_final_percentual"],
+                lambda df, uow: Deck._previous_stage(
+                    df,
+                    "volume_final_percentual",
+                    Deck._hydro_initial_volume(df, uow),
+                ),
+            ),
+            "volume_inicial_absoluto_hm3": DerivedColumn(
+                [
+                    "volume_final_absoluto_hm3",
+                    "volume_armazenado_minimo_hm3",
+                    "volume_armazenado_maximo_hm3",
+                ],
+                lambda df, uow: Deck._previous_stage(
+                    df,
+                    "volume_final_absoluto_hm3",
+                    df["volume_armazenado_minimo_hm3"].to_numpy()
+                    + 0.01
+                    * Deck._hydro_initial_volume(df, uow)
+                    * (
+                        df["volume_armazenado_maximo_hm3"].to_numpy()
+                        - df["volume_armazenado_minimo_hm3"].to_numpy()
+                    ),
+                ),
+            ),
+            "vazao_defluente_m3s": DerivedColumn(
+                ["vazao_turbinada_m3s", "vazao_vertida_m3s"],
+                lambda df, uow: (
+                    df["vazao_turbinada_m3s"] + df["vazao_vertida_m3s"]
+                ),
+            ),
+            "vazao_afluente_m3s": DerivedColumn(
+                [
+                    "vazao_incremental_m3s",
+                    "vazao_montante_m3s",
+                    "vazao_montante_tempo_viagem_m3s",
+                ],
+                lambda df, uow: (
+                    df["vazao_incremental_m3s"]
+                    + df["vazao_montante_m3s"]
+                    + df["vazao_montante_tempo_viagem_m3s"]
+                ),
+            ),
+        },
+        "pdo_eolica": {
+            "corte_geracao": DerivedColumn(
+                ["geracao_pre_definida", "geracao"],
+                lambda df, uow: df["geracao_pre_definida"] - df["geracao"],
+            ),
+        },
+    }
+
+    # Mapeamentos entre as entidades do caso e os métodos que os
+    # constroem a partir das tabelas de cadastro, apenas quando
+    # utilizados por alguma tabela
+    ENTITY_MAPS: Dict[str, str] = {
+        "submarket": "_submarket_code_map",
+        "hydro_eer": "_hydro_eer_code_map",
+        "eer_submarket": "_eer_submarket_code_map",
+        "hydro_submarket": "_hydro_submarket_code_map",
+        "thermal_submarket": "_thermal_submarket_code_map",
+    }
+
+    @classmethod
+    def _table_lock(cls, key: str) -> threading.RLock:
+        """
+        Obtém a trava da construção de uma tabela do deck em cache.
+        """
+        with cls.TABLE_LOCKS_GUARD:
+            return cls.TABLE_LOCKS.setdefault(key, threading.RLock())
+
+    @classmethod
+    def use_store(cls, store: Optional[DeckTableStore]):
+        """
+        Define o repositório das tabelas do caso compartilhado entre
+        processos, ou desabilita o compartilhamento com `None`.
+        """
+        cls.STORE = store
+
+    @classmethod
+    def _attach_stored(cls, key: str) -> bool:
+        """
+        Anexa ao cache uma tabela publicada no repositório compartilhado,
+        caso ainda não esteja em cache. Retorna se a tabela deve ser
+        publicada após a sua construção.
+        """
+        if cls.STORE is None or key not in cls.STORED_TABLES:
+            return False
+        if key in cls.DECK_DATA_CACHING:
+            return False
+        df = cls.STORE.attach(key)
+        if df is None:
+            return True
+        cls.DECK_DATA_CACHING[key] = df
+        return False
+
+    @classmethod
+    def _publish_stored(cls, key: str):
+        df = cls.DECK_DATA_CACHING.get(key)
+        if cls.STORE is not None and isinstance(df, pd.DataFrame):
+            cls.STORE.publish(key, df)
+
+    @classmethod
+    def clear_cache(cls):
+        """
+        Limpa o cache de dados do deck.
+        """
+        cls.DECK_DATA_CACHING.clear()
+        cls.REQUIRED_COLUMNS.clear()
+
+    @classmethod
+    def require_columns(cls, table: str, columns: Iterable[str]):
+        """
+        Registra colunas de uma tabela necessárias às sínteses, de modo
+        que as demais colunas não sejam convertidas nem mantidas em cache.
+        """
+        with cls._table_lock(table):
+            cls.REQUIRED_COLUMNS.setdefault(table, set()).update(columns)
+
+    @classmethod
+    def clear_required_columns(cls):
+        """
+        Descarta as colunas registradas e as tabelas projetadas,
+        voltando a construir as tabelas com todas as colunas.
+        """
+        for table in list(cls.REQUIRED_COLUMNS):
+            with cls._table_lock(table):
+                cls.DECK_DATA_CACHING.pop(table, None)
+                cls.REQUIRED_COLUMNS.pop(table, None)
+
+    @classmethod
+    def _source_columns(cls, table: str) -> Optional[Set[str]]:
+        """
+        Obtém as colunas de uma tabela necessárias às sínteses, incluindo
+        as colunas das quais dependem as colunas derivadas, ou `None`
+        caso não existam colunas registradas para a tabela.
+        """
+        with cls._table_lock(table):
+            required = cls.REQUIRED_COLUMNS.get(table)
+        # As tabelas compartilhadas são construídas completas, atendendo
+        # às sínteses de quaisquer processos
+        if required is None:
+            return None
+        if cls.STORE is not None and table in cls.STORED_TABLES:
+            return None
+        return source_columns(cls.DERIVED_COLUMNS.get(table, {}), required)
+
+    @classmethod
+    def _project(
+        cls, table: str, df: pd.DataFrame, columns: Optional[Set[str]]
+    ) -> pd.DataFrame:
+        if columns is None:
+            return df
+        keys = cls.KEY_COLUMNS.get(table, [])
+        return df[[c for c in df.columns if c in keys or c in columns]]
+
+    @classmethod
+    def _with_columns(
+        cls,
+        table: str,
+        builder: Callable[[AbstractUnitOfWork], pd.DataFrame],
+        uow: AbstractUnitOfWork,
+        columns: List[str],
+    ) -> pd.DataFrame:
+        """
+        Obtém uma tabela garantindo que contenha as colunas fornecidas,
+        reconstruindo-a caso tenha sido projetada sem as colunas das
+        quais dependem. As colunas derivadas são calculadas apenas
+        quando solicitadas, e mantidas na tabela em cache.
+        """
+        derived = cls.DERIVED_COLUMNS.get(table, {})
+        sources = [
+            c for c in source_columns(derived, columns) if c not in derived
+        ]
+        with cls._table_lock(table):
+            df = builder(uow)
+            if not all(c in df.columns for c in sources):
+                cls.require_columns(table, columns)
+                cls.DECK_DATA_CACHING.pop(table, None)
+                df = builder(uow)
+            cached = cls.DECK_DATA_CACHING[table]
+            derived_columns = derive_columns(
+                table, cached, derived, columns, uow
+            )
+            for column in derived_columns:
+                df[column] = cached[column].to_numpy()
+        return df
+
+    @classmethod
+    def set_scenario(cls, scenario: int):
+        """
+        Define o cenário das saídas do DESSEM em processamento,
+        descartando do cache as tabelas obtidas dos arquivos do
+        cenário anterior.
+        """
+        for key in list(cls.DECK_DATA_CACHING.keys()):
+            if key not in cls.SHARED_DATA_KEYS:
+                cls.DECK_DATA_CACHING.pop(key)
+        cls.SCENARIO = scenario
+
     @classmethod
     def _get_entdados(self, uow: AbstractUnitOfWork) -> Entdados | None:
         with uow:
             pdo = uow.files.get_entdados()
             return pdo
 
+    @classmethod
+    def _get_entdados_registers(
+        self, uow: AbstractUnitOfWork, registers: List[str]
+    ) -> Entdados | None:
+        with uow:
+            pdo = uow.files.get_entdados_registers(registers)
+            return pdo
+
     @classmethod
     def _get_dessemarq(self, uow: AbstractUnitOfWork) -> DessemArq | None:
         with uow:
@@ -130,6 +513,15 @@ class Deck:
             pdo = uow.files.get_pdo_oper_term()
             return pdo
 
+    @classmethod
+    def _iterate_unit_table(
+        cls, uow: AbstractUnitOfWork, reader: str
+    ) -> Iterator[pd.DataFrame]:
+        with uow:
+            yield from uow.files.iterate_table(
+                reader, cls.UNIT_CHUNK_ROWS, "estagio"
+            )
+
     @classmethod
     def _get_pdo_oper_tviag_calha(
         self, uow: AbstractUnitOfWork
@@ -159,6 +551,7 @@ class Deck:
         return data
 
     @classmethod
+    @_traced_table("entdados")
     def entdados(cls, uow: AbstractUnitOfWork) -> Entdados:
         entdados = cls.DECK_DATA_CACHING.get("entdados")
         if entdados is None:
@@ -171,6 +564,36 @@ class Deck:
         return entdados
 
     @classmethod
+    @traced("deck", tabela="entdados", registro=_register)
+    def entdados_register(
+        cls, register: str, uow: AbstractUnitOfWork
+    ) -> pd.DataFrame:
+        """
+        Obtém a tabela de um registro do ENTDADOS (ex. `TM`), lendo
+        apenas as linhas do registro, exceto quando o arquivo já foi
+        lido por completo.
+        """
+        key = f"entdados_{register.lower()}"
+        with cls._table_lock(key):
+            df = cls.DECK_DATA_CACHING.get(key)
+            if df is None:
+                entdados = cls.DECK_DATA_CACHING.get("entdados")
+                if entdados is None:
+                    entdados = cls._validate_data(
+                        cls._get_entdados_registers(uow, [register]),
+                        Entdados,
+                        "entdados",
+                    )
+                df = cls._validate_data(
+                    getattr(entdados, register.lower())(df=True),
+                    pd.DataFrame,
+                    register,
+                )
+                cls.DECK_DATA_CACHING[key] = df
+            return df.copy()
+
+    @classmethod
+    @_traced_table("dadvaz")
     def dadvaz(cls, uow: AbstractUnitOfWork) -> Dadvaz:
         dadvaz = cls.DECK_DATA_CACHING.get("dadvaz")
         if dadvaz is None:
@@ -183,6 +606,7 @@ class Deck:
         return dadvaz
 
     @classmethod
+    @_traced_table("log_matriz")
     def log_matriz(cls, uow: AbstractUnitOfWork) -> LogMatriz:
         log_matriz = cls.DECK_DATA_CACHING.get("log_matriz")
         if log_matriz is None:
@@ -195,6 +619,7 @@ class Deck:
         return log_matriz
 
     @classmethod
+    @_traced_table("runtime")
     def runtimes(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("runtime")
         if df is None:
@@ -224,6 +649,7 @@ class Deck:
         return df
 
     @classmethod
+    @_traced_table("des_log_relato")
     def des_log_relato(cls, uow: AbstractUnitOfWork) -> DesLogRelato:
         des_log_relato = cls.DECK_DATA_CACHING.get("des_log_relato")
         if des_log_relato is None:
@@ -236,6 +662,7 @@ class Deck:
         return des_log_relato
 
     @classmethod
+    @_traced_table("costs")
     def costs(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("costs")
         if df is None:
@@ -266,9 +693,65 @@ class Deck:
 
     @classmethod
     def _add_single_scenario(cls, df: pd.DataFrame) -> pd.DataFrame:
-        df[SCENARIO_COL] = 1
+        df[SCENARIO_COL] = cls.SCENARIO
         return df
 
+    @classmethod
+    def entities(cls) -> EntityRegistry:
+        """
+        Obtém o registro dos mapeamentos entre as entidades do caso,
+        compartilhado por todas as tabelas do Deck.
+        """
+        with cls._table_lock("entities"):
+            registry = cls.DECK_DATA_CACHING.get("entities")
+            if registry is None:
+                registry = EntityRegistry(
+                    {
+                        name: getattr(cls, method)
+                        for name, method in cls.ENTITY_MAPS.items()
+                    }
+                )
+                cls.DECK_DATA_CACHING["entities"] = registry
+            return registry
+
+    @classmethod
+    def _code_map(
+        cls, df: pd.DataFrame, key_col: str, code_col: str
+    ) -> CodeMap:
+        return CodeMap(df[key_col], df[code_col])
+
+    @classmethod
+    def _submarket_code_map(cls, uow: AbstractUnitOfWork) -> CodeMap:
+        return cls._code_map(
+            cls.submarkets(uow), SUBMARKET_NAME_COL, SUBMARKET_CODE_COL
+        )
+
+    @classmethod
+    def _hydro_eer_code_map(cls, uow: AbstractUnitOfWork) -> CodeMap:
+        return cls._code_map(
+            cls.hydro_eer_map(uow), HYDRO_CODE_COL, EER_CODE_COL
+        )
+
+    @classmethod
+    def _eer_submarket_code_map(cls, uow: AbstractUnitOfWork) -> CodeMap:
+        return cls._code_map(
+            cls.eer_submarket_map(uow), EER_CODE_COL, SUBMARKET_CODE_COL
+        )
+
+    @classmethod
+    def _hydro_submarket_code_map(cls, uow: AbstractUnitOfWork) -> CodeMap:
+        return (
+            cls.entities()
+            .map("hydro_eer", uow)
+            .compose(cls.entities().map("eer_submarket", uow))
+        )
+
+    @classmethod
+    def _thermal_submarket_code_map(cls, uow: AbstractUnitOfWork) -> CodeMap:
+        return cls._code_map(
+            cls.thermals(uow), THERMAL_CODE_COL, SUBMARKET_CODE_COL
+        )
+
     @classmethod
     def _add_submarket_code(
         cls,
@@ -277,18 +760,13 @@ class Deck:
         submarket_name_col: str,
         submarket_code_col_new: str = SUBMARKET_CODE_COL,
     ) -> pd.DataFrame:
-        submarket_map_df = cls.submarkets(uow)
-        submarket_map = {
-            name: code
-            for name, code in zip(
-                submarket_map_df[SUBMARKET_NAME_COL],
-                submarket_map_df[SUBMARKET_CODE_COL],
-            )
-        }
-        df[submarket_code_col_new] = df[submarket_name_col].map(submarket_map)
+        df[submarket_code_col_new] = cls.entities().lookup(
+            "submarket", df[submarket_name_col], uow
+        )
         return df
 
     @classmethod
+    @_traced_table("pdo_sist")
     def pdo_sist(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("pdo_sist")
         if df is None:
@@ -302,6 +780,8 @@ class Deck:
                 pd.DataFrame,
                 "pdo_sist",
             )
+            columns = cls._source_columns("pdo_sist")
+            df = cls._project("pdo_sist", df, columns)
             df = cls._add_single_scenario(df)
             df = df.rename(columns={"estagio": STAGE_COL})
             block_map = cls.block_map(uow)
@@ -313,67 +793,13 @@ class Deck:
             df[BLOCK_DURATION_COL] = (
                 df[END_DATE_COL] - df[START_DATE_COL]
             ) / pd.Timedelta(hours=1)
-            df["demanda_liquida"] = (
-                df["demanda"]
-                - df["geracao_pequenas_usinas"]
-                - df["geracao_fixa_barra"]
-                - df["geracao_renovavel"]
-            )
             df.sort_values([SUBMARKET_CODE_COL, STAGE_COL], inplace=True)
             cls.DECK_DATA_CACHING["pdo_sist"] = df
         return df.copy()
 
     @classmethod
+    @_traced_table("pdo_hidr")
     def pdo_hidr(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
-        def _get_initial_volume(df: pd.DataFrame) -> pd.DataFrame:
-            df_vol_ini = cls.hydro_initial_volumes(uow)
-            perc_initial_volumes = df_vol_ini["volume_inicial"].to_numpy()
-            total_uhes = len(df_vol_ini)
-
-            # Volumes percentuais
-            perc_volumes = np.concatenate((
-                perc_initial_volumes,
-                df["volume_final_percentual"].to_numpy()[:-total_uhes],
-            ))
-            df["volume_inicial_percentual"] = perc_volumes
-
-            # Volumes absolutos totais
-            min_volumes = df["volume_armazenado_minimo_hm3"].to_numpy()[
-                :total_uhes
-            ]
-            max_volumes = df["volume_armazenado_maximo_hm3"].to_numpy()[
-                :total_uhes
-            ]
-            abs_initial_volumes = min_volumes + 0.01 * perc_initial_volumes * (
-                max_volumes - min_volumes
-            )
-            abs_volumes = np.concatenate((
-                abs_initial_volumes,
-                df["volume_final_absoluto_hm3"].to_numpy()[:-total_uhes],
-            ))
-            df["volume_inicial_absoluto_hm3"] = abs_volumes
-
-            return df
-
-        def _cast_volumes_to_absolute(df: pd.DataFrame) -> pd.DataFrame:
-            col_min_vol = "volume_armazenado_minimo_hm3"
-            col_max_vol = "volume_armazenado_maximo_hm3"
-            df_eco = cls.pdo_eco_usih(uow)[
-                [HYDRO_CODE_COL, col_min_vol, col_max_vol]
-            ]
-
-            num_stages = len(cls.stages_durations(uow))
-            df[col_min_vol] = np.tile(
-                df_eco[col_min_vol].to_numpy(), num_stages
-            )
-            df[col_max_vol] = np.tile(
-                df_eco[col_max_vol].to_numpy(), num_stages
-            )
-            df["volume_final_absoluto_hm3"] = (
-                df["volume_final_hm3"] + df[col_min_vol]
-            )
-            return df
-
         df = cls.DECK_DATA_CACHING.get("pdo_hidr")
         if df is None:
             pdo_hidr = cls._validate_data(
@@ -386,11 +812,10 @@ class Deck:
                 pd.DataFrame,
                 "pdo_hidr",
             )
+            columns = cls._source_columns("pdo_hidr")
+            df = cls._project("pdo_hidr", df, columns)
             df = df.loc[df["conjunto"] == 99].reset_index(drop=True)
             df = df.drop(columns=["nome_usina", "conjunto", "unidade"])
-            df = _cast_volumes_to_absolute(df)
-            df = _get_initial_volume(df)
-
             df = cls._add_single_scenario(df)
             df = df.rename(
                 columns={
@@ -399,29 +824,12 @@ class Deck:
                     "nome_submercado": SUBMARKET_CODE_COL,
                 }
             )
-            submarket_map_df = cls.eer_submarket_map(uow)
-            submarket_map_df = submarket_map_df.drop_duplicates(
-                subset=[SUBMARKET_CODE_COL]
-            )
-            submarket_map = {
-                name: code
-                for name, code in zip(
-                    submarket_map_df[SUBMARKET_NAME_COL],
-                    submarket_map_df[SUBMARKET_CODE_COL],
-                )
-            }
-            eer_map_df = cls.hydro_eer_map(uow)
-            eer_map = {
-                hydro_code: eer_code
-                for hydro_code, eer_code in zip(
-                    eer_map_df[HYDRO_CODE_COL],
-                    eer_map_df[EER_CODE_COL],
-                )
-            }
             block_map = cls.block_map(uow)
             df[BLOCK_COL] = df[BLOCK_COL].map(block_map)
-            df[SUBMARKET_CODE_COL] = df[SUBMARKET_CODE_COL].map(submarket_map)
-            df[EER_CODE_COL] = df[HYDRO_CODE_COL].map(eer_map)
+            df = cls._add_submarket_code(uow, df, SUBMARKET_CODE_COL)
+            df[EER_CODE_COL] = cls.entities().lookup(
+                "hydro_eer", df[HYDRO_CODE_COL], uow
+            )
             # Acrescenta datas iniciais e finais
             # Faz uma atribuicao nao posicional.
             # A maneira mais pythonica é lenta.
@@ -436,21 +844,57 @@ class Deck:
             df[BLOCK_DURATION_COL] = (
                 df[END_DATE_COL] - df[START_DATE_COL]
             ) / pd.Timedelta(hours=1)
-            # Acrescenta novas variáveis a partir de operação de colunas
-            # já existentes
-            df["vazao_defluente_m3s"] = (
-                df["vazao_turbinada_m3s"] + df["vazao_vertida_m3s"]
-            )
-            df["vazao_afluente_m3s"] = (
-                df["vazao_incremental_m3s"]
-                + df["vazao_montante_m3s"]
-                + df["vazao_montante_tempo_viagem_m3s"]
-            )
+            # As colunas derivadas dos estágios anteriores dependem
+            # da ordenação por usina e estágio
             df.sort_values([HYDRO_CODE_COL, STAGE_COL], inplace=True)
             cls.DECK_DATA_CACHING["pdo_hidr"] = df.reset_index(drop=True)
         return df.copy()
 
     @classmethod
+    def _hydro_storage_limit(
+        cls, df: pd.DataFrame, uow: AbstractUnitOfWork, col: str
+    ) -> np.ndarray:
+        """
+        Obtém, para cada linha de uma tabela por usina hidrelétrica,
+        um limite de armazenamento do PDO_ECO_USIH.
+        """
+        df_eco = cls.pdo_eco_usih(uow)
+        limits = dict(zip(df_eco[HYDRO_CODE_COL], df_eco[col]))
+        return df[HYDRO_CODE_COL].map(limits).to_numpy()
+
+    @classmethod
+    def _hydro_initial_volume(
+        cls, df: pd.DataFrame, uow: AbstractUnitOfWork
+    ) -> np.ndarray:
+        """
+        Obtém, para cada linha de uma tabela por usina hidrelétrica,
+        o volume inicial percentual da usina informado no ENTDADOS.
+        """
+        df_vol_ini = cls.hydro_initial_volumes(uow)
+        volumes = dict(
+            zip(df_vol_ini[HYDRO_CODE_COL], df_vol_ini["volume_inicial"])
+        )
+        return df[HYDRO_CODE_COL].map(volumes).to_numpy()
+
+    @classmethod
+    def _previous_stage(
+        cls, df: pd.DataFrame, col: str, initial: np.ndarray
+    ) -> np.ndarray:
+        """
+        Obtém os valores de uma coluna no estágio anterior, em uma tabela
+        ordenada por usina e estágio, com os valores `initial` no
+        primeiro estágio de cada usina.
+        """
+        hydros = df[HYDRO_CODE_COL].to_numpy()
+        values = df[col].to_numpy()
+        first = np.ones(len(df), dtype=bool)
+        first[1:] = hydros[1:] != hydros[:-1]
+        previous = np.empty_like(values)
+        previous[1:] = values[:-1]
+        return np.where(first, initial, previous)
+
+    @classmethod
+    @_traced_table("pdo_eolica")
     def pdo_eolica(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("pdo_eolica")
         if df is None:
@@ -473,9 +917,14 @@ class Deck:
                     "nome_submercado": SUBMARKET_CODE_COL,
                 }
             )
-            df = df.groupby(
-                [STAGE_COL, SCENARIO_COL, SUBMARKET_CODE_COL], as_index=False
-            ).sum(numeric_only=True)
+            grouping_columns = [STAGE_COL, SCENARIO_COL, SUBMARKET_CODE_COL]
+            df = fast_group_df(
+                df,
+                grouping_columns,
+                numeric_columns(df, grouping_columns),
+                "sum",
+                sort=True,
+            )
             block_map = cls.stage_block_map(uow)
             df[BLOCK_COL] = df[STAGE_COL].map(block_map)
             df = cls._add_submarket_code(uow, df, SUBMARKET_CODE_COL)
@@ -493,13 +942,11 @@ class Deck:
             df[BLOCK_DURATION_COL] = (
                 df[END_DATE_COL] - df[START_DATE_COL]
             ) / pd.Timedelta(hours=1)
-            # Acrescenta novas variáveis a partir de operação de colunas
-            # já existentes
-            df["corte_geracao"] = df["geracao_pre_definida"] - df["geracao"]
             cls.DECK_DATA_CACHING["pdo_eolica"] = df
         return df.copy()
 
     @classmethod
+    @_traced_table("pdo_inter")
     def pdo_inter(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("pdo_inter")
         if df is None:
@@ -546,6 +993,7 @@ class Deck:
         return df.copy()
 
     @classmethod
+    @_traced_table("pdo_oper_tviag_calha")
     def pdo_oper_tviag_calha(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("pdo_oper_tviag_calha")
         if df is None:
@@ -578,26 +1026,15 @@ class Deck:
                     "codigo_elemento_jusante": HYDRO_CODE_COL,
                 }
             )
-            eer_map_df = cls.hydro_eer_map(uow)
-            eer_map = {
-                hydro_code: eer_code
-                for hydro_code, eer_code in zip(
-                    eer_map_df[HYDRO_CODE_COL],
-                    eer_map_df[EER_CODE_COL],
-                )
-            }
-            submarket_map_df = cls.eer_submarket_map(uow)
-            submarket_map = {
-                eer_code: submarket_code
-                for eer_code, submarket_code in zip(
-                    submarket_map_df[EER_CODE_COL],
-                    submarket_map_df[SUBMARKET_CODE_COL],
-                )
-            }
             block_map = cls.stage_block_map(uow)
             df[BLOCK_COL] = df[STAGE_COL].map(block_map)
-            df[EER_CODE_COL] = df[HYDRO_CODE_COL].map(eer_map)
-            df[SUBMARKET_CODE_COL] = df[EER_CODE_COL].map(submarket_map)
+            entities = cls.entities()
+            df[EER_CODE_COL] = entities.lookup(
+                "hydro_eer", df[HYDRO_CODE_COL], uow
+            )
+            df[SUBMARKET_CODE_COL] = entities.lookup(
+                "hydro_submarket", df[HYDRO_CODE_COL], uow
+            )
             # Acrescenta datas iniciais e finais
             # Faz uma atribuicao nao posicional.
             # A maneira mais pythonica é lenta.
@@ -613,6 +1050,7 @@ class Deck:
         return df.copy()
 
     @classmethod
+    @_traced_table("pdo_oper_uct")
     def pdo_oper_uct(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("pdo_oper_uct")
         if df is None:
@@ -637,52 +1075,187 @@ class Deck:
         return df.copy()
 
     @classmethod
+    def _thermal_operation_partial(cls, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.drop(columns=["nome_usina", "codigo_unidade", "barra"])
+        df = cls._add_single_scenario(df)
+        df = df.rename(
+            columns={
+                "estagio": STAGE_COL,
+                "nome_submercado": SUBMARKET_CODE_COL,
+            }
+        )
+        grouping_columns = [
+            STAGE_COL,
+            SCENARIO_COL,
+            THERMAL_CODE_COL,
+            SUBMARKET_CODE_COL,
+        ]
+        return fast_group_df(
+            df,
+            grouping_columns,
+            numeric_columns(df, grouping_columns),
+            "sum",
+            sort=True,
+        )
+
+    @classmethod
+    def _thermal_costs_partial(cls, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.rename(
+            columns={
+                "estagio": STAGE_COL,
+                "codigo_usina": THERMAL_CODE_COL,
+            }
+        )
+        return fast_group_df(
+            df,
+            [STAGE_COL, THERMAL_CODE_COL],
+            ["custo_linear"],
+            "min",
+            sort=True,
+        )
+
+    @classmethod
+    def _thermal_aggregates(
+        cls, uow: AbstractUnitOfWork
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Agrega por usina, em uma única leitura em fluxo do
+        PDO_OPER_TERM, os dados das tabelas da operação
+        (`pdo_oper_term`), do cadastro (`thermals`) e dos custos
+        (`thermal_costs`) das térmicas. Cada bloco de linhas por
+        unidade geradora é agregado e descartado, de modo que a
+        memória utilizada é proporcional ao número de usinas e
+        estágios, e não de unidades.
+
+        Os blocos contêm estágios completos, logo as agregações de
+        cada bloco já são as finais, e a reagregação dos blocos na
+        construção de cada tabela apenas os reúne.
+        """
+        with cls._table_lock("thermal_aggregates"):
+            aggregates = cls.DECK_DATA_CACHING.get("thermal_aggregates")
+            if aggregates is None:
+                operation: List[pd.DataFrame] = []
+                registry: List[pd.DataFrame] = []
+                costs: List[pd.DataFrame] = []
+                for chunk in cls._iterate_unit_table(uow, "get_pdo_oper_term"):
+                    operation.append(cls._thermal_operation_partial(chunk))
+                    registry.append(
+                        chunk[
+                            ["codigo_usina", "nome_usina", "nome_submercado"]
+                        ].drop_duplicates()
+                    )
+                    costs.append(cls._thermal_costs_partial(chunk))
+                aggregates = {
+                    "pdo_oper_term": pd.concat(operation, ignore_index=True),
+                    "thermals": pd.concat(registry, ignore_index=True),
+                    "thermal_costs": pd.concat(costs, ignore_index=True),
+                }
+                cls.DECK_DATA_CACHING["thermal_aggregates"] = aggregates
+            return aggregates
+
+    @classmethod
+    def _thermal_operation(
+        cls, uow: AbstractUnitOfWork, df: pd.DataFrame
+    ) -> pd.DataFrame:
+        grouping_columns = [
+            STAGE_COL,
+            SCENARIO_COL,
+            THERMAL_CODE_COL,
+            SUBMARKET_CODE_COL,
+        ]
+        df = fast_group_df(
+            df,
+            grouping_columns,
+            numeric_columns(df, grouping_columns),
+            "sum",
+            sort=True,
+        )
+        block_map = cls.stage_block_map(uow)
+        df[BLOCK_COL] = df[STAGE_COL].map(block_map)
+        df = cls._add_submarket_code(uow, df, SUBMARKET_CODE_COL)
+        # Acrescenta datas iniciais e finais
+        # Faz uma atribuicao nao posicional.
+        # A maneira mais pythonica é lenta.
+        num_entities = len(df.loc[df[STAGE_COL] == 1])
+        stage_df = cls.stages_durations(uow)[[START_DATE_COL, END_DATE_COL]]
+        df[START_DATE_COL] = np.repeat(
+            stage_df[START_DATE_COL].tolist(), num_entities
+        )
+        df[END_DATE_COL] = np.repeat(
+            stage_df[END_DATE_COL].tolist(), num_entities
+        )
+        df[BLOCK_DURATION_COL] = (
+            df[END_DATE_COL] - df[START_DATE_COL]
+        ) / pd.Timedelta(hours=1)
+        return df
+
+    @classmethod
+    def _thermal_registry(
+        cls, uow: AbstractUnitOfWork, df: pd.DataFrame
+    ) -> pd.DataFrame:
+        df = df.drop_duplicates().rename(
+            columns={
+                "codigo_usina": THERMAL_CODE_COL,
+                "nome_usina": THERMAL_NAME_COL,
+                "nome_submercado": SUBMARKET_NAME_COL,
+            }
+        )
+        df = cls._add_submarket_code(
+            uow, df, SUBMARKET_NAME_COL, SUBMARKET_CODE_COL
+        )
+        return (
+            df[
+                [
+                    THERMAL_CODE_COL,
+                    THERMAL_NAME_COL,
+                    SUBMARKET_CODE_COL,
+                    SUBMARKET_NAME_COL,
+                ]
+            ]
+            .drop_duplicates()
+            .reset_index(drop=True)
+        )
+
+    @classmethod
+    def _thermal_costs(
+        cls, uow: AbstractUnitOfWork, df: pd.DataFrame
+    ) -> pd.DataFrame:
+        df = fast_group_df(
+            df,
+            [STAGE_COL, THERMAL_CODE_COL],
+            ["custo_linear"],
+            "min",
+            sort=True,
+        )
+        stage_df = cls.stages_durations(uow)[[START_DATE_COL]]
+        num_entities = len(df.loc[df[STAGE_COL] == 1])
+        df[START_DATE_COL] = np.repeat(
+            stage_df[START_DATE_COL].tolist(), num_entities
+        )
+        df = df.rename(
+            columns={
+                "custo_linear": VALUE_COL,
+            }
+        )
+        return (
+            df[[THERMAL_CODE_COL, START_DATE_COL, VALUE_COL]]
+            .drop_duplicates()
+            .reset_index(drop=True)
+        )
+
+    @classmethod
+    @_traced_table("pdo_oper_term")
     def pdo_oper_term(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("pdo_oper_term")
         if df is None:
-            pdo_oper_term = cls._validate_data(
-                cls._get_pdo_oper_term(uow),
-                PdoOperTerm,
-                "pdo_oper_term",
-            )
-            df = cls._validate_data(
-                pdo_oper_term.tabela,
-                pd.DataFrame,
-                "pdo_oper_term",
-            )
-            df = df.drop(columns=["nome_usina", "codigo_unidade", "barra"])
-            df = cls._add_single_scenario(df)
-            df = df.rename(
-                columns={
-                    "estagio": STAGE_COL,
-                    "nome_submercado": SUBMARKET_CODE_COL,
-                }
+            df = cls._thermal_operation(
+                uow, cls._thermal_aggregates(uow)["pdo_oper_term"]
             )
-            df = df.groupby(
-                [STAGE_COL, SCENARIO_COL, THERMAL_CODE_COL, SUBMARKET_CODE_COL],
-                as_index=False,
-            ).sum(numeric_only=True)
-            block_map = cls.stage_block_map(uow)
-            df[BLOCK_COL] = df[STAGE_COL].map(block_map)
-            df = cls._add_submarket_code(uow, df, SUBMARKET_CODE_COL)
-            # Acrescenta datas iniciais e finais
-            # Faz uma atribuicao nao posicional.
-            # A maneira mais pythonica é lenta.
-            num_entities = len(df.loc[df[STAGE_COL] == 1])
-            stage_df = cls.stages_durations(uow)[[START_DATE_COL, END_DATE_COL]]
-            df[START_DATE_COL] = np.repeat(
-                stage_df[START_DATE_COL].tolist(), num_entities
-            )
-            df[END_DATE_COL] = np.repeat(
-                stage_df[END_DATE_COL].tolist(), num_entities
-            )
-            df[BLOCK_DURATION_COL] = (
-                df[END_DATE_COL] - df[START_DATE_COL]
-            ) / pd.Timedelta(hours=1)
             cls.DECK_DATA_CACHING["pdo_oper_term"] = df
         return df.copy()
 
     @classmethod
+    @_traced_table("pdo_operacao")
     def pdo_operacao(cls, uow: AbstractUnitOfWork) -> PdoOperacao:
         pdo_operacao = cls.DECK_DATA_CACHING.get("pdo_operacao")
         if pdo_operacao is None:
@@ -695,6 +1268,7 @@ class Deck:
         return pdo_operacao
 
     @classmethod
+    @_traced_table("pdo_eco_usih")
     def pdo_eco_usih(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         pdo_eco_usih = cls.DECK_DATA_CACHING.get("pdo_eco_usih")
         if pdo_eco_usih is None:
@@ -715,6 +1289,7 @@ class Deck:
         return cls.DECK_DATA_CACHING["pdo_eco_usih"]
 
     @classmethod
+    @_traced_table("stages_durations")
     def stages_durations(cls, uow) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("stages_durations")
         if df is None:
@@ -750,6 +1325,7 @@ class Deck:
         )
 
     @classmethod
+    @_traced_table("version")
     def version(cls, uow: AbstractUnitOfWork) -> str:
         name = "version"
         version = cls.DECK_DATA_CACHING.get(name)
@@ -768,6 +1344,7 @@ class Deck:
         return version
 
     @classmethod
+    @_traced_table("title")
     def title(cls, uow: AbstractUnitOfWork) -> str:
         name = "title"
         title = cls.DECK_DATA_CACHING.get(name)
@@ -787,6 +1364,7 @@ class Deck:
         return title
 
     @classmethod
+    @_traced_table("hydro_inflows")
     def hydro_inflows(cls, uow) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("hydro_inflows")
         if df is None:
@@ -806,15 +1384,11 @@ class Deck:
         return df.copy()
 
     @classmethod
+    @_traced_table("block_map")
     def block_map(cls, uow: AbstractUnitOfWork) -> dict:
         map_dict = cls.DECK_DATA_CACHING.get("block_map")
         if map_dict is None:
-            entdados = cls.entdados(uow)
-            tm_df = cls._validate_data(
-                entdados.tm(df=True),
-                pd.DataFrame,
-                "TM",
-            )
+            tm_df = cls.entdados_register("TM", uow)
             blocks: list = tm_df["nome_patamar"].unique().tolist()
             blocks.sort(reverse=True)
             map_dict = {b: i for i, b in enumerate(blocks)}
@@ -822,22 +1396,19 @@ class Deck:
         return map_dict
 
     @classmethod
+    @_traced_table("stage_block_map")
     def stage_block_map(cls, uow: AbstractUnitOfWork) -> dict:
         map_dict = cls.DECK_DATA_CACHING.get("stage_block_map")
         if map_dict is None:
             block_map = cls.block_map(uow)
-            entdados = cls.entdados(uow)
-            tm_df = cls._validate_data(
-                entdados.tm(df=True),
-                pd.DataFrame,
-                "TM",
-            )
+            tm_df = cls.entdados_register("TM", uow)
             blocks: list = tm_df["nome_patamar"]
             map_dict = {i + 1: block_map[b] for i, b in enumerate(blocks)}
             cls.DECK_DATA_CACHING["stage_block_map"] = map_dict
         return map_dict
 
     @classmethod
+    @_traced_table("blocks_durations")
     def blocks_durations(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("blocks_durations")
         if df is None:
@@ -848,27 +1419,21 @@ class Deck:
         return df
 
     @classmethod
+    @_traced_table("eer_submarket_map")
     def eer_submarket_map(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("eer_submarket_map")
         if df is None:
-            entdados = cls.entdados(uow)
-            sist_df = cls._validate_data(
-                entdados.sist(df=True),
-                pd.DataFrame,
-                "SIST",
-            )
+            sist_df = cls.entdados_register("SIST", uow)
             sist_df = sist_df.rename(
                 columns={
                     "codigo_submercado": SUBMARKET_CODE_COL,
                     "mnemonico_submercado": SUBMARKET_NAME_COL,
                 }
             )
-            sist_df = sist_df.set_index(SUBMARKET_CODE_COL, drop=True)
-            df = cls._validate_data(
-                entdados.ree(df=True),
-                pd.DataFrame,
-                "REE",
-            )
+            sist_df = sist_df.set_index(SUBMARKET_CODE_COL, drop=True)[
+                SUBMARKET_NAME_COL
+            ]
+            df = cls.entdados_register("REE", uow)
             df = df.rename(
                 columns={
                     "codigo_ree": EER_CODE_COL,
@@ -876,22 +1441,18 @@ class Deck:
                     "codigo_submercado": SUBMARKET_CODE_COL,
                 }
             )
-            df[SUBMARKET_NAME_COL] = df[SUBMARKET_CODE_COL].apply(
-                lambda x: sist_df.at[x, SUBMARKET_NAME_COL]
-            )
+            df[SUBMARKET_NAME_COL] = sist_df.reindex(
+                df[SUBMARKET_CODE_COL]
+            ).to_numpy()
             cls.DECK_DATA_CACHING["eer_submarket_map"] = df
         return df.copy()
 
     @classmethod
+    @_traced_table("hydro_eer_map")
     def hydro_eer_map(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("hydro_eer_map")
         if df is None:
-            entdados = cls.entdados(uow)
-            df = cls._validate_data(
-                entdados.uh(df=True),
-                pd.DataFrame,
-                "UH",
-            )
+            df = cls.entdados_register("UH", uow)
             df = df.rename(
                 columns={
                     "codigo_usina": HYDRO_CODE_COL,
@@ -903,6 +1464,7 @@ class Deck:
         return df.copy()
 
     @classmethod
+    @_traced_table("hydro_eer_submarket_map")
     def hydro_eer_submarket_map(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("hydro_eer_submarket_map")
         if df is None:
@@ -919,15 +1481,11 @@ class Deck:
         return df.copy()
 
     @classmethod
+    @_traced_table("hydro_initial_volumes")
     def hydro_initial_volumes(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("hydro_initial_volumes")
         if df is None:
-            entdados = cls.entdados(uow)
-            df = cls._validate_data(
-                entdados.uh(df=True),
-                pd.DataFrame,
-                "UH",
-            )
+            df = cls.entdados_register("UH", uow)
             df = df.rename(
                 columns={
                     "codigo_usina": HYDRO_CODE_COL,
@@ -952,54 +1510,22 @@ class Deck:
         return df.copy()
 
     @classmethod
+    @_traced_table("thermals")
     def thermals(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("thermals")
         if df is None:
-            pdo_oper_term = cls._validate_data(
-                cls._get_pdo_oper_term(uow),
-                PdoOperTerm,
-                "pdo_oper_term",
-            )
-            df = cls._validate_data(
-                pdo_oper_term.tabela,
-                pd.DataFrame,
-                "pdo_oper_term",
-            )
-            df = df.rename(
-                columns={
-                    "codigo_usina": THERMAL_CODE_COL,
-                    "nome_usina": THERMAL_NAME_COL,
-                    "nome_submercado": SUBMARKET_NAME_COL,
-                }
-            )
-            df = cls._add_submarket_code(
-                uow, df, SUBMARKET_NAME_COL, SUBMARKET_CODE_COL
-            )
-            df = (
-                df[
-                    [
-                        THERMAL_CODE_COL,
-                        THERMAL_NAME_COL,
-                        SUBMARKET_CODE_COL,
-                        SUBMARKET_NAME_COL,
-                    ]
-                ]
-                .drop_duplicates()
-                .reset_index(drop=True)
+            df = cls._thermal_registry(
+                uow, cls._thermal_aggregates(uow)["thermals"]
             )
             cls.DECK_DATA_CACHING["thermals"] = df
         return df.copy()
 
     @classmethod
+    @_traced_table("submarkets")
     def submarkets(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("submarkets")
         if df is None:
-            entdados = cls.entdados(uow)
-            df = cls._validate_data(
-                entdados.sist(df=True),
-                pd.DataFrame,
-                "SIST",
-            )
+            df = cls.entdados_register("SIST", uow)
             df = df.drop(columns=["ficticio"])
             df = df.rename(
                 columns={
@@ -1017,9 +1543,10 @@ class Deck:
         return df.copy()
 
     @classmethod
+    @traced("deck", tabela="pdo_sist_sbm", coluna=_column)
     def pdo_sist_sbm(cls, col: str, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls._validate_data(
-            cls.pdo_sist(uow),
+            cls._with_columns("pdo_sist", cls.pdo_sist, uow, [col]),
             pd.DataFrame,
             "pdo_sist_sbm",
         )
@@ -1041,6 +1568,7 @@ class Deck:
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_sist_sin", coluna=_column)
     def pdo_sist_sin(cls, col: str, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls._validate_data(
             cls.pdo_sist_sbm(col, uow),
@@ -1060,20 +1588,17 @@ class Deck:
                 END_DATE_COL,
             ]
         ]
-        df = (
-            df.groupby(common_cols, as_index=False)
-            .sum(numeric_only=True)
-            .reset_index(drop=True)
-        )
+        df = fast_group_df(df, common_cols, [VALUE_COL], "sum", sort=True)
         df[BLOCK_DURATION_COL] = (
             df[END_DATE_COL] - df[START_DATE_COL]
         ) / pd.Timedelta(hours=1)
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_hidr_hydro", coluna=_column)
     def pdo_hidr_hydro(cls, col: str, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls._validate_data(
-            cls.pdo_hidr(uow),
+            cls._with_columns("pdo_hidr", cls.pdo_hidr, uow, [col]),
             pd.DataFrame,
             "pdo_hidr_hydro",
         )
@@ -1097,6 +1622,7 @@ class Deck:
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_hidr_eer", coluna=_column)
     def pdo_hidr_eer(cls, col: str, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls._validate_data(
             cls.pdo_hidr_hydro(col, uow),
@@ -1118,17 +1644,14 @@ class Deck:
                 END_DATE_COL,
             ]
         ]
-        df = (
-            df.groupby(common_cols, as_index=False)
-            .sum(numeric_only=True)
-            .reset_index(drop=True)
-        )
+        df = fast_group_df(df, common_cols, [VALUE_COL], "sum", sort=True)
         df[BLOCK_DURATION_COL] = (
             df[END_DATE_COL] - df[START_DATE_COL]
         ) / pd.Timedelta(hours=1)
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_hidr_sbm", coluna=_column)
     def pdo_hidr_sbm(cls, col: str, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls._validate_data(
             cls.pdo_hidr_hydro(col, uow),
@@ -1149,17 +1672,14 @@ class Deck:
                 END_DATE_COL,
             ]
         ]
-        df = (
-            df.groupby(common_cols, as_index=False)
-            .sum(numeric_only=True)
-            .reset_index(drop=True)
-        )
+        df = fast_group_df(df, common_cols, [VALUE_COL], "sum", sort=True)
         df[BLOCK_DURATION_COL] = (
             df[END_DATE_COL] - df[START_DATE_COL]
         ) / pd.Timedelta(hours=1)
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_hidr_sin", coluna=_column)
     def pdo_hidr_sin(cls, col: str, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls._validate_data(
             cls.pdo_hidr_hydro(col, uow),
@@ -1179,17 +1699,14 @@ class Deck:
                 END_DATE_COL,
             ]
         ]
-        df = (
-            df.groupby(common_cols, as_index=False)
-            .sum(numeric_only=True)
-            .reset_index(drop=True)
-        )
+        df = fast_group_df(df, common_cols, [VALUE_COL], "sum", sort=True)
         df[BLOCK_DURATION_COL] = (
             df[END_DATE_COL] - df[START_DATE_COL]
         ) / pd.Timedelta(hours=1)
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_oper_tviag_calha_hydro", coluna=_column)
     def pdo_oper_tviag_calha_hydro(
         cls, col: str, uow: AbstractUnitOfWork
     ) -> pd.DataFrame:
@@ -1218,9 +1735,10 @@ class Deck:
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_eolica_sbm", coluna=_column)
     def pdo_eolica_sbm(cls, col: str, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls._validate_data(
-            cls.pdo_eolica(uow),
+            cls._with_columns("pdo_eolica", cls.pdo_eolica, uow, [col]),
             pd.DataFrame,
             "pdo_eolica_sbm",
         )
@@ -1242,6 +1760,7 @@ class Deck:
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_eolica_sin", coluna=_column)
     def pdo_eolica_sin(cls, col: str, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls._validate_data(
             cls.pdo_eolica_sbm(col, uow),
@@ -1261,17 +1780,14 @@ class Deck:
                 END_DATE_COL,
             ]
         ]
-        df = (
-            df.groupby(common_cols, as_index=False)
-            .sum(numeric_only=True)
-            .reset_index(drop=True)
-        )
+        df = fast_group_df(df, common_cols, [VALUE_COL], "sum", sort=True)
         df[BLOCK_DURATION_COL] = (
             df[END_DATE_COL] - df[START_DATE_COL]
         ) / pd.Timedelta(hours=1)
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_inter_sbp", coluna=_column)
     def pdo_inter_sbp(cls, col: str, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls._validate_data(
             cls.pdo_inter(uow),
@@ -1297,6 +1813,7 @@ class Deck:
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_oper_term_ute", coluna=_column)
     def pdo_oper_term_ute(
         cls, col: str, uow: AbstractUnitOfWork
     ) -> pd.DataFrame:
@@ -1324,6 +1841,7 @@ class Deck:
         return df[common_cols + [VALUE_COL]]
 
     @classmethod
+    @traced("deck", tabela="pdo_operacao_costs", coluna=_column)
     def pdo_operacao_costs(
         cls, col: str, uow: AbstractUnitOfWork
     ) -> pd.DataFrame:
@@ -1361,45 +1879,12 @@ class Deck:
         ].copy()
 
     @classmethod
+    @_traced_table("thermal_costs")
     def thermal_costs(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         df = cls.DECK_DATA_CACHING.get("thermal_costs")
         if df is None:
-            pdo_oper_term = cls._validate_data(
-                cls._get_pdo_oper_term(uow),
-                PdoOperTerm,
-                "pdo_oper_term",
-            )
-            df = cls._validate_data(
-                pdo_oper_term.tabela,
-                pd.DataFrame,
-                "pdo_oper_term",
-            )
-            df = df.rename(
-                columns={
-                    "estagio": STAGE_COL,
-                    "codigo_usina": THERMAL_CODE_COL,
-                }
-            )
-            df = df.groupby(
-                [STAGE_COL, THERMAL_CODE_COL],
-                as_index=False,
-            ).min(numeric_only=True)
-            stage_df = cls.stages_durations(uow)[[START_DATE_COL]]
-            num_entities = len(df.loc[df[STAGE_COL] == 1])
-            df[START_DATE_COL] = np.repeat(
-                stage_df[START_DATE_COL].tolist(), num_entities
-            )
-            df = df.rename(
-                columns={
-                    "custo_linear": VALUE_COL,
-                }
-            )
-
-            # df = cls.pdo_oper_term_ute("custo_linear", uow)
-            df = (
-                df[[THERMAL_CODE_COL, START_DATE_COL, VALUE_COL]]
-                .drop_duplicates()
-                .reset_index(drop=True)
+            df = cls._thermal_costs(
+                uow, cls._thermal_aggregates(uow)["thermal_costs"]
             )
             cls.DECK_DATA_CACHING["thermal_costs"] = df
         return df.copy()
@@ -1445,17 +1930,32 @@ class Deck:
         return grouped_df
 
     @classmethod
+    @_traced_table("thermal_generation_bounds")
     def thermal_generation_bounds(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         name = "thermal_generation_bounds"
         thermal_generation_bounds = cls.DECK_DATA_CACHING.get(name)
         if thermal_generation_bounds is None:
-            df = cls._validate_data(
-                cls.pdo_oper_uct(uow),
-                pd.DataFrame,
-                "pdo_oper_uct",
+            # As unidades geradoras são agregadas por usina em cada
+            # bloco de estágios lido em fluxo do PDO_OPER_UCT
+            grouping_columns = [STAGE_COL, THERMAL_CODE_COL]
+            bounds_columns = [
+                "nome_submercado",
+                "geracao_minima",
+                "geracao_maxima",
+            ]
+            df = pd.concat(
+                [
+                    chunk.groupby(by=grouping_columns, as_index=False)[
+                        bounds_columns
+                    ].max()
+                    for chunk in cls._iterate_unit_table(
+                        uow, "get_pdo_oper_uct"
+                    )
+                ],
+                ignore_index=True,
             )
             df = df.groupby(
-                by=[STAGE_COL, THERMAL_CODE_COL],
+                by=grouping_columns,
                 as_index=False,
             ).max()
             df = df.rename(
@@ -1482,12 +1982,15 @@ class Deck:
         return cls.DECK_DATA_CACHING[name]
 
     @classmethod
+    @_traced_table("hydro_generation_bounds")
     def hydro_generation_bounds(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         name = "hydro_generation_bounds"
         hydro_generation_bounds = cls.DECK_DATA_CACHING.get(name)
         if hydro_generation_bounds is None:
             df = cls._validate_data(
-                cls.pdo_hidr(uow),
+                cls._with_columns(
+                    "pdo_hidr", cls.pdo_hidr, uow, ["geracao_maxima"]
+                ),
                 pd.DataFrame,
                 "pdo_hidr",
             )
@@ -1518,6 +2021,7 @@ class Deck:
         return cls.DECK_DATA_CACHING[name]
 
     @classmethod
+    @_traced_table("stored_volume_bounds")
     def stored_volume_bounds(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         name = "stored_volume_bounds"
         if name not in cls.DECK_DATA_CACHING:
@@ -1558,6 +2062,7 @@ class Deck:
         return cls.DECK_DATA_CACHING[name].copy()
 
     @classmethod
+    @_traced_table("hydro_operative_constraints_id")
     def __hydro_operative_constraints_id(
         cls,
         uow: AbstractUnitOfWork,
@@ -1577,6 +2082,7 @@ class Deck:
         return cls.DECK_DATA_CACHING[name]
 
     @classmethod
+    @_traced_table("hydro_operative_constraints_coefficients")
     def __hydro_operative_constraints_coefficients(
         cls,
         uow: AbstractUnitOfWork,
@@ -1604,6 +2110,7 @@ class Deck:
         return cls.DECK_DATA_CACHING[name]
 
     @classmethod
+    @_traced_table("hydro_operative_constraints_bounds")
     def __hydro_operative_constraints_bounds(
         cls,
         uow: AbstractUnitOfWork,
@@ -1670,11 +2177,13 @@ class Deck:
         def __expand_constraints_by_stages(
             df: pd.DataFrame, df_stages: pd.DataFrame
         ) -> pd.DataFrame:
-            # TODO o cálculo/agrupamento de limites atual não leva em conta datas inicio
-            # data fim que não coincidem com as datas inicio e fim do estágio, situação na qual
-            # o limite correto seria a média ponderada das participações do limite em cada estágio,
-            # considerando as respectivas durações. Nesses casos, o limite calculado para
-            # a sintese fica vazio, como uma restrição inexistente.
+            # TODO o cálculo/agrupamento de limites atual não leva em conta
+            # datas inicio e data fim que não coincidem com as datas inicio
+            # e fim do estágio, situação na qual o limite correto seria a
+            # média ponderada das participações do limite em cada estágio,
+            # considerando as respectivas durações. Nesses casos, o limite
+            # calculado para a sintese fica vazio, como uma restrição
+            # inexistente.
             constraint_data = []
             df = df.sort_values(by=["codigo_restricao", START_DATE_COL])
 
@@ -1807,6 +2316,7 @@ class Deck:
         return df
 
     @classmethod
+    @_traced_table("hydro_turbined_bounds")
     def hydro_turbined_flow_bounds(
         cls, uow: AbstractUnitOfWork
     ) -> pd.DataFrame:
@@ -1814,7 +2324,16 @@ class Deck:
         hydro_turbined_bounds = cls.DECK_DATA_CACHING.get(name)
         if hydro_turbined_bounds is None:
             df = cls._validate_data(
-                cls.pdo_hidr(uow),
+                cls._with_columns(
+                    "pdo_hidr",
+                    cls.pdo_hidr,
+                    uow,
+                    [
+                        "vazao_turbinada_minima_m3s",
+                        "vazao_turbinada_maxima_m3s",
+                        "engolimento_maximo_m3s",
+                    ],
+                ),
                 pd.DataFrame,
                 "pdo_hidr",
             )
@@ -1843,6 +2362,7 @@ class Deck:
         return cls.DECK_DATA_CACHING[name]
 
     @classmethod
+    @_traced_table("hydro_outflow_bounds")
     def hydro_outflow_bounds(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         name = "hydro_outflow_bounds"
         hydro_outflow_bounds = cls.DECK_DATA_CACHING.get(name)
@@ -1863,6 +2383,7 @@ class Deck:
         return cls.DECK_DATA_CACHING[name]
 
     @classmethod
+    @_traced_table("hydro_spilled_flow_bounds")
     def hydro_spilled_flow_bounds(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         name = "hydro_spilled_flow_bounds"
         hydro_spilled_flow_bounds = cls.DECK_DATA_CACHING.get(name)
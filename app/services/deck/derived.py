@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+import pandas as pd  # type: ignore
+
+from app.utils.tracing import Tracer
+
+
+@dataclass(frozen=True)
+class DerivedColumn:
+    """
+    Coluna de uma tabela do deck calculada a partir de outras colunas
+    (`sources`), que podem ser também derivadas. A expressão recebe a
+    tabela e o contexto da síntese (unidade de trabalho) e retorna
+    os valores da coluna para todas as linhas da tabela.
+    """
+
+    sources: List[str]
+    expression: Callable[[pd.DataFrame, Any], Any]
+
+
+def source_columns(
+    derived: Dict[str, DerivedColumn], columns: Iterable[str]
+) -> Set[str]:
+    """
+    Obtém as colunas fornecidas e todas as colunas das quais estas
+    dependem, direta ou indiretamente.
+    """
+    result: Set[str] = set()
+    pending = list(columns)
+    while pending:
+        column = pending.pop()
+        if column not in result:
+            result.add(column)
+            if column in derived:
+                pending.extend(derived[column].sources)
+    return result
+
+
+def derive_columns(
+    table: str,
+    df: pd.DataFrame,
+    derived: Dict[str, DerivedColumn],
+    columns: Iterable[str],
+    context: Any,
+) -> List[str]:
+    """
+    Calcula na própria tabela as colunas derivadas fornecidas que
+    ainda não existam, assim como as colunas derivadas das quais
+    dependem, em ordem de dependência. Retorna as colunas calculadas.
+    """
+    computed: List[str] = []
+
+    def derive(column: str, visiting: Set[str]):
+        if column in df.columns or column not in derived:
+            return
+        if column in visiting:
+            raise ValueError(f"Dependência circular na coluna {column}")
+        visiting.add(column)
+        for source in derived[column].sources:
+            derive(source, visiting)
+        with Tracer.span("derivacao", tabela=table, coluna=column):
+            df[column] = derived[column].expression(df, context)
+        computed.append(column)
+
+    for column in columns:
+        derive(column, set())
+    return computed
@@ -0,0 +1,93 @@
+import threading
+from typing import Any, Callable, Dict, Iterable
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+
+class CodeMap:
+    """
+    Mapeamento vetorizado de chaves (códigos ou nomes de entidades)
+    para códigos de outras entidades (ex. usina hidrelétrica -> REE).
+    A consulta de uma coluna inteira é feita por uma única busca
+    no índice das chaves seguida de um único `take` nos códigos.
+
+    Assim como em um `dict`, prevalece a última ocorrência de chaves
+    repetidas. Chaves inexistentes resultam em `NaN`.
+    """
+
+    def __init__(self, keys: Iterable[Any], codes: Iterable[Any]):
+        mapping = dict(zip(keys, codes))
+        self.__index = pd.Index(list(mapping.keys()))
+        values = pd.Series(list(mapping.values()), dtype="Float64")
+        # A última posição contém o valor das chaves inexistentes,
+        # obtido pela posição -1 retornada na busca no índice
+        self.__codes = np.append(
+            values.to_numpy(dtype=float, na_value=np.nan), np.nan
+        )
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    @property
+    def keys(self) -> np.ndarray:
+        return self.__index.to_numpy()
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self.__codes[:-1]
+
+    def lookup(self, keys: Iterable[Any]) -> np.ndarray:
+        """
+        Obtém os códigos associados às chaves fornecidas. O resultado
+        é inteiro caso todas as chaves existam no mapeamento.
+        """
+        positions = self.__index.get_indexer(keys)
+        codes = self.__codes.take(positions)
+        if (positions >= 0).all():
+            return codes.astype(np.int64)
+        return codes
+
+    def compose(self, other: "CodeMap") -> "CodeMap":
+        """
+        Compõe dois mapeamentos (ex. usina -> REE e REE -> submercado),
+        resultando no mapeamento direto (ex. usina -> submercado).
+        """
+        return CodeMap(self.keys, other.lookup(self.codes))
+
+
+class EntityRegistry:
+    """
+    Registro dos mapeamentos entre as entidades de um caso (usinas,
+    REEs e submercados). Cada mapeamento é construído uma única vez,
+    quando solicitado pela primeira vez, pela função fornecida para
+    o seu nome, e compartilhado por todas as tabelas que o utilizam.
+    A construção de cada mapeamento é serializada, de modo que sínteses
+    concorrentes o constroem uma única vez.
+    """
+
+    def __init__(self, builders: Dict[str, Callable[[Any], CodeMap]]):
+        self.__builders = builders
+        self.__maps: Dict[str, CodeMap] = {}
+        self.__locks = {name: threading.RLock() for name in builders}
+
+    def map(self, name: str, context: Any) -> CodeMap:
+        """
+        Obtém um mapeamento, construindo-o a partir do contexto da
+        síntese (unidade de trabalho) caso ainda não exista.
+        """
+        with self.__locks[name]:
+            code_map = self.__maps.get(name)
+            if code_map is None:
+                code_map = self.__builders[name](context)
+                self.__maps[name] = code_map
+            return code_map
+
+    def lookup(
+        self, name: str, keys: Iterable[Any], context: Any
+    ) -> np.ndarray:
+        """
+        Obtém os códigos associados às chaves fornecidas por meio
+        de um mapeamento.
+        """
+        return self.map(name, context).lookup(keys)
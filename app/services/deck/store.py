@@ -0,0 +1,104 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+
+from app.adapters.repository.files import (
+    AbstractFilesRepository,
+    RawFilesRepository,
+)
+from app.model.settings import Settings
+
+
+class DeckTableStore:
+    """
+    Repositório das tabelas do `Deck` de um caso compartilhado entre
+    processos. Cada tabela é publicada uma única vez, como um arquivo
+    no formato IPC do Arrow em um diretório identificado pela assinatura
+    dos arquivos do caso, e anexada pelos demais processos através do
+    mapeamento do arquivo em memória, sem cópia dos dados pelo Arrow.
+
+    A publicação é atômica: a tabela é escrita em um arquivo temporário
+    no mesmo diretório e renomeada, de modo que um processo nunca anexa
+    uma tabela escrita parcialmente.
+    """
+
+    SUFFIX = ".arrow"
+
+    def __init__(self, directory: str, case_hash: str):
+        self.__path = Path(directory).joinpath(case_hash)
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    def __table_path(self, table: str) -> Path:
+        return self.__path.joinpath(f"{table}{self.SUFFIX}")
+
+    def tables(self) -> List[str]:
+        """
+        Obtém os nomes das tabelas publicadas.
+        """
+        if not self.__path.is_dir():
+            return []
+        return sorted(
+            p.name[: -len(self.SUFFIX)]
+            for p in self.__path.iterdir()
+            if p.name.endswith(self.SUFFIX)
+        )
+
+    def publish(self, table: str, df: pd.DataFrame):
+        """
+        Publica uma tabela, substituindo a versão existente.
+        """
+        data = pa.Table.from_pandas(df)
+        self.__path.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{table}-", suffix=self.SUFFIX, dir=self.__path
+        )
+        os.close(fd)
+        try:
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, data.schema) as writer:
+                    writer.write_table(data)
+            os.replace(tmp_path, self.__table_path(table))
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def attach(self, table: str) -> Optional[pd.DataFrame]:
+        """
+        Anexa uma tabela publicada, ou retorna `None` caso a tabela
+        não tenha sido publicada. As colunas numéricas do DataFrame
+        referenciam diretamente a memória mapeada, sendo somente leitura.
+        """
+        try:
+            source = pa.memory_map(str(self.__table_path(table)))
+        except FileNotFoundError:
+            return None
+        with pa.ipc.open_file(source) as reader:
+            data = reader.read_all()
+        return data.to_pandas(split_blocks=True)
+
+    def clear(self):
+        """
+        Remove as tabelas publicadas.
+        """
+        for table in self.tables():
+            self.__table_path(table).unlink(missing_ok=True)
+
+
+def case_store(files: AbstractFilesRepository) -> Optional[DeckTableStore]:
+    """
+    Constrói o repositório compartilhado das tabelas do `Deck` de um caso
+    no diretório definido pela variável de ambiente `DIRETORIO_TABELAS`,
+    caso definido. Os casos com múltiplos cenários, cujos arquivos dos
+    cenários não compõem a assinatura do caso, não são compartilhados.
+    """
+    directory = Settings().deck_store_dir
+    if not directory or not isinstance(files, RawFilesRepository):
+        return None
+    return DeckTableStore(directory, files.manifest.fingerprint)
@@ -1,23 +1,46 @@
+from __future__ import annotations
+
+import contextvars
 import pathlib
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, List
 
 import app.domain.commands as commands
 from app.model.settings import Settings
-from app.services.synthesis.system import SystemSynthetizer
-from app.services.synthesis.execution import ExecutionSynthetizer
-from app.services.synthesis.operation import OperationSynthetizer
-from app.services.unitofwork import AbstractUnitOfWork
+
+if TYPE_CHECKING:
+    from app.services.unitofwork import AbstractUnitOfWork
+
+
+def _use_table_store(uow: AbstractUnitOfWork):
+    """
+    Compartilha as tabelas do `Deck` do caso entre processos, quando
+    habilitado pela variável de ambiente `DIRETORIO_TABELAS`.
+    """
+    from app.services.deck.deck import Deck
+    from app.services.deck.store import case_store
+
+    with uow:
+        Deck.use_store(case_store(uow.files))
 
 
 def synthetize_system(
     command: commands.SynthetizeSystem, uow: AbstractUnitOfWork
 ):
+    from app.services.synthesis.system import SystemSynthetizer
+
+    _use_table_store(uow)
     SystemSynthetizer.synthetize(command.variables, uow)
 
 
 def synthetize_operation(
     command: commands.SynthetizeOperation, uow: AbstractUnitOfWork
 ):
+    from app.services.synthesis.operation import OperationSynthetizer
+
+    _use_table_store(uow)
     synthetizer = OperationSynthetizer()
     synthetizer.synthetize(command.variables, uow)
 
@@ -25,10 +48,56 @@ def synthetize_operation(
 def synthetize_execution(
     command: commands.SynthetizeExecution, uow: AbstractUnitOfWork
 ):
+    from app.services.synthesis.execution import ExecutionSynthetizer
+
+    _use_table_store(uow)
     synthetizer = ExecutionSynthetizer()
     synthetizer.synthetize(command.variables, uow)
 
 
+def synthetize_complete(
+    command: commands.SynthetizeComplete, uow: AbstractUnitOfWork
+):
+    """
+    Realiza as sínteses do sistema, da operação e da execução. As
+    famílias são executadas concorrentemente sobre um mesmo repositório
+    de arquivos e um mesmo cache do `Deck`, cada uma com a sua própria
+    unidade de trabalho e, portanto, com o seu próprio exportador.
+
+    A síntese da operação é executada na thread principal, e os casos
+    com múltiplos cenários, cuja troca de cenário descarta o cache
+    compartilhado do `Deck`, são sintetizados sequencialmente.
+    """
+    from app.adapters.repository.files import ScenarioFilesRepository
+
+    system = commands.SynthetizeSystem(command.system)
+    operation = commands.SynthetizeOperation(command.operation)
+    execution = commands.SynthetizeExecution(command.execution)
+    with uow:
+        files = uow.files
+    if not command.concurrent or isinstance(files, ScenarioFilesRepository):
+        synthetize_system(system, uow)
+        synthetize_operation(operation, uow)
+        synthetize_execution(execution, uow)
+        return
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Cada família é executada em uma cópia do contexto, de modo
+        # que os intervalos de rastreamento mantêm a sua hierarquia
+        futures: List[Future] = [
+            executor.submit(contextvars.copy_context().run, family)
+            for family in [
+                partial(synthetize_system, system, uow.fork()),
+                partial(synthetize_execution, execution, uow.fork()),
+            ]
+        ]
+        try:
+            synthetize_operation(operation, uow.fork())
+        finally:
+            for future in futures:
+                future.result()
+
+
 def clean():
     path = pathlib.Path(Settings().basedir).joinpath(Settings().synthesis_dir)
     shutil.rmtree(path)
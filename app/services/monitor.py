@@ -0,0 +1,316 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+from app.api import run_synthesis
+from app.model.settings import Settings
+from app.services.deck.deck import Deck
+from app.services.performance import performance_session
+from app.services.synthesis.operation import OperationSynthetizer
+from app.services.unitofwork import factory
+from app.utils.compression import archive_suffix, archive_workdir
+from app.utils.fs import case_fingerprint
+from app.utils.log import Log
+
+DESSEM_ARQ = "dessem.arq"
+DES_LOG_RELATO_PREFIX = "DES_LOG_RELATO."
+
+
+def _init_worker(formato: str):
+    os.environ["FORMATO_SINTESE"] = formato
+    Settings().synthesis_format = formato
+    if Log.log() is None:
+        Log.configure_logging(os.curdir)
+
+
+def synthetize_case(
+    path: str,
+    sistema: Optional[list[str]] = None,
+    operacao: Optional[list[str]] = None,
+    execucao: Optional[list[str]] = None,
+) -> str:
+    """
+    Realiza a síntese de um caso em um processo do monitoramento,
+    escrevendo as saídas no diretório do caso.
+    """
+    Deck.clear_cache()
+    OperationSynthetizer.clear_cache()
+    uow = factory("FS", path)
+    try:
+        with performance_session(uow):
+            run_synthesis(uow, sistema, operacao, execucao)
+    finally:
+        Deck.clear_cache()
+        OperationSynthetizer.clear_cache()
+    return path
+
+
+class PollingWatcher:
+    """
+    Aguarda por um intervalo fixo entre as varreduras do diretório.
+    """
+
+    def __init__(self, interval: float):
+        self.idle_timeout = interval
+
+    def __enter__(self) -> "PollingWatcher":
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def watch(self, directories: list[str]):
+        pass
+
+    def wait(self, timeout: float, stop: threading.Event):
+        stop.wait(timeout)
+
+
+class InotifyWatcher:
+    """
+    Aguarda por alterações nos diretórios monitorados através do
+    inotify do Linux, antecipando a próxima varredura.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_IGNORED = 0x00008000
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    EVENT_HEADER = struct.Struct("iIII")
+    # Varredura de segurança, para eventos perdidos pelo inotify
+    IDLE_TIMEOUT = 60.0
+    STOP_CHECK = 0.5
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "Erro ao iniciar o inotify")
+        self._watches: dict[str, int] = {}
+        self.idle_timeout = self.IDLE_TIMEOUT
+
+    @classmethod
+    def available(cls) -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            return False
+        return hasattr(ctypes.CDLL(libc_name), "inotify_init1")
+
+    def __enter__(self) -> "InotifyWatcher":
+        return self
+
+    def __exit__(self, *args):
+        os.close(self._fd)
+
+    def watch(self, directories: list[str]):
+        for d in directories:
+            if d in self._watches:
+                continue
+            wd = self._add_watch(self._fd, os.fsencode(d), self.WATCH_MASK)
+            if wd >= 0:
+                self._watches[d] = wd
+
+    def _drain(self):
+        ignored: set[int] = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = self.EVENT_HEADER.unpack_from(
+                    buffer, offset
+                )
+                if mask & self.IN_IGNORED:
+                    ignored.add(wd)
+                offset += self.EVENT_HEADER.size + length
+        if ignored:
+            self._watches = {
+                d: wd for d, wd in self._watches.items() if wd not in ignored
+            }
+
+    def wait(self, timeout: float, stop: threading.Event):
+        deadline = time.monotonic() + timeout
+        while not stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            ready, _, _ = select.select(
+                [self._fd], [], [], min(remaining, self.STOP_CHECK)
+            )
+            if ready:
+                self._drain()
+                return
+
+
+class CaseMonitor:
+    """
+    Monitora uma árvore de diretórios, realizando a síntese dos casos
+    do DESSEM que forem concluídos.
+
+    Um caso é identificado por um diretório com o `dessem.arq` e o
+    `DES_LOG_RELATO`, ou por um arquivo compactado (ex. `.zip` ou
+    `.tar.zst`), e é considerado concluído quando os seus arquivos
+    permanecem inalterados por `debounce` segundos. As sínteses são
+    executadas em um conjunto limitado de processos, que são reutilizados
+    entre os casos.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        workers: int = 2,
+        debounce: float = 5.0,
+        interval: float = 2.0,
+        sistema: Optional[list[str]] = None,
+        operacao: Optional[list[str]] = None,
+        execucao: Optional[list[str]] = None,
+        use_inotify: bool = True,
+    ):
+        self.root = Path(root).resolve()
+        self.workers = workers
+        self.debounce = debounce
+        self.interval = interval
+        self.variables = (sistema, operacao, execucao)
+        self.use_inotify = use_inotify
+        self.logger = logging.getLogger("main")
+        self._directories: list[str] = []
+        self._pending: dict[Path, tuple[str, float]] = {}
+        self._done: dict[Path, str] = {}
+        self._running: dict[Path, Future] = {}
+
+    def _find_cases(self) -> list[Path]:
+        synthesis_dir = Settings().synthesis_dir
+        self._directories = []
+        cases: list[Path] = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d != synthesis_dir]
+            self._directories.append(dirpath)
+            # Casos compactados são sintetizados sem extração
+            cases += [Path(dirpath, f) for f in filenames if archive_suffix(f)]
+            if DESSEM_ARQ not in [f.lower() for f in filenames]:
+                continue
+            if any(
+                f.upper().startswith(DES_LOG_RELATO_PREFIX) for f in filenames
+            ):
+                cases.append(Path(dirpath))
+        return cases
+
+    @staticmethod
+    def _newest_mtime(path: Path) -> float:
+        if path.is_file():
+            return path.stat().st_mtime
+        with os.scandir(path) as entries:
+            return max(
+                (e.stat().st_mtime for e in entries if e.is_file()),
+                default=0.0,
+            )
+
+    def _already_synthetized(self, case: Path) -> bool:
+        outdir = archive_workdir(case).joinpath(Settings().synthesis_dir)
+        if not outdir.is_dir():
+            return False
+        return self._newest_mtime(outdir) >= self._newest_mtime(case)
+
+    def scan(self, now: float) -> list[Path]:
+        """
+        Varre o diretório monitorado, retornando os casos prontos
+        para síntese, respeitando o limite de casos em execução.
+        """
+        ready: list[Path] = []
+        capacity = self.workers - len(self._running)
+        for case in self._find_cases():
+            if case in self._running:
+                continue
+            fingerprint = case_fingerprint(case)
+            if self._done.get(case) == fingerprint:
+                continue
+            if case not in self._done and self._already_synthetized(case):
+                self._done[case] = fingerprint
+                continue
+            seen = self._pending.get(case)
+            if seen is None or seen[0] != fingerprint:
+                self._pending[case] = (fingerprint, now)
+            elif now - seen[1] >= self.debounce and len(ready) < capacity:
+                self._pending.pop(case)
+                ready.append(case)
+        return ready
+
+    def _collect(self):
+        for case, future in list(self._running.items()):
+            if not future.done():
+                continue
+            self._running.pop(case)
+            # Arquivos convertidos durante a síntese não devem
+            # disparar uma nova síntese do mesmo caso.
+            self._done[case] = case_fingerprint(case)
+            error = future.exception()
+            if error is None:
+                self.logger.info(f"Síntese concluída: {case}")
+            else:
+                self.logger.error(f"Erro na síntese do caso {case}: {error}")
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(Settings().synthesis_format,),
+        )
+
+    def _create_watcher(self) -> PollingWatcher | InotifyWatcher:
+        if self.use_inotify and InotifyWatcher.available():
+            try:
+                return InotifyWatcher()
+            except OSError as e:
+                self.logger.warning(f"inotify indisponível: {e}")
+        return PollingWatcher(self.interval)
+
+    def run(self, stop: Optional[threading.Event] = None):
+        """
+        Executa o monitoramento até que `stop` seja sinalizado.
+        """
+        stop = stop if stop is not None else threading.Event()
+        pool = self._create_pool()
+        with self._create_watcher() as watcher:
+            self.logger.info(
+                f"Monitorando {self.root} ({type(watcher).__name__})"
+            )
+            try:
+                while not stop.is_set():
+                    self._collect()
+                    for case in self.scan(time.monotonic()):
+                        self.logger.info(f"Caso concluído: {case}")
+                        try:
+                            self._running[case] = pool.submit(
+                                synthetize_case, str(case), *self.variables
+                            )
+                        except BrokenProcessPool:
+                            pool.shutdown(cancel_futures=True)
+                            pool = self._create_pool()
+                    watcher.watch(self._directories)
+                    busy = self._pending or self._running
+                    timeout = self.interval if busy else watcher.idle_timeout
+                    watcher.wait(timeout, stop)
+            finally:
+                pool.shutdown(cancel_futures=True)
@@ -0,0 +1,184 @@
+import logging
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from app.internal.constants import PERFORMANCE_METADATA_OUTPUT
+from app.services.unitofwork import AbstractUnitOfWork
+from app.utils.memory import MB
+from app.utils.tracing import Span, Tracer
+
+STAGE_TIME_COLUMNS = {
+    "resolucao": "tempo_resolucao_s",
+    "limites": "tempo_limites_s",
+    "estatisticas": "tempo_estatisticas_s",
+    "exportacao": "tempo_exportacao_s",
+}
+
+PERFORMANCE_COLUMNS = [
+    "tipo",
+    "familia",
+    "chave",
+    "linhas",
+    "colunas",
+    "bytes",
+    "tempo_s",
+    *STAGE_TIME_COLUMNS.values(),
+    "acertos_cache",
+    "faltas_cache",
+    "linhas_por_s",
+    "mb_por_s",
+]
+
+
+class PerformanceCollector:
+    """
+    Ouvinte de intervalos que acumula as etapas executadas para
+    a construção do relatório de desempenho da síntese.
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def on_start(self, span: Span):
+        pass
+
+    def on_end(self, span: Span):
+        self.spans.append(span)
+
+    def _ancestor(
+        self, span: Span, name: str, by_id: dict[int, Span]
+    ) -> Optional[Span]:
+        parent_id = span.parent_id
+        while parent_id is not None:
+            parent = by_id.get(parent_id)
+            if parent is None:
+                return None
+            if parent.name == name:
+                return parent
+            parent_id = parent.parent_id
+        return None
+
+    @staticmethod
+    def _new_row(tipo: str, familia: str, chave: str) -> dict[str, Any]:
+        row: dict[str, Any] = {c: 0 for c in PERFORMANCE_COLUMNS}
+        row.update(
+            tipo=tipo,
+            familia=familia,
+            chave=chave,
+            tempo_s=0.0,
+            linhas_por_s=np.nan,
+            mb_por_s=np.nan,
+        )
+        for c in STAGE_TIME_COLUMNS.values():
+            row[c] = 0.0
+        return row
+
+    def report(self) -> pd.DataFrame:
+        """
+        Constrói o relatório com uma linha por síntese, por saída
+        adicional (estatísticas e metadados) e por arquivo lido,
+        além de uma linha com os totais e as vazões da execução.
+        """
+        by_id = {s.span_id: s for s in self.spans}
+        rows: dict[Any, dict[str, Any]] = {}
+
+        def family(span: Span) -> str:
+            f = self._ancestor(span, "familia", by_id)
+            return str(f.attributes.get("familia", "")) if f else ""
+
+        def synthesis_row(span: Span) -> dict[str, Any]:
+            # Em casos com múltiplos cenários, uma síntese é executada
+            # uma vez por cenário e as execuções são somadas
+            familia = family(span)
+            chave = str(span.attributes.get("chave", ""))
+            return rows.setdefault(
+                ("sintese", familia, chave),
+                self._new_row("sintese", familia, chave),
+            )
+
+        for span in sorted(self.spans, key=lambda s: s.start_ns):
+            synthesis = self._ancestor(span, "sintese", by_id)
+            if span.name == "sintese":
+                row = synthesis_row(span)
+                row["tempo_s"] += span.duration
+            elif span.name == "escrita":
+                if synthesis is not None:
+                    row = synthesis_row(synthesis)
+                else:
+                    name = Path(str(span.attributes.get("arquivo", ""))).stem
+                    row = rows.setdefault(
+                        ("saida", name),
+                        self._new_row("saida", family(span), name),
+                    )
+                    row["tempo_s"] += span.duration
+                for c in ["linhas", "colunas", "bytes"]:
+                    row[c] += span.attributes.get(c, 0)
+            elif span.name in STAGE_TIME_COLUMNS and synthesis is not None:
+                row = synthesis_row(synthesis)
+                row[STAGE_TIME_COLUMNS[span.name]] += span.duration
+            elif span.name == "deck" and "cache" in span.attributes:
+                if synthesis is not None:
+                    row = synthesis_row(synthesis)
+                    hit = span.attributes["cache"]
+                    row["acertos_cache" if hit else "faltas_cache"] += 1
+            elif span.name in ["leitura", "conversao"]:
+                name = str(span.attributes.get("arquivo", ""))
+                row = rows.setdefault(
+                    ("arquivo", name),
+                    self._new_row("arquivo", family(span), name),
+                )
+                row["tempo_s"] += span.duration
+                row["bytes"] += span.attributes.get("bytes", 0)
+
+        df = pd.DataFrame(list(rows.values()), columns=PERFORMANCE_COLUMNS)
+        outputs = df.loc[df["tipo"] != "arquivo"]
+        total = self._new_row("total", "", "")
+        total["linhas"] = int(outputs["linhas"].sum())
+        total["bytes"] = int(outputs["bytes"].sum())
+        if self.spans:
+            start = min(s.start_ns for s in self.spans)
+            end = max(s.end_ns for s in self.spans)
+            total["tempo_s"] = (end - start) / 1e9
+        if total["tempo_s"] > 0:
+            total["linhas_por_s"] = total["linhas"] / total["tempo_s"]
+            total["mb_por_s"] = total["bytes"] / MB / total["tempo_s"]
+        df.loc[len(df)] = total
+        return df
+
+
+class performance_session:
+    """
+    Registra as etapas executadas no contexto e, ao final, exporta
+    o relatório de desempenho como a saída `METADADOS_DESEMPENHO`.
+    """
+
+    def __init__(self, uow: AbstractUnitOfWork, enabled: bool = True):
+        self.uow = uow
+        self.enabled = enabled
+        self.collector = PerformanceCollector()
+        self.logger = logging.getLogger("main")
+
+    def __enter__(self) -> "performance_session":
+        if self.enabled:
+            Tracer.add_listener(self.collector)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if not self.enabled:
+            return
+        Tracer.remove_listener(self.collector)
+        if exc_type is not None or not self.collector.spans:
+            return
+        df = self.collector.report()
+        total = df.iloc[-1]
+        self.logger.info(
+            f"Desempenho: {total['linhas']} linhas,"
+            + f" {total['bytes'] / MB:.1f} MB em {total['tempo_s']:.2f} s"
+            + f" ({total['linhas_por_s']:.0f} linhas/s,"
+            + f" {total['mb_por_s']:.2f} MB/s)"
+        )
+        with self.uow:
+            self.uow.export.synthetize_df(df, PERFORMANCE_METADATA_OUTPUT)
@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import asdict
+from typing import Any, Optional
+
+from app.services.deck.deck import Deck
+from app.services.performance import performance_session
+from app.services.synthesis.operation import OperationSynthetizer
+from app.services.unitofwork import AbstractUnitOfWork
+from app.utils.memory import MB, MemoryProfiler, deep_sizeof, peak_rss
+from app.utils.profiler import CallProfiler, ProfileTarget
+from app.utils.tracing import Tracer, trace_session
+
+
+def cache_footprint() -> dict[str, dict[str, int]]:
+    """
+    Obtém o tamanho em bytes de cada entrada das caches do `Deck`
+    e das sínteses da operação.
+    """
+    return {
+        "deck": {
+            str(k): deep_sizeof(v) for k, v in Deck.DECK_DATA_CACHING.items()
+        },
+        "sintese": {
+            str(k): deep_sizeof(v)
+            for k, v in OperationSynthetizer.CACHED_SYNTHESIS.items()
+        },
+    }
+
+
+class memory_session:
+    """
+    Mede a memória alocada em cada construção de tabela do `Deck`
+    e em cada síntese executada no contexto. Ao final, informa no
+    log os maiores consumidores e exporta as medições, junto com o
+    tamanho das entradas das caches, para `memoria.json`.
+    """
+
+    FILENAME = "memoria.json"
+
+    def __init__(self, directory: str, enabled: bool = True, top: int = 10):
+        self.directory = directory
+        self.enabled = enabled
+        self.num_top = top
+        self.profiler = MemoryProfiler()
+        self.report: dict[str, Any] = {}
+        self.logger = logging.getLogger("main")
+
+    def __enter__(self) -> "memory_session":
+        if self.enabled:
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            Tracer.add_listener(self.profiler)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if not self.enabled:
+            return
+        Tracer.remove_listener(self.profiler)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        caches = cache_footprint()
+        peak = peak_rss()
+        self.report = {
+            "pico_rss": peak,
+            "etapas": [asdict(r) for r in self.profiler.records],
+            "maiores_consumidores": [
+                asdict(r) for r in self.profiler.top(self.num_top)
+            ],
+            "caches": caches,
+        }
+        self._log_report()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(
+            os.path.join(self.directory, self.FILENAME), "w", encoding="utf-8"
+        ) as f:
+            json.dump(self.report, f, indent=2)
+
+    def _log_report(self):
+        if self.report["pico_rss"] is not None:
+            self.logger.info(
+                f"Pico de memória residente: {self.report['pico_rss'] / MB:.1f}"
+                + " MB"
+            )
+        self.logger.info("Maiores consumidores de memória:")
+        for r in self.profiler.top(self.num_top):
+            self.logger.info(
+                f"  {r.stage} {r.target}: pico {r.peak / MB:.1f} MB,"
+                + f" retido {r.allocated / MB:.1f} MB"
+            )
+        for cache, entries in self.report["caches"].items():
+            total = sum(entries.values())
+            self.logger.info(f"Cache {cache}: {total / MB:.1f} MB")
+            largest = sorted(entries.items(), key=lambda e: -e[1])
+            for key, size in largest[: self.num_top]:
+                self.logger.info(f"  {key}: {size / MB:.1f} MB")
+
+
+class call_profile_session:
+    """
+    Executa o `cProfile` nas etapas selecionadas (ex. `GTER_UTE` ou
+    `deck:pdo_oper_term`), escrevendo os arquivos `.pstats` no
+    subdiretório `_perfil` do diretório fornecido.
+    """
+
+    SUBDIR = "_perfil"
+
+    def __init__(self, directory: str, targets: Optional[str] = None):
+        self.profiler: Optional[CallProfiler] = None
+        parsed = ProfileTarget.parse(targets) if targets else []
+        if parsed:
+            self.profiler = CallProfiler(
+                parsed, os.path.join(directory, self.SUBDIR)
+            )
+
+    def __enter__(self) -> "call_profile_session":
+        if self.profiler is not None:
+            Tracer.add_listener(self.profiler)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if self.profiler is not None:
+            Tracer.remove_listener(self.profiler)
+
+
+def profiling_session(
+    directory: str,
+    perfil: bool = False,
+    memoria: bool = False,
+    perfilar: Optional[str] = None,
+    uow: Optional[AbstractUnitOfWork] = None,
+) -> ExitStack:
+    """
+    Combina os modos de perfilamento solicitados na linha de comando
+    em um único contexto. Caso seja fornecida a unidade de trabalho,
+    o relatório de desempenho é exportado junto às sínteses.
+    """
+    stack = ExitStack()
+    if uow is not None:
+        stack.enter_context(performance_session(uow))
+    stack.enter_context(trace_session(directory, enabled=perfil))
+    stack.enter_context(memory_session(directory, enabled=memoria))
+    stack.enter_context(call_profile_session(directory, perfilar))
+    return stack
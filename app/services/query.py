@@ -0,0 +1,228 @@
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional, Union
+
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+import pyarrow.csv as pacsv  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+
+from app.internal.constants import STAGE_COL, START_DATE_COL
+from app.model.settings import Settings
+from app.services.consolidation import (
+    CASE_COL,
+    DATE_PARTITION,
+    MANIFEST_FILENAME,
+    OUTPUT_PARTITION,
+)
+
+CODE_PREFIX = "codigo_"
+
+DateLike = Union[str, datetime, pd.Timestamp]
+
+
+class SynthesisQuery:
+    """
+    Consulta às saídas de uma síntese, com projeção de colunas e
+    filtros aplicados na leitura dos arquivos pelo Arrow, evitando
+    carregar as saídas completas em memória.
+
+    O caminho pode ser o diretório de um caso, o seu diretório de
+    síntese ou o diretório de um histórico produzido pelo comando
+    `consolidar`, no qual é possível filtrar também pelos casos.
+
+    :param path: Diretório do caso, da síntese ou do histórico
+    :param saida: Nome da saída (ex. `GHID_UHE`)
+    :param codigos: Códigos da entidade, aplicados à primeira coluna
+        de códigos da saída (ex. `codigo_usina` em `GHID_UHE`)
+    :param filtros: Valores aceitos para colunas quaisquer da saída
+    :param inicio: Data mínima do início dos estágios (inclusive)
+    :param fim: Data máxima do início dos estágios (inclusive)
+    :param estagios: Estágios inicial e final (inclusive)
+    :param colunas: Colunas projetadas no resultado
+    :param casos: Casos do histórico consolidado
+    """
+
+    def __init__(
+        self,
+        path: str,
+        saida: str,
+        codigos: Optional[list[int]] = None,
+        filtros: Optional[dict[str, list]] = None,
+        inicio: Optional[DateLike] = None,
+        fim: Optional[DateLike] = None,
+        estagios: Optional[tuple[int, int]] = None,
+        colunas: Optional[list[str]] = None,
+        casos: Optional[list[str]] = None,
+    ):
+        self.path = Path(path).resolve()
+        self.saida = saida
+        self.codigos = codigos
+        self.filtros = dict(filtros) if filtros else {}
+        self.inicio = inicio
+        self.fim = fim
+        self.estagios = estagios
+        self.colunas = colunas
+        self.casos = casos
+
+    def _is_consolidated(self) -> bool:
+        return self.path.joinpath(MANIFEST_FILENAME).is_file() or any(
+            self.path.glob(f"{OUTPUT_PARTITION}=*")
+        )
+
+    def dataset(self) -> ds.Dataset:
+        """
+        Obtém o dataset do Arrow com os arquivos da saída consultada.
+        """
+        if self._is_consolidated():
+            directory = self.path.joinpath(f"{OUTPUT_PARTITION}={self.saida}")
+            if not directory.is_dir():
+                raise FileNotFoundError(
+                    f"Saída {self.saida} não encontrada em {self.path}"
+                )
+            return ds.dataset(
+                directory,
+                format="parquet",
+                partitioning=ds.partitioning(
+                    pa.schema([(DATE_PARTITION, pa.string())]),
+                    flavor="hive",
+                ),
+            )
+        for directory in [
+            self.path.joinpath(Settings().synthesis_dir),
+            self.path,
+        ]:
+            filepath = directory.joinpath(f"{self.saida}.parquet")
+            if filepath.is_file():
+                return ds.dataset(filepath, format="parquet")
+        raise FileNotFoundError(
+            f"Saída {self.saida} não encontrada em {self.path}"
+        )
+
+    @staticmethod
+    def _values(field: pa.Field, values: list) -> pa.Array:
+        array = pa.array(values)
+        if array.type != field.type:
+            array = pc.cast(array, field.type)
+        return array
+
+    @staticmethod
+    def _timestamp(field: pa.Field, value: DateLike) -> pa.Scalar:
+        ts = pd.Timestamp(value)
+        if ts.tzinfo is None:
+            ts = ts.tz_localize("UTC")
+        tz = getattr(field.type, "tz", None)
+        ts = ts.tz_convert(tz) if tz else ts.tz_convert("UTC").tz_localize(None)
+        return pa.scalar(ts.to_pydatetime(), type=field.type)
+
+    @staticmethod
+    def _field(schema: pa.Schema, name: str) -> pa.Field:
+        index = schema.get_field_index(name)
+        if index == -1:
+            raise ValueError(f"Coluna {name} não existe na saída")
+        return schema.field(index)
+
+    def _code_column(self, schema: pa.Schema) -> str:
+        for name in schema.names:
+            if name.startswith(CODE_PREFIX):
+                return name
+        raise ValueError(f"Saída {self.saida} não possui coluna de códigos")
+
+    def expression(self, schema: pa.Schema) -> Optional[ds.Expression]:
+        """
+        Constrói a expressão de filtro da consulta para o esquema
+        da saída, convertendo os valores para o tipo das colunas.
+        """
+        filtros = dict(self.filtros)
+        if self.codigos:
+            filtros[self._code_column(schema)] = list(self.codigos)
+        if self.casos:
+            filtros[CASE_COL] = list(self.casos)
+        conditions: list[ds.Expression] = []
+        for name, values in filtros.items():
+            field = self._field(schema, name)
+            conditions.append(
+                ds.field(name).isin(self._values(field, list(values)))
+            )
+        if self.inicio is not None or self.fim is not None:
+            field = self._field(schema, START_DATE_COL)
+            if self.inicio is not None:
+                conditions.append(
+                    ds.field(START_DATE_COL)
+                    >= self._timestamp(field, self.inicio)
+                )
+            if self.fim is not None:
+                conditions.append(
+                    ds.field(START_DATE_COL) <= self._timestamp(field, self.fim)
+                )
+        if self.estagios is not None:
+            self._field(schema, STAGE_COL)
+            first, last = self.estagios
+            conditions.append(ds.field(STAGE_COL) >= first)
+            conditions.append(ds.field(STAGE_COL) <= last)
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def scanner(self) -> ds.Scanner:
+        dataset = self.dataset()
+        if self.colunas:
+            for name in self.colunas:
+                self._field(dataset.schema, name)
+        return dataset.scanner(
+            columns=self.colunas or None,
+            filter=self.expression(dataset.schema),
+        )
+
+    def reader(self) -> pa.RecordBatchReader:
+        """
+        Obtém os resultados da consulta como um fluxo de lotes.
+        """
+        return self.scanner().to_reader()
+
+    def to_table(self) -> pa.Table:
+        """
+        Obtém os resultados da consulta como uma tabela do Arrow.
+        """
+        return self.scanner().to_table()
+
+
+def _write_csv(reader: pa.RecordBatchReader, sink: BinaryIO):
+    with pacsv.CSVWriter(sink, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+def _write_parquet(reader: pa.RecordBatchReader, sink: BinaryIO):
+    with pq.ParquetWriter(sink, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+def _write_arrow(reader: pa.RecordBatchReader, sink: BinaryIO):
+    with pa.ipc.new_stream(sink, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+WRITERS: dict[str, Callable[[pa.RecordBatchReader, BinaryIO], None]] = {
+    "CSV": _write_csv,
+    "PARQUET": _write_parquet,
+    "ARROW": _write_arrow,
+}
+
+
+def write_query(reader: pa.RecordBatchReader, formato: str, sink: BinaryIO):
+    """
+    Escreve os resultados de uma consulta em um fluxo binário,
+    lote a lote, no formato CSV, PARQUET ou ARROW (stream IPC).
+    """
+    writer = WRITERS.get(formato.upper())
+    if writer is None:
+        raise ValueError(f"Formato de consulta {formato} não suportado")
+    writer(reader, pa.PythonFile(sink, mode="w"))
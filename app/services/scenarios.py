@@ -0,0 +1,61 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator
+
+from app.adapters.repository.files import ScenarioFilesRepository
+from app.model.settings import Settings
+
+
+def _load_scenario(
+    files: ScenarioFilesRepository, scenario: int, readers: list[str]
+) -> ScenarioFilesRepository:
+    scenario_files = files.for_scenario(scenario)
+    try:
+        scenario_files.load(readers)
+    except Exception:
+        # Os erros de leitura são informados pelo repositório e
+        # tratados na síntese de cada variável
+        pass
+    return scenario_files
+
+
+def iterate_scenarios(
+    files: ScenarioFilesRepository, workers: int | None = None
+) -> Iterator[ScenarioFilesRepository]:
+    """
+    Percorre os cenários de um caso em ordem, lendo antecipadamente
+    e em paralelo os arquivos dos cenários seguintes. Os arquivos
+    lidos no primeiro cenário são os lidos antecipadamente nos demais.
+
+    No máximo `workers` cenários são lidos além do cenário em
+    processamento, limitando a memória utilizada pelos arquivos.
+    """
+    if workers is None:
+        workers = Settings().scenario_workers
+    scenarios = sorted(files.scenarios)
+    if not scenarios:
+        return
+    first = files.for_scenario(scenarios[0])
+    yield first
+    if workers < 1:
+        for scenario in scenarios[1:]:
+            yield files.for_scenario(scenario)
+        return
+    readers = first.loaded
+    remaining = iter(scenarios[1:])
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+
+        def submit():
+            scenario = next(remaining, None)
+            if scenario is not None:
+                pending.append(
+                    pool.submit(_load_scenario, files, scenario, readers)
+                )
+
+        for _ in range(workers):
+            submit()
+        while pending:
+            scenario_files = pending.popleft().result()
+            submit()
+            yield scenario_files
@@ -0,0 +1,247 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+
+import pyarrow as pa  # type: ignore
+
+from app.adapters.repository.export import factory as export_factory
+from app.adapters.repository.files import AbstractFilesRepository
+from app.api import run_synthesis
+from app.model.settings import Settings
+from app.services.deck.deck import Deck
+from app.services.synthesis.operation import OperationSynthetizer
+from app.services.unitofwork import MemoryUnitOfWork
+from app.utils.fs import case_fingerprint
+
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+
+@dataclass
+class WarmCase:
+    fingerprint: str
+    files: Optional[AbstractFilesRepository] = None
+    deck_data: dict[str, Any] = field(default_factory=dict)
+    required_columns: dict[str, set[str]] = field(default_factory=dict)
+    scenario: int = 1
+
+
+class SynthesisService:
+    """
+    Mantém em memória os arquivos lidos e as tabelas do `Deck` dos
+    casos mais recentes, invalidando-os quando os arquivos do caso
+    são alterados.
+    """
+
+    def __init__(self, max_cases: int = 8):
+        self.max_cases = max_cases
+        self.hits = 0
+        self.misses = 0
+        self._cases: OrderedDict[Path, WarmCase] = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("main")
+
+    @property
+    def num_cases(self) -> int:
+        return len(self._cases)
+
+    def _warm_case(self, path: Path) -> WarmCase:
+        fingerprint = case_fingerprint(path)
+        case = self._cases.get(path)
+        if case is not None and case.fingerprint == fingerprint:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if case is not None:
+                self.logger.info(f"Caso alterado, descartando cache: {path}")
+            case = WarmCase(fingerprint)
+            self._cases[path] = case
+        self._cases.move_to_end(path)
+        while len(self._cases) > self.max_cases:
+            self._cases.popitem(last=False)
+        return case
+
+    @contextmanager
+    def _use_case(self, case: WarmCase):
+        """
+        Substitui o estado de classe do `Deck` pelo estado do caso e
+        descarta os caches das sínteses da operação, restaurando o
+        estado anterior ao final da síntese.
+        """
+        previous = (
+            Deck.DECK_DATA_CACHING,
+            Deck.REQUIRED_COLUMNS,
+            Deck.STORE,
+            Deck.SCENARIO,
+        )
+        Deck.DECK_DATA_CACHING = case.deck_data
+        Deck.REQUIRED_COLUMNS = case.required_columns
+        Deck.STORE = None
+        Deck.SCENARIO = case.scenario
+        OperationSynthetizer.clear_cache()
+        try:
+            yield
+        finally:
+            OperationSynthetizer.clear_cache()
+            case.scenario = Deck.SCENARIO
+            (
+                Deck.DECK_DATA_CACHING,
+                Deck.REQUIRED_COLUMNS,
+                Deck.STORE,
+                Deck.SCENARIO,
+            ) = previous
+
+    def synthesize(
+        self,
+        path: str,
+        sistema: Optional[list[str]] = None,
+        operacao: Optional[list[str]] = None,
+        execucao: Optional[list[str]] = None,
+    ) -> dict[str, pa.Table]:
+        """
+        Realiza a síntese de um caso reaproveitando os dados já
+        processados em requisições anteriores.
+        """
+        case_path = Path(path).resolve()
+        # O Deck mantém o cache em atributos de classe, portanto
+        # apenas uma síntese é executada por vez.
+        with self._lock:
+            case = self._warm_case(case_path)
+            uow = MemoryUnitOfWork(str(case_path), files=case.files)
+            with self._use_case(case):
+                try:
+                    run_synthesis(uow, sistema, operacao, execucao)
+                finally:
+                    try:
+                        case.files = uow.files
+                    except RuntimeError:
+                        pass
+            return dict(uow.export.tables)
+
+    def export(
+        self, tables: dict[str, pa.Table], path: str, formato: str
+    ) -> Path:
+        """
+        Escreve as sínteses no diretório de saída do caso.
+        """
+        outdir = Path(path).resolve().joinpath(Settings().synthesis_dir)
+        outdir.mkdir(parents=True, exist_ok=True)
+        exporter = export_factory(formato, str(outdir))
+        for name, table in tables.items():
+            exporter.synthetize_df(table.to_pandas(), name)
+        return outdir
+
+
+class SynthesisRequestHandler(BaseHTTPRequestHandler):
+    """
+    Atende às requisições de síntese recebidas pelo servidor.
+
+    `GET /saude` informa o estado do servidor. `POST /sintese` recebe
+    um JSON com o `caminho` do caso e as listas de variáveis `sistema`,
+    `operacao` e `execucao`. Com `"saida": "arrow"` é retornada a
+    síntese `chave` como um stream IPC do Arrow. Caso contrário, as
+    sínteses são escritas no diretório do caso no `formato` fornecido.
+    """
+
+    server: "SynthesisServer"
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: dict):
+        self._send(status, json.dumps(data).encode(), "application/json")
+
+    def do_GET(self):
+        if self.path != "/saude":
+            self._send_json(404, {"erro": f"Rota {self.path} inexistente"})
+            return
+        service = self.server.service
+        self._send_json(
+            200,
+            {
+                "casos": service.num_cases,
+                "acertos_cache": service.hits,
+                "faltas_cache": service.misses,
+            },
+        )
+
+    def do_POST(self):
+        if self.path != "/sintese":
+            self._send_json(404, {"erro": f"Rota {self.path} inexistente"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = json.loads(self.rfile.read(length))
+            path = job["caminho"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"erro": "Requisição de síntese inválida"})
+            return
+
+        service = self.server.service
+        try:
+            tables = service.synthesize(
+                path,
+                sistema=job.get("sistema"),
+                operacao=job.get("operacao"),
+                execucao=job.get("execucao"),
+            )
+        except Exception as e:
+            service.logger.error(f"Erro na síntese do caso {path}: {e}")
+            self._send_json(500, {"erro": str(e)})
+            return
+
+        if job.get("saida", "arquivos") == "arrow":
+            key = job.get("chave")
+            table = tables.get(key)
+            if table is None:
+                self._send_json(404, {"erro": f"Síntese {key} não encontrada"})
+                return
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            self._send(
+                200, sink.getvalue().to_pybytes(), ARROW_STREAM_CONTENT_TYPE
+            )
+        else:
+            formato = job.get("formato", Settings().synthesis_format)
+            outdir = service.export(tables, path, formato)
+            self._send_json(
+                200, {"diretorio": str(outdir), "saidas": list(tables.keys())}
+            )
+
+    def log_message(self, format, *args):
+        self.server.service.logger.debug(format % args)
+
+
+class SynthesisServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: SynthesisService):
+        super().__init__(address, SynthesisRequestHandler)
+        self.service = service
+
+
+def serve(host: str, port: int, max_cases: int = 8):
+    """
+    Inicia o servidor de síntese, atendendo requisições até
+    ser interrompido.
+    """
+    server = SynthesisServer((host, port), SynthesisService(max_cases))
+    server.service.logger.info(
+        f"Servidor de síntese escutando em http://{host}:{port}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -18,6 +18,7 @@ from app.services.deck.deck import Deck
 from app.services.unitofwork import AbstractUnitOfWork
 from app.utils.regex import match_variables_with_wildcards
 from app.utils.timing import time_and_log
+from app.utils.tracing import Tracer
 
 
 class ExecutionSynthetizer:
@@ -90,11 +91,11 @@ class ExecutionSynthetizer:
     @classmethod
     def _resolve_program(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         return pd.DataFrame(data={"programa": ["DESSEM"]})
-    
+
     @classmethod
     def _resolve_version(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         return pd.DataFrame(data={"versao": [Deck.version(uow)]})
-    
+
     @classmethod
     def _resolve_title(cls, uow: AbstractUnitOfWork) -> pd.DataFrame:
         return pd.DataFrame(data={"titulo": [Deck.title(uow)]})
@@ -167,14 +168,20 @@ class ExecutionSynthetizer:
         with time_and_log(
             message_root=f"Tempo para sintese de {filename}",
             logger=cls.logger,
+            span="sintese",
+            chave=filename,
         ):
             try:
                 cls._log(f"Realizando síntese de {filename}")
-                df = cls._resolve(s, uow)
+                with Tracer.span("resolucao", chave=filename) as span:
+                    df = cls._resolve(s, uow)
+                    if df is not None:
+                        span.set(linhas=len(df))
                 if df is not None:
-                    with uow:
-                        uow.export.synthetize_df(df, filename)
-                        return s
+                    with Tracer.span("exportacao", chave=filename):
+                        with uow:
+                            uow.export.synthetize_df(df, filename)
+                    return s
                 return None
             except Exception as e:
                 print_exc()
@@ -187,7 +194,10 @@ class ExecutionSynthetizer:
         uow.subdir = EXECUTION_SYNTHESIS_SUBDIR
 
         with time_and_log(
-            message_root="Tempo para sintese da execucao", logger=cls.logger
+            message_root="Tempo para sintese da execucao",
+            logger=cls.logger,
+            span="familia",
+            familia="execucao",
         ):
             synthesis_variables = cls._preprocess_synthesis_variables(
                 variables, uow
@@ -1,10 +1,14 @@
 import logging
+from functools import partial
 from logging import DEBUG, ERROR, INFO, WARNING
 from traceback import print_exc
-from typing import Callable, List, TypeVar
+from typing import Callable, List, Optional, TypeVar
 
 import pandas as pd  # type: ignore
 
+from app.adapters.repository.export import AbstractSynthesisWriter
+from app.adapters.repository.files import ScenarioFilesRepository
+
 from app.internal.constants import (
     IDENTIFICATION_COLUMNS,
     OPERATION_SYNTHESIS_METADATA_OUTPUT,
@@ -18,17 +22,19 @@ from app.internal.constants import (
 from app.model.operation.operationsynthesis import (
     SUPPORTED_SYNTHESIS,
     SYNTHESIS_DEPENDENCIES,
-    UNITS,
+    SYNTHESIS_SOURCES,
     OperationSynthesis,
 )
 from app.model.operation.spatialresolution import SpatialResolution
-from app.model.operation.variable import Variable
 from app.services.deck.bounds import OperationVariableBounds
 from app.services.deck.deck import Deck
+from app.services.scenarios import iterate_scenarios
+from app.services.synthesis.planner import SynthesisPlan
 from app.services.unitofwork import AbstractUnitOfWork
-from app.utils.operations import calc_statistics
+from app.utils.operations import IncrementalStatistics, calc_statistics
 from app.utils.regex import match_variables_with_wildcards
 from app.utils.timing import time_and_log
+from app.utils.tracing import Tracer
 
 
 class OperationSynthetizer:
@@ -43,13 +49,33 @@ class OperationSynthetizer:
         set([p for pr in SYNTHESIS_DEPENDENCIES.values() for p in pr])
     )
 
-    # Estratégias de cache para reduzir tempo total de síntese
+    # Estratégias de cache para reduzir tempo total de síntese. Os
+    # caches da síntese da operação não são compartilhados entre threads:
+    # na síntese completa, a operação é executada apenas na thread
+    # principal, e as sínteses do sistema e da execução não os acessam.
     CACHED_SYNTHESIS: dict[OperationSynthesis, pd.DataFrame] = {}
     ORDERED_SYNTHESIS_ENTITIES: dict[OperationSynthesis, dict[str, list]] = {}
 
     # Estatísticas das sínteses são armazenadas separadamente
     SYNTHESIS_STATS: dict[SpatialResolution, list[pd.DataFrame]] = {}
 
+    # Em casos com múltiplos cenários, as sínteses são escritas e as
+    # estatísticas acumuladas a cada cenário processado
+    SCENARIO_WRITERS: dict[OperationSynthesis, AbstractSynthesisWriter] = {}
+    SCENARIO_STATS: dict[OperationSynthesis, IncrementalStatistics] = {}
+
+    # Arquivos lidos antecipadamente, em processos separados, quando
+    # habilitado pela variável de ambiente `PROCESSOS_LEITURA` e
+    # quando necessários segundo o plano das sínteses
+    PREFETCHED_READERS = [
+        "get_pdo_operacao",
+        "get_pdo_sist",
+        "get_pdo_hidr",
+        "get_pdo_oper_tviag_calha",
+        "get_pdo_eolica",
+        "get_pdo_inter",
+    ]
+
     @classmethod
     def clear_cache(cls):
         """
@@ -58,6 +84,8 @@ class OperationSynthetizer:
         cls.CACHED_SYNTHESIS.clear()
         cls.ORDERED_SYNTHESIS_ENTITIES.clear()
         cls.SYNTHESIS_STATS.clear()
+        cls.SCENARIO_WRITERS.clear()
+        cls.SCENARIO_STATS.clear()
 
     @classmethod
     def _log(cls, msg: str, level: int = INFO):
@@ -65,213 +93,26 @@ class OperationSynthetizer:
             cls.logger.log(level, msg)
 
     @classmethod
-    def _resolve(
-        cls, synthesis: tuple[Variable, SpatialResolution]
-    ) -> Callable:
-        _rules: dict[
-            tuple[Variable, SpatialResolution],
-            Callable,
-        ] = {
-            (
-                Variable.CUSTO_OPERACAO,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_operacao_costs(
-                uow, "custo_presente"
-            ),
-            (
-                Variable.CUSTO_FUTURO,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_operacao_costs(uow, "custo_futuro"),
-            (
-                Variable.CUSTO_MARGINAL_OPERACAO,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_pdo_sist_sbm(uow, "cmo"),
-            (
-                Variable.MERCADO,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_pdo_sist_sbm(uow, "demanda"),
-            (
-                Variable.MERCADO,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_sist_sin(uow, "demanda"),
-            (
-                Variable.MERCADO_LIQUIDO,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_pdo_sist_sbm(uow, "demanda_liquida"),
-            (
-                Variable.MERCADO_LIQUIDO,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_sist_sin(uow, "demanda_liquida"),
-            (
-                Variable.GERACAO_HIDRAULICA,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_hydro_submarkets_pdo_sist_sbm(
-                uow, "geracao_hidraulica"
-            ),
-            (
-                Variable.GERACAO_HIDRAULICA,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_sist_sin(uow, "geracao_hidraulica"),
-            (
-                Variable.GERACAO_TERMICA,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_thermal_submarkets_pdo_sist_sbm(
-                uow, "geracao_termica"
-            ),
-            (
-                Variable.GERACAO_TERMICA,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_sist_sin(uow, "geracao_termica"),
-            (
-                Variable.GERACAO_USINAS_NAO_SIMULADAS,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_pdo_eolica_sbm(uow, "geracao"),
-            (
-                Variable.GERACAO_USINAS_NAO_SIMULADAS,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_eolica_sin(uow, "geracao"),
-            (
-                Variable.GERACAO_USINAS_NAO_SIMULADAS_DISPONIVEL,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_pdo_eolica_sbm(
-                uow, "geracao_pre_definida"
-            ),
-            (
-                Variable.GERACAO_USINAS_NAO_SIMULADAS_DISPONIVEL,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_eolica_sin(
-                uow, "geracao_pre_definida"
-            ),
-            (
-                Variable.CORTE_GERACAO_USINAS_NAO_SIMULADAS,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_pdo_eolica_sbm(uow, "corte_geracao"),
-            (
-                Variable.CORTE_GERACAO_USINAS_NAO_SIMULADAS,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_eolica_sin(uow, "corte_geracao"),
-            (
-                Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_pdo_sist_sbm(uow, "energia_armazenada"),
-            (
-                Variable.ENERGIA_ARMAZENADA_ABSOLUTA_FINAL,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_sist_sin(uow, "energia_armazenada"),
-            (
-                Variable.VOLUME_ARMAZENADO_PERCENTUAL_FINAL,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(
-                uow, "volume_final_percentual"
-            ),
-            (
-                Variable.VOLUME_ARMAZENADO_PERCENTUAL_INICIAL,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(
-                uow, "volume_inicial_percentual"
-            ),
-            (
-                Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(
-                uow, "volume_final_absoluto_hm3"
-            ),
-            (
-                Variable.VOLUME_ARMAZENADO_ABSOLUTO_INICIAL,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(
-                uow, "volume_inicial_absoluto_hm3"
-            ),
-            (
-                Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_pdo_hidr_sbm(
-                uow, "volume_final_absoluto_hm3"
-            ),
-            (
-                Variable.VOLUME_ARMAZENADO_ABSOLUTO_INICIAL,
-                SpatialResolution.SUBMERCADO,
-            ): lambda uow: cls._resolve_pdo_hidr_sbm(
-                uow, "volume_inicial_absoluto_hm3"
-            ),
-            (
-                Variable.VOLUME_ARMAZENADO_ABSOLUTO_FINAL,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_hidr_sin(
-                uow, "volume_final_absoluto_hm3"
-            ),
-            (
-                Variable.VOLUME_ARMAZENADO_ABSOLUTO_INICIAL,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_hidr_sin(
-                uow, "volume_inicial_absoluto_hm3"
-            ),
-            (
-                Variable.VALOR_AGUA,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(uow, "valor_agua"),
-            (
-                Variable.GERACAO_HIDRAULICA,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(uow, "geracao"),
-            (
-                Variable.VAZAO_TURBINADA,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(
-                uow, "vazao_turbinada_m3s"
-            ),
-            (
-                Variable.VAZAO_TURBINADA,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_hidr_sin(
-                uow, "vazao_turbinada_m3s"
-            ),
-            (
-                Variable.VAZAO_VERTIDA,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(uow, "vazao_vertida_m3s"),
-            (
-                Variable.VAZAO_VERTIDA,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_hidr_sin(uow, "vazao_vertida_m3s"),
-            (
-                Variable.VAZAO_INCREMENTAL,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(
-                uow, "vazao_incremental_m3s"
-            ),
-            (
-                Variable.VAZAO_AFLUENTE,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(uow, "vazao_afluente_m3s"),
-            (
-                Variable.VAZAO_DEFLUENTE,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_hidr_uhe(
-                uow, "vazao_defluente_m3s"
-            ),
-            (
-                Variable.VAZAO_DEFLUENTE,
-                SpatialResolution.SISTEMA_INTERLIGADO,
-            ): lambda uow: cls._resolve_pdo_hidr_sin(
-                uow, "vazao_defluente_m3s"
-            ),
-            (
-                Variable.VOLUME_CALHA,
-                SpatialResolution.USINA_HIDROELETRICA,
-            ): lambda uow: cls._resolve_pdo_oper_tviag_calha_uhe(
-                uow, "volume_calha_hm3"
-            ),
-            (
-                Variable.GERACAO_TERMICA,
-                SpatialResolution.USINA_TERMELETRICA,
-            ): lambda uow: cls._resolve_pdo_oper_term_ute(uow, "geracao"),
-            (
-                Variable.INTERCAMBIO,
-                SpatialResolution.PAR_SUBMERCADOS,
-            ): lambda uow: cls._resolve_pdo_inter_sbp(uow, "intercambio"),
-        }
-        return _rules[synthesis]
+    def _resolve(cls, s: OperationSynthesis) -> Callable:
+        """
+        Obtém o método de resolução de uma síntese a partir do registro
+        `SYNTHESIS_SOURCES`.
+        """
+        source = SYNTHESIS_SOURCES[s]
+        return partial(getattr(cls, source.resolver), col=source.column)
+
+    @classmethod
+    def _require_source_columns(cls, plan: SynthesisPlan):
+        """
+        Registra no Deck as colunas das tabelas necessárias às sínteses
+        planejadas, incluindo as utilizadas no cálculo dos limites, de
+        modo que as demais colunas não sejam convertidas nem mantidas
+        em cache. Apenas as tabelas com colunas de identificação
+        definidas no Deck são projetadas.
+        """
+        for table, columns in plan.columns.items():
+            if table in Deck.KEY_COLUMNS:
+                Deck.require_columns(table, columns)
 
     @classmethod
     def _post_resolve_file(
@@ -289,6 +130,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para obtenção dos dados do pdo_sist para SBM",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_sist",
         ):
             df = Deck.pdo_sist_sbm(col, uow)
             return cls._post_resolve_file(df)
@@ -300,6 +143,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para obtenção dos dados do pdo_sist para SIN",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_sist",
         ):
             df = Deck.pdo_sist_sin(col, uow)
             return cls._post_resolve_file(df)
@@ -311,6 +156,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para obtenção dos dados do pdo_hidr para UHE",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_hidr",
         ):
             df = Deck.pdo_hidr_hydro(col, uow)
             df = df.loc[(~df[VALUE_COL].isna())].reset_index(drop=True)
@@ -323,6 +170,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para obtenção dos dados do pdo_hidr para REE",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_hidr",
         ):
             df = Deck.pdo_hidr_eer(col, uow)
             return cls._post_resolve_file(df)
@@ -334,6 +183,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para obtenção dos dados do pdo_hidr para SBM",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_hidr",
         ):
             df = Deck.pdo_hidr_sbm(col, uow)
             return cls._post_resolve_file(df)
@@ -345,6 +196,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para obtenção dos dados do pdo_hidr para SIN",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_hidr",
         ):
             df = Deck.pdo_hidr_sin(col, uow)
             return cls._post_resolve_file(df)
@@ -356,6 +209,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para obtenção dos dados do pdo_eolica para SBM",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_eolica",
         ):
             df = Deck.pdo_eolica_sbm(col, uow)
             return cls._post_resolve_file(df)
@@ -367,6 +222,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para obtenção dos dados do pdo_eolica para SIN",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_eolica",
         ):
             df = Deck.pdo_eolica_sin(col, uow)
             return cls._post_resolve_file(df)
@@ -376,8 +233,11 @@ class OperationSynthetizer:
         cls, uow: AbstractUnitOfWork, col: str
     ) -> pd.DataFrame:
         with time_and_log(
-            message_root="Tempo para obtenção dos dados do pdo_oper_term para UTE",
+            message_root="Tempo para obtenção dos dados do "
+            + "pdo_oper_term para UTE",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_oper_term",
         ):
             df = Deck.pdo_oper_term_ute(col, uow)
             return cls._post_resolve_file(df)
@@ -387,8 +247,11 @@ class OperationSynthetizer:
         cls, uow: AbstractUnitOfWork, col: str
     ) -> pd.DataFrame:
         with time_and_log(
-            message_root="Tempo para obtenção dos dados do pdo_operacao para SIN",
+            message_root="Tempo para obtenção dos dados do "
+            + "pdo_operacao para SIN",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_operacao",
         ):
             df = Deck.pdo_operacao_costs(col, uow)
             return cls._post_resolve_file(df)
@@ -400,6 +263,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para obtenção dos dados do pdo_inter para SBP",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_inter",
         ):
             df = Deck.pdo_inter_sbp(col, uow)
             return cls._post_resolve_file(df)
@@ -409,8 +274,11 @@ class OperationSynthetizer:
         cls, uow: AbstractUnitOfWork, col: str
     ) -> pd.DataFrame:
         with time_and_log(
-            message_root="Tempo para obtenção dos dados do pdo_oper_tviag_calha para UHE",
+            message_root="Tempo para obtenção dos dados do "
+            + "pdo_oper_tviag_calha para UHE",
             logger=cls.logger,
+            span="obtencao",
+            arquivo="pdo_oper_tviag_calha",
         ):
             df = Deck.pdo_oper_tviag_calha_hydro(col, uow)
             return cls._post_resolve_file(df)
@@ -420,8 +288,7 @@ class OperationSynthetizer:
         cls, uow: AbstractUnitOfWork, col: str
     ) -> pd.DataFrame:
         df = cls._resolve_pdo_sist_sbm(uow, col)
-        thermals = Deck.thermals(uow)
-        submarkets = thermals[SUBMARKET_CODE_COL].unique().tolist()
+        submarkets = Deck.entities().map("thermal_submarket", uow).codes
         df = df.loc[df[SUBMARKET_CODE_COL].isin(submarkets)].reset_index(
             drop=True
         )
@@ -432,8 +299,7 @@ class OperationSynthetizer:
         cls, uow: AbstractUnitOfWork, col: str
     ) -> pd.DataFrame:
         df = cls._resolve_pdo_sist_sbm(uow, col)
-        hydros = Deck.hydro_eer_submarket_map(uow)
-        submarkets = hydros[SUBMARKET_CODE_COL].unique().tolist()
+        submarkets = Deck.entities().map("hydro_submarket", uow).codes
         df = df.loc[df[SUBMARKET_CODE_COL].isin(submarkets)].reset_index(
             drop=True
         )
@@ -609,6 +475,8 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para calculo dos limites",
             logger=cls.logger,
+            span="limites",
+            chave=str(s),
         ):
             df = OperationVariableBounds.resolve_bounds(
                 s,
@@ -633,7 +501,10 @@ class OperationSynthetizer:
         de todos os dados de uma síntese.
         """
         with time_and_log(
-            message_root="Tempo para compactacao dos dados", logger=cls.logger
+            message_root="Tempo para compactacao dos dados",
+            logger=cls.logger,
+            span="compactacao",
+            chave=str(s),
         ):
             spatial_resolution = s.spatial_resolution
 
@@ -668,7 +539,10 @@ class OperationSynthetizer:
         Realiza a resolução de uma síntese, opcionalmente adicionando
         limites superiores e inferiores aos valores de cada linha.
         """
-        df = cls._resolve((s.variable, s.spatial_resolution))(uow)
+        with Tracer.span("resolucao", chave=str(s)) as span:
+            df = cls._resolve(s)(uow)
+            if df is not None:
+                span.set(linhas=len(df))
         if df is not None:
             df = cls._post_resolve(df, s, uow)
             df = cls._resolve_bounds(s, df, uow)
@@ -703,7 +577,11 @@ class OperationSynthetizer:
                 s.variable.long_name,
                 s.spatial_resolution.value,
                 s.spatial_resolution.long_name,
-                UNITS[s].value if s in UNITS else "",
+                (
+                    SYNTHESIS_SOURCES[s].unit.value
+                    if s in SYNTHESIS_SOURCES
+                    else ""
+                ),
                 s in SYNTHESIS_DEPENDENCIES,
                 OperationVariableBounds.is_bounded(s),
             ]
@@ -739,20 +617,68 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para preparacao para exportacao",
             logger=cls.logger,
+            span="preparacao",
+            chave=filename,
         ):
-            df = df.sort_values(
-                s.spatial_resolution.sorting_synthesis_df_columns
-            ).reset_index(drop=True)
-            stats_df = calc_statistics(df)
+            with Tracer.span("ordenacao", chave=filename, linhas=len(df)):
+                df = df.sort_values(
+                    s.spatial_resolution.sorting_synthesis_df_columns
+                ).reset_index(drop=True)
+            with Tracer.span("estatisticas", chave=filename) as span:
+                stats_df = calc_statistics(df)
+                span.set(linhas=len(stats_df))
             cls._add_synthesis_stats(s, stats_df)
             cls.__store_in_cache_if_needed(s, df)
         with time_and_log(
-            message_root="Tempo para exportacao dos dados", logger=cls.logger
+            message_root="Tempo para exportacao dos dados",
+            logger=cls.logger,
+            span="exportacao",
+            chave=filename,
+            linhas=len(df),
         ):
             with uow:
                 df = df[s.spatial_resolution.all_synthesis_df_columns]
                 uow.export.synthetize_df(df, filename)
 
+    @classmethod
+    def _append_scenario_synthesis(
+        cls, s: OperationSynthesis, df: pd.DataFrame, uow: AbstractUnitOfWork
+    ):
+        """
+        Realiza a exportação dos dados de um cenário para uma síntese
+        da operação, adicionando-os à saída da síntese e acumulando
+        as estatísticas dos cenários.
+        """
+        filename = str(s)
+        with time_and_log(
+            message_root="Tempo para preparacao para exportacao",
+            logger=cls.logger,
+            span="preparacao",
+            chave=filename,
+        ):
+            with Tracer.span("ordenacao", chave=filename, linhas=len(df)):
+                df = df.sort_values(
+                    s.spatial_resolution.sorting_synthesis_df_columns
+                ).reset_index(drop=True)
+            with Tracer.span("estatisticas", chave=filename):
+                cls.SCENARIO_STATS.setdefault(s, IncrementalStatistics()).add(
+                    df
+                )
+            cls.__store_in_cache_if_needed(s, df)
+        with time_and_log(
+            message_root="Tempo para exportacao dos dados",
+            logger=cls.logger,
+            span="exportacao",
+            chave=filename,
+            linhas=len(df),
+        ):
+            with uow:
+                writer = cls.SCENARIO_WRITERS.get(s)
+                if writer is None:
+                    writer = uow.export.open_writer(filename)
+                    cls.SCENARIO_WRITERS[s] = writer
+                writer.write(df[s.spatial_resolution.all_synthesis_df_columns])
+
     @classmethod
     def _export_stats(
         cls,
@@ -806,16 +732,23 @@ class OperationSynthetizer:
 
     @classmethod
     def _synthetize_single_variable(
-        cls, s: OperationSynthesis, uow: AbstractUnitOfWork
+        cls,
+        s: OperationSynthesis,
+        uow: AbstractUnitOfWork,
+        export: Optional[Callable] = None,
     ) -> OperationSynthesis | None:
         """
         Realiza a síntese de operação para uma variável
         fornecida.
         """
+        if export is None:
+            export = cls._export_scenario_synthesis
         filename = str(s)
         with time_and_log(
             message_root=f"Tempo para sintese de {filename}",
             logger=cls.logger,
+            span="sintese",
+            chave=filename,
         ):
             try:
                 found_synthesis = False
@@ -829,7 +762,7 @@ class OperationSynthetizer:
                 if df is not None:
                     if not df.empty:
                         found_synthesis = True
-                        cls._export_scenario_synthesis(s, df, uow)
+                        export(s, df, uow)
                         return s
                 if not found_synthesis:
                     cls._log(
@@ -847,6 +780,47 @@ class OperationSynthetizer:
                 )
                 return None
 
+    @classmethod
+    def _synthetize_scenarios(
+        cls,
+        synthesis: list[OperationSynthesis],
+        files: ScenarioFilesRepository,
+        uow: AbstractUnitOfWork,
+    ) -> list[OperationSynthesis]:
+        """
+        Realiza a síntese de operação de um caso com múltiplos cenários,
+        processando um cenário por vez. Os dados de cada cenário são
+        escritos como uma parte da saída de cada síntese, e apenas os
+        arquivos compartilhados entre os cenários são mantidos em cache.
+        """
+        succeeded: set[OperationSynthesis] = set()
+        try:
+            for scenario_files in iterate_scenarios(files):
+                scenario = scenario_files.scenario
+                cls._log(f"Realizando sintese do cenario {scenario}")
+                Deck.set_scenario(scenario)
+                cls.CACHED_SYNTHESIS.clear()
+                uow.set_files(scenario_files)
+                with Tracer.span("cenario", cenario=scenario):
+                    for s in synthesis:
+                        r = cls._synthetize_single_variable(
+                            s, uow, cls._append_scenario_synthesis
+                        )
+                        if r:
+                            succeeded.add(r)
+        finally:
+            with uow:
+                for writer in cls.SCENARIO_WRITERS.values():
+                    writer.close()
+            cls.SCENARIO_WRITERS.clear()
+            cls.CACHED_SYNTHESIS.clear()
+            uow.set_files(files)
+            Deck.set_scenario(files.scenario)
+        for s, stats in cls.SCENARIO_STATS.items():
+            cls._add_synthesis_stats(s, stats.result())
+        cls.SCENARIO_STATS.clear()
+        return [s for s in synthesis if s in succeeded]
+
     @classmethod
     def synthetize(cls, variables: list[str], uow: AbstractUnitOfWork):
         cls.logger = logging.getLogger("main")
@@ -856,15 +830,32 @@ class OperationSynthetizer:
         with time_and_log(
             message_root="Tempo para sintese da operacao",
             logger=cls.logger,
+            span="familia",
+            familia="operacao",
         ):
             synthesis_with_dependencies = cls._preprocess_synthesis_variables(
                 variables, uow
             )
+            plan = SynthesisPlan.build(synthesis_with_dependencies)
+            with uow:
+                files = uow.files
+                files.prefetch(
+                    [r for r in plan.readers if r in cls.PREFETCHED_READERS]
+                )
+            cls._require_source_columns(plan)
             success_synthesis: list[OperationSynthesis] = []
-            for s in synthesis_with_dependencies:
-                r = cls._synthetize_single_variable(s, uow)
-                if r:
-                    success_synthesis.append(r)
+            try:
+                if isinstance(files, ScenarioFilesRepository):
+                    success_synthesis = cls._synthetize_scenarios(
+                        synthesis_with_dependencies, files, uow
+                    )
+                else:
+                    for s in synthesis_with_dependencies:
+                        r = cls._synthetize_single_variable(s, uow)
+                        if r:
+                            success_synthesis.append(r)
+            finally:
+                Deck.clear_required_columns()
 
             cls._export_stats(uow)
             cls._export_metadata(success_synthesis, uow)
@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
+
+from app.model.operation.operationsynthesis import (
+    SYNTHESIS_SOURCES,
+    OperationSynthesis,
+)
+
+# Arquivos lidos na construção de cada tabela do Deck. As tabelas
+# de dados dependem também do PDO_OPERACAO, de onde são obtidas as
+# datas de início e fim dos estágios.
+TABLE_READERS: Dict[str, List[str]] = {
+    "pdo_sist": ["get_pdo_sist", "get_pdo_operacao"],
+    "pdo_hidr": ["get_pdo_hidr", "get_pdo_operacao"],
+    "pdo_eolica": ["get_pdo_eolica", "get_pdo_operacao"],
+    "pdo_inter": ["get_pdo_inter", "get_pdo_operacao"],
+    "pdo_oper_term": ["get_pdo_oper_term", "get_pdo_operacao"],
+    "pdo_oper_tviag_calha": ["get_pdo_oper_tviag_calha", "get_pdo_operacao"],
+    "pdo_operacao": ["get_pdo_operacao"],
+    "thermal_generation_bounds": ["get_pdo_oper_uct"],
+    "hydro_generation_bounds": ["get_pdo_hidr"],
+    "hydro_turbined_flow_bounds": ["get_pdo_hidr"],
+    "hydro_outflow_bounds": ["get_pdo_hidr"],
+    "hydro_spilled_flow_bounds": ["get_pdo_hidr"],
+    "stored_volume_bounds": ["get_pdo_eco_usih"],
+}
+
+
+@dataclass
+class SynthesisPlan:
+    """
+    Plano de execução de um conjunto de sínteses da operação, obtido
+    a partir do registro `SYNTHESIS_SOURCES`:
+
+    - `synthesis`: sínteses registradas, na ordem solicitada.
+    - `readers`: métodos de leitura dos arquivos necessários.
+    - `columns`: colunas necessárias de cada tabela do Deck, incluindo
+      as colunas das quais os limites das variáveis são obtidos.
+    """
+
+    synthesis: List[OperationSynthesis] = field(default_factory=list)
+    readers: List[str] = field(default_factory=list)
+    columns: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def __add_readers(self, table: str):
+        for reader in TABLE_READERS.get(table, []):
+            if reader not in self.readers:
+                self.readers.append(reader)
+
+    def __add_synthesis(self, s: OperationSynthesis):
+        source = SYNTHESIS_SOURCES[s]
+        self.synthesis.append(s)
+        self.__add_readers(source.table)
+        self.columns.setdefault(source.table, set()).add(source.column)
+        if source.bounds is None:
+            return
+        for table in source.bounds.tables:
+            self.__add_readers(table)
+        for table, columns in source.bounds.columns.items():
+            self.columns.setdefault(table, set()).update(columns)
+
+    @classmethod
+    def build(cls, synthesis: List[OperationSynthesis]) -> "SynthesisPlan":
+        """
+        Constrói o plano das sínteses fornecidas, desconsiderando
+        as que não constam no registro.
+        """
+        plan = cls()
+        for s in synthesis:
+            if s in SYNTHESIS_SOURCES and s not in plan.synthesis:
+                plan.__add_synthesis(s)
+        return plan
@@ -26,6 +26,7 @@ from app.services.deck.deck import Deck
 from app.services.unitofwork import AbstractUnitOfWork
 from app.utils.regex import match_variables_with_wildcards
 from app.utils.timing import time_and_log
+from app.utils.tracing import Tracer
 
 
 class SystemSynthetizer:
@@ -194,14 +195,20 @@ class SystemSynthetizer:
         with time_and_log(
             message_root=f"Tempo para sintese de {filename}",
             logger=cls.logger,
+            span="sintese",
+            chave=filename,
         ):
             try:
                 cls._log(f"Realizando síntese de {filename}")
-                df = cls._resolve(s, uow)
+                with Tracer.span("resolucao", chave=filename) as span:
+                    df = cls._resolve(s, uow)
+                    if df is not None:
+                        span.set(linhas=len(df))
                 if df is not None:
-                    with uow:
-                        uow.export.synthetize_df(df, filename)
-                        return s
+                    with Tracer.span("exportacao", chave=filename):
+                        with uow:
+                            uow.export.synthetize_df(df, filename)
+                    return s
                 return None
             except Exception as e:
                 print_exc()
@@ -214,7 +221,10 @@ class SystemSynthetizer:
         uow.subdir = SYSTEM_SYNTHESIS_SUBDIR
 
         with time_and_log(
-            message_root="Tempo para sintese do sistema", logger=cls.logger
+            message_root="Tempo para sintese do sistema",
+            logger=cls.logger,
+            span="familia",
+            familia="sistema",
         ):
             synthesis_variables = cls._preprocess_synthesis_variables(
                 variables, uow
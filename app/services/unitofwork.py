@@ -1,19 +1,74 @@
+import threading
 from abc import ABC, abstractmethod
 from os import chdir, curdir
 from pathlib import Path
-from typing import Dict, Type
+from typing import Dict, Optional, Type
 
 from app.adapters.repository.export import (
     AbstractExportRepository,
+    MemoryExportRepository,
 )
 from app.adapters.repository.export import (
     factory as export_factory,
 )
 from app.adapters.repository.files import (
     AbstractFilesRepository,
-    RawFilesRepository,
+    case_repository,
 )
 from app.model.settings import Settings
+from app.utils.compression import archive_workdir, is_archive
+
+
+def _workdir(path: Path) -> Path:
+    """
+    Diretório de trabalho de um caso. Casos em arquivos compactados
+    são lidos sem extração, com as sínteses escritas em um diretório
+    com o nome do arquivo, criado ao lado deste.
+    """
+    if not is_archive(path):
+        return path
+    workdir = archive_workdir(path)
+    workdir.mkdir(parents=True, exist_ok=True)
+    return workdir
+
+
+class _WorkingDirectory:
+    """
+    Diretório de trabalho do processo, compartilhado pelas unidades de
+    trabalho em uso simultâneo (ex. em sínteses concorrentes). A troca
+    de diretório é feita apenas na entrada da primeira unidade, e o
+    diretório anterior a esta é restaurado apenas na saída da última.
+    Como o diretório de trabalho é do processo, as unidades em uso
+    simultâneo devem ser todas do mesmo diretório.
+    """
+
+    _lock = threading.Lock()
+    _depth = 0
+    _path: Optional[Path] = None
+    _previous: Optional[Path] = None
+
+    @classmethod
+    def enter(cls, path: Path):
+        with cls._lock:
+            if cls._depth == 0:
+                cls._previous = Path(curdir).resolve()
+                chdir(path)
+                cls._path = path
+            elif path != cls._path:
+                raise RuntimeError(
+                    f"Diretório de trabalho {path} diferente do diretório"
+                    + f" em uso {cls._path}"
+                )
+            cls._depth += 1
+
+    @classmethod
+    def exit(cls):
+        with cls._lock:
+            cls._depth = max(cls._depth - 1, 0)
+            if cls._depth == 0 and cls._previous is not None:
+                chdir(cls._previous)
+                cls._path = None
+                cls._previous = None
 
 
 class AbstractUnitOfWork(ABC):
@@ -40,6 +95,24 @@ class AbstractUnitOfWork(ABC):
     def export(self) -> AbstractExportRepository:
         raise NotImplementedError
 
+    @abstractmethod
+    def set_files(self, files: AbstractFilesRepository):
+        """
+        Substitui o repositório de arquivos, permitindo a leitura
+        dos arquivos de outro cenário do caso.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def fork(self) -> "AbstractUnitOfWork":
+        """
+        Cria uma unidade de trabalho para o mesmo caso, que compartilha
+        o repositório de arquivos (e os arquivos já lidos), mas com o
+        seu próprio subdiretório de saída, permitindo a execução
+        concorrente de famílias de síntese.
+        """
+        raise NotImplementedError
+
     @property
     def subdir(self) -> str:
         return self._subdir
@@ -52,30 +125,36 @@ class AbstractUnitOfWork(ABC):
 class FSUnitOfWork(AbstractUnitOfWork):
     def __init__(self, directory: str):
         super().__init__()
-        self._current_path = Path(curdir).resolve()
         self._path = Path(directory).resolve()
-        self._files = None
-        self._exporter = None
+        self._workdir = _workdir(self._path)
+        self._files: Optional[AbstractFilesRepository] = None
+        # Um exportador por subdiretório de saída, construído na
+        # primeira entrada na unidade de trabalho com o subdiretório
+        self._exporters: Dict[str, AbstractExportRepository] = {}
 
     def __create_repository(self):
         if self._files is None:
-            self._files = RawFilesRepository(str(self._path))
-        if self._exporter is None:
-            synthesis_outdir = self._path.joinpath(
+            self._files = case_repository(str(self._path))
+        if self._subdir not in self._exporters:
+            synthesis_outdir = self._workdir.joinpath(
                 Settings().synthesis_dir
             ).joinpath(self._subdir)
             synthesis_outdir.mkdir(parents=True, exist_ok=True)
-            self._exporter = export_factory(
+            self._exporters[self._subdir] = export_factory(
                 Settings().synthesis_format, str(synthesis_outdir)
             )
 
     def __enter__(self) -> "AbstractUnitOfWork":
-        chdir(self._path)
-        self.__create_repository()
+        _WorkingDirectory.enter(self._workdir)
+        try:
+            self.__create_repository()
+        except Exception:
+            _WorkingDirectory.exit()
+            raise
         return super().__enter__()
 
     def __exit__(self, *args):
-        chdir(self._current_path)
+        _WorkingDirectory.exit()
         super().__exit__(*args)
 
     @property
@@ -86,10 +165,78 @@ class FSUnitOfWork(AbstractUnitOfWork):
 
     @property
     def export(self) -> AbstractExportRepository:
-        if self._exporter is None:
+        exporter = self._exporters.get(self._subdir)
+        if exporter is None:
             raise RuntimeError()
+        return exporter
+
+    def set_files(self, files: AbstractFilesRepository):
+        self._files = files
+
+    def fork(self) -> "FSUnitOfWork":
+        if self._files is None:
+            self._files = case_repository(str(self._path))
+        uow = FSUnitOfWork(str(self._path))
+        uow._files = self._files
+        return uow
+
+    def rollback(self):
+        pass
+
+
+class MemoryUnitOfWork(AbstractUnitOfWork):
+    """
+    Unidade de trabalho que lê os arquivos de um caso do DESSEM
+    no sistema de arquivos e mantém as sínteses produzidas em memória.
+    """
+
+    def __init__(
+        self, directory: str, files: AbstractFilesRepository | None = None
+    ):
+        super().__init__()
+        self._path = Path(directory).resolve()
+        # Casos em arquivos compactados são lidos sem criar diretórios
+        self._workdir = (
+            self._path.parent if is_archive(self._path) else self._path
+        )
+        self._files = files
+        self._exporter = MemoryExportRepository(str(self._workdir))
+
+    def __enter__(self) -> "AbstractUnitOfWork":
+        _WorkingDirectory.enter(self._workdir)
+        if self._files is None:
+            try:
+                self._files = case_repository(str(self._path))
+            except Exception:
+                _WorkingDirectory.exit()
+                raise
+        return super().__enter__()
+
+    def __exit__(self, *args):
+        _WorkingDirectory.exit()
+        super().__exit__(*args)
+
+    @property
+    def files(self) -> AbstractFilesRepository:
+        if self._files is None:
+            raise RuntimeError()
+        return self._files
+
+    @property
+    def export(self) -> MemoryExportRepository:
         return self._exporter
 
+    def set_files(self, files: AbstractFilesRepository):
+        self._files = files
+
+    def fork(self) -> "MemoryUnitOfWork":
+        if self._files is None:
+            self._files = case_repository(str(self._path))
+        uow = MemoryUnitOfWork(str(self._path), self._files)
+        # As sínteses são mantidas em um único repositório em memória
+        uow._exporter = self._exporter
+        return uow
+
     def rollback(self):
         pass
 
@@ -97,5 +244,6 @@ class FSUnitOfWork(AbstractUnitOfWork):
 def factory(kind: str, *args, **kwargs) -> AbstractUnitOfWork:
     mappings: Dict[str, Type[AbstractUnitOfWork]] = {
         "FS": FSUnitOfWork,
+        "MEMORY": MemoryUnitOfWork,
     }
     return mappings.get(kind, FSUnitOfWork)(*args, **kwargs)
@@ -0,0 +1,99 @@
+import gzip
+import io
+from pathlib import Path
+from typing import IO, Optional, cast
+
+# Extensões de arquivos compactados individualmente
+COMPRESSED_SUFFIXES = [".gz", ".zst"]
+
+# Extensões dos arquivos que contêm um caso completo
+ARCHIVE_SUFFIXES = [
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.zst",
+    ".tzst",
+]
+
+
+def open_zstd(fileobj: IO[bytes]) -> IO[bytes]:
+    """
+    Abre um fluxo de descompressão zstd sobre um arquivo binário,
+    utilizando o módulo `compression.zstd` (Python >= 3.14) ou,
+    na ausência deste, o pacote opcional `zstandard`.
+    """
+    try:
+        from compression import zstd  # type: ignore
+
+        return zstd.ZstdFile(fileobj)
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore
+    except ImportError:
+        raise RuntimeError(
+            "A leitura de arquivos .zst requer o pacote zstandard"
+            + " (pip install sintetizador-dessem[zstd])"
+        )
+    # O fluxo do zstandard não permite a leitura por linhas
+    return io.BufferedReader(
+        zstandard.ZstdDecompressor().stream_reader(fileobj)
+    )
+
+
+def decompressing_reader(
+    fileobj: IO[bytes], compression: Optional[str]
+) -> IO[bytes]:
+    """
+    Envolve um arquivo binário em um fluxo de descompressão
+    conforme a extensão de compressão (`.gz` ou `.zst`).
+    """
+    if compression is None:
+        return fileobj
+    if compression == ".gz":
+        return cast(IO[bytes], gzip.GzipFile(fileobj=fileobj, mode="rb"))
+    if compression == ".zst":
+        return open_zstd(fileobj)
+    raise ValueError(f"Compressão {compression} não suportada")
+
+
+def compression_suffix(name: str) -> Optional[str]:
+    """
+    Obtém a extensão de compressão de um arquivo compactado
+    individualmente (ex. `PDO_OPER_TERM.DAT.zst`).
+    """
+    lower = name.lower()
+    for suffix in COMPRESSED_SUFFIXES:
+        if lower.endswith(suffix):
+            return suffix
+    return None
+
+
+def archive_suffix(path: str | Path) -> Optional[str]:
+    """
+    Obtém a extensão de um arquivo que contém um caso completo
+    (ex. `.tar.zst`), ou `None` caso não seja um destes arquivos.
+    """
+    lower = Path(path).name.lower()
+    for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True):
+        if lower.endswith(suffix):
+            return suffix
+    return None
+
+
+def is_archive(path: str | Path) -> bool:
+    return archive_suffix(path) is not None and Path(path).is_file()
+
+
+def archive_workdir(path: str | Path) -> Path:
+    """
+    Diretório de trabalho de um caso lido de um arquivo compactado,
+    com o nome do arquivo sem a extensão, ao lado deste
+    (ex. `historico/caso.zip` -> `historico/caso`).
+    """
+    path = Path(path)
+    suffix = archive_suffix(path)
+    if suffix is None:
+        return path
+    return path.parent.joinpath(path.name[: -len(suffix)])
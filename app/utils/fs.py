@@ -1,5 +1,7 @@
+import hashlib
 import os
 from pathlib import Path
+from typing import Iterable
 
 
 class set_directory:
@@ -19,14 +21,33 @@ class set_directory:
         os.chdir(self.origin)
 
 
-def find_file_case_insensitive(path: str, candidate_filename: str) -> str:
+def files_fingerprint(files: Iterable[tuple[str, int, int]]) -> str:
     """
-    Finds a file in a directory, case insensitive. Returns the full path.
+    Computes a signature of a set of files from their names, sizes
+    and modification times.
     """
-    upper_filename = candidate_filename.upper()
-    lower_filename = candidate_filename.lower()
-    for try_filename in [candidate_filename, upper_filename, lower_filename]:
-        fullpath = Path(path).joinpath(try_filename)
-        if fullpath.exists():
-            return str(fullpath)
-    raise FileNotFoundError(f"File {candidate_filename} not found in {path}")
+    h = hashlib.blake2b(digest_size=16)
+    for name, size, mtime_ns in sorted(files):
+        h.update(f"{name}:{size}:{mtime_ns};".encode())
+    return h.hexdigest()
+
+
+def case_fingerprint(path: str | Path) -> str:
+    """
+    Computes a signature of the files in a directory from their
+    names, sizes and modification times. Subdirectories are ignored.
+    When the path is a file (e.g. a compressed case), the signature
+    is computed from the file itself.
+    """
+    if os.path.isfile(path):
+        st = os.stat(path)
+        return files_fingerprint(
+            [(Path(path).name, st.st_size, st.st_mtime_ns)]
+        )
+    files: list[tuple[str, int, int]] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                st = entry.stat()
+                files.append((entry.name, st.st_size, st.st_mtime_ns))
+    return files_fingerprint(files)
@@ -0,0 +1,179 @@
+import os
+import sys
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any, Optional
+
+from app.utils.tracing import Span
+
+MB = 1024 * 1024
+
+
+def current_rss() -> Optional[int]:
+    """
+    Obtém a memória residente atual do processo, em bytes. Disponível
+    apenas em sistemas com `/proc` (Linux).
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Obtém o pico de memória residente do processo, em bytes.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # No Linux o valor é fornecido em KB e no macOS em bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Estima o tamanho em bytes de um objeto e de todos os objetos
+    alcançáveis a partir dele, contando cada objeto uma única vez.
+    DataFrames do pandas, arrays do numpy e tabelas do Arrow são
+    medidos pelos seus próprios buffers.
+    """
+    seen: set[int] = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        if isinstance(o, type):
+            continue
+        memory_usage = getattr(o, "memory_usage", None)
+        if callable(memory_usage):
+            usage = memory_usage(deep=True)
+            size += int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+            continue
+        nbytes = getattr(o, "nbytes", None)
+        if isinstance(nbytes, int):
+            size += nbytes
+            continue
+        size += sys.getsizeof(o)
+        if isinstance(o, (str, bytes, bytearray, int, float, bool)):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        if hasattr(o, "__dict__"):
+            stack.append(vars(o))
+        for slot in _slot_attributes(o.__class__):
+            if hasattr(o, slot):
+                stack.append(getattr(o, slot))
+    return size
+
+
+@cache
+def _slot_attributes(cls: type) -> tuple[str, ...]:
+    attributes: list[str] = []
+    for c in cls.__mro__:
+        slots = c.__dict__.get("__slots__", ())
+        for slot in [slots] if isinstance(slots, str) else slots:
+            # Atributos privados em __slots__ têm os nomes modificados
+            if slot.startswith("__") and not slot.endswith("__"):
+                slot = f"_{c.__name__.lstrip('_')}{slot}"
+            attributes.append(slot)
+    return tuple(attributes)
+
+
+@dataclass
+class MemoryRecord:
+    stage: str
+    target: str
+    allocated: int
+    peak: int
+    rss_delta: Optional[int]
+    rss: Optional[int]
+
+
+@dataclass
+class _OpenSpan:
+    start: int
+    peak: int
+    rss: Optional[int]
+
+
+@dataclass
+class MemoryProfiler:
+    """
+    Ouvinte de intervalos que mede, através do `tracemalloc` e da
+    memória residente do processo, a memória alocada em cada construção
+    de tabela do `Deck` e em cada síntese.
+
+    O pico de cada intervalo inclui os picos dos intervalos aninhados.
+    As medições assumem que as etapas são executadas em uma única thread,
+    e os intervalos de outras threads (ex. leitura antecipada de
+    cenários) são desconsiderados.
+    """
+
+    STAGES = {
+        "deck": "tabela",
+        "leitura": "arquivo",
+        "sintese": "chave",
+        "familia": "familia",
+    }
+
+    records: list[MemoryRecord] = field(default_factory=list)
+    _stack: list[_OpenSpan] = field(default_factory=list)
+
+    def _tracked(self, span: Span) -> bool:
+        if span.name not in self.STAGES:
+            return False
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        return not span.attributes.get("cache", False)
+
+    def on_start(self, span: Span):
+        if not self._tracked(span):
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1].peak = max(self._stack[-1].peak, peak)
+        tracemalloc.reset_peak()
+        self._stack.append(_OpenSpan(current, current, current_rss()))
+
+    def on_end(self, span: Span):
+        if not self._tracked(span) or not self._stack:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        opened = self._stack.pop()
+        opened.peak = max(opened.peak, peak)
+        if self._stack:
+            self._stack[-1].peak = max(self._stack[-1].peak, opened.peak)
+        tracemalloc.reset_peak()
+        rss = current_rss()
+        self.records.append(
+            MemoryRecord(
+                stage=span.name,
+                target=str(span.attributes.get(self.STAGES[span.name], "")),
+                allocated=current - opened.start,
+                peak=opened.peak - opened.start,
+                rss_delta=(
+                    rss - opened.rss
+                    if rss is not None and opened.rss is not None
+                    else None
+                ),
+                rss=rss,
+            )
+        )
+
+    def top(self, n: int = 10) -> list[MemoryRecord]:
+        """
+        Obtém as etapas com os maiores picos de memória alocada.
+        """
+        return sorted(self.records, key=lambda r: r.peak, reverse=True)[:n]
@@ -1,11 +1,88 @@
+import warnings
+
+import numpy as np
 import pandas as pd  # type: ignore
-from typing import Callable, Dict
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+from typing import Any, Callable, Dict
 from app.internal.constants import (
+    ORDERING_TMP_COL,
     PROBABILITY_COL,
     SCENARIO_COL,
     VALUE_COL,
     PANDAS_GROUPING_ENGINE,
+    QUANTILES_FOR_STATISTICS,
 )
+from app.model.settings import Settings
+
+# Núcleo opcional de agrupamento, restrito à agregação dos DataFrames
+ARROW_GROUPING_KERNEL = "ARROW"
+
+ARROW_AGGREGATIONS: Dict[str, tuple[str, Any]] = {
+    "mean": ("mean", None),
+    "std": ("stddev", pc.VarianceOptions(ddof=1)),
+    "sum": ("sum", pc.ScalarAggregateOptions(min_count=0)),
+    "min": ("min", None),
+    "max": ("max", None),
+}
+
+
+def numeric_columns(df: pd.DataFrame, exclude: list) -> list:
+    """
+    Obtém as colunas numéricas de um DataFrame, na ordem em que aparecem,
+    desconsiderando as colunas fornecidas. Equivale à seleção feita
+    pelo pandas com `numeric_only=True`.
+    """
+    return [
+        c
+        for c in df.columns
+        if c not in exclude and pd.api.types.is_numeric_dtype(df[c])
+    ]
+
+
+def _arrow_group_df(
+    df: pd.DataFrame,
+    grouping_columns: list,
+    extract_columns: list,
+    operation: str,
+    sort: bool,
+) -> pd.DataFrame:
+    """
+    Agrupa um DataFrame utilizando o motor de agregação multithread do
+    Arrow. Apenas a agregação é feita pelo Arrow: o DataFrame é
+    convertido para uma tabela do Arrow e o resultado de volta para o
+    pandas a cada chamada. A agregação reproduz a semântica do `groupby`
+    do pandas: linhas com chaves nulas são descartadas, valores nulos
+    são ignorados e a ordem dos grupos é a de primeira aparição (ou
+    ordenada, se `sort`).
+    """
+    function, options = ARROW_AGGREGATIONS[operation]
+    valid_keys = df[grouping_columns].notna().all(axis=1)
+    if not valid_keys.all():
+        df = df.loc[valid_keys]
+    table = pa.Table.from_pandas(
+        df[grouping_columns + extract_columns], preserve_index=False
+    )
+    aggregations = [(c, function, options) for c in extract_columns]
+    if sort:
+        sort_keys = [(c, "ascending") for c in grouping_columns]
+    else:
+        # A ordem de primeira aparição é obtida pela menor posição das
+        # linhas de cada grupo, agregada apenas quando necessária
+        table = table.append_column(
+            ORDERING_TMP_COL, pa.array(np.arange(table.num_rows))
+        )
+        aggregations.append((ORDERING_TMP_COL, "min", None))
+        sort_keys = [(f"{ORDERING_TMP_COL}_min", "ascending")]
+    grouped = table.group_by(grouping_columns, use_threads=True).aggregate(
+        aggregations
+    )
+    grouped = grouped.sort_by(sort_keys)
+    grouped = grouped.select(
+        grouping_columns + [f"{c}_{function}" for c in extract_columns]
+    ).rename_columns(grouping_columns + extract_columns)
+    grouped_df = grouped.to_pandas()
+    return grouped_df.astype({c: df[c].dtype for c in grouping_columns})
 
 
 def fast_group_df(
@@ -14,17 +91,31 @@ def fast_group_df(
     extract_columns: list,
     operation: str,
     reset_index: bool = True,
+    sort: bool = False,
 ) -> pd.DataFrame:
     """
     Agrupa um DataFrame aplicando uma operação, tentando utilizar a engine mais
-    adequada para o agrupamento.
+    adequada para o agrupamento. Caso o núcleo `ARROW` esteja configurado
+    (variável de ambiente `KERNEL_AGRUPAMENTO`), somente a agregação é feita
+    pelo Arrow, sendo o DataFrame convertido na entrada e o resultado
+    convertido de volta para o pandas.
     """
-    grouped_df = df.groupby(grouping_columns, sort=False)[extract_columns]
+    if Settings().grouping_kernel == ARROW_GROUPING_KERNEL:
+        grouped_df = _arrow_group_df(
+            df, grouping_columns, extract_columns, operation, sort
+        )
+        if not reset_index:
+            grouped_df = grouped_df.set_index(grouping_columns)
+        return grouped_df
+
+    grouped_df = df.groupby(grouping_columns, sort=sort)[extract_columns]
 
     operation_map: Dict[str, Callable[..., pd.DataFrame]] = {
         "mean": grouped_df.mean,
         "std": grouped_df.std,
         "sum": grouped_df.sum,
+        "min": grouped_df.min,
+        "max": grouped_df.max,
     }
 
     try:
@@ -37,29 +128,359 @@ def fast_group_df(
     return grouped_df
 
 
-def _calc_mean(df: pd.DataFrame) -> pd.DataFrame:
+STATISTICS_VALUE_COLUMNS = [VALUE_COL, PROBABILITY_COL]
+
+
+def quantile_name(q: float) -> str:
     """
-    Realiza o pós-processamento para calcular o valor médio e o desvio
-    padrão de uma variável operativa dentre todos os estágios e patamares,
-    agrupando de acordo com as demais colunas.
+    Obtém o nome de um quantil na coluna `cenario` das estatísticas.
     """
+    if q == 0:
+        return "min"
+    elif q == 1:
+        return "max"
+    elif q == 0.5:
+        return "median"
+    return f"p{round(100 * q)}"
+
 
-    value_columns = [SCENARIO_COL, VALUE_COL, PROBABILITY_COL]
+def _statistics_columns(df: pd.DataFrame) -> tuple[list[str], list[str]]:
+    value_columns = [SCENARIO_COL] + STATISTICS_VALUE_COLUMNS
     grouping_columns = [c for c in df.columns if c not in value_columns]
+    extract_columns = [c for c in df.columns if c in STATISTICS_VALUE_COLUMNS]
+    return grouping_columns, extract_columns
 
+
+def _calc_quantiles(df: pd.DataFrame, quantiles: list[float]) -> pd.DataFrame:
+    """
+    Realiza o pós-processamento para calcular os quantis de uma variável
+    operativa dentre todos os cenários, para cada estágio e patamar,
+    agrupando de acordo com as demais colunas.
+    """
+    grouping_columns, extract_columns = _statistics_columns(df)
+    df_q = df.groupby(grouping_columns, sort=False)[extract_columns].quantile(
+        quantiles
+    )
+    df_q.index.names = grouping_columns + [SCENARIO_COL]
+    df_q = df_q.reset_index()
+    order = {q: i for i, q in enumerate(quantiles)}
+    df_q = df_q.sort_values(
+        SCENARIO_COL, key=lambda c: c.map(order), kind="stable"
+    ).reset_index(drop=True)
+    df_q[SCENARIO_COL] = df_q[SCENARIO_COL].map(quantile_name)
+    return df_q[[c for c in df.columns if c in df_q.columns]]
+
+
+def _calc_mean(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Realiza o pós-processamento para calcular o valor médio de uma
+    variável operativa dentre todos os cenários, para cada estágio
+    e patamar, agrupando de acordo com as demais colunas.
+    """
+    grouping_columns, _ = _statistics_columns(df)
     df_mean = df.groupby(grouping_columns, sort=False).mean().reset_index()
     df_mean[SCENARIO_COL] = "mean"
-
-    df_mean = df_mean.rename(columns={0: VALUE_COL})
     return df_mean
 
 
+def _calc_std(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Realiza o pós-processamento para calcular o desvio padrão de uma
+    variável operativa dentre todos os cenários, para cada estágio
+    e patamar, agrupando de acordo com as demais colunas.
+    """
+    grouping_columns, _ = _statistics_columns(df)
+    df_std = df.groupby(grouping_columns, sort=False).std().reset_index()
+    df_std[SCENARIO_COL] = "std"
+    return df_std
+
+
 def calc_statistics(df: pd.DataFrame) -> pd.DataFrame:
     """
     Realiza o pós-processamento de um DataFrame com dados da
     síntese da operação de uma determinada variável, calculando
-    estatísticas como quantis e média para cada variável, em cada
-    estágio e patamar.
+    a média para cada variável, em cada estágio e patamar.
     """
     df_m = _calc_mean(df)
     return df_m
+
+
+def calc_scenario_statistics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Realiza o pós-processamento de um DataFrame com dados da
+    síntese da operação de uma determinada variável em múltiplos
+    cenários, calculando estatísticas como quantis, média e desvio
+    padrão para cada variável, em cada estágio e patamar.
+    """
+    df_q = _calc_quantiles(df, QUANTILES_FOR_STATISTICS)
+    df_m = _calc_mean(df)
+    df_s = _calc_std(df)
+    return pd.concat([df_q, df_m, df_s], ignore_index=True)
+
+
+class QuantileSketch:
+    """
+    Sketch de quantis que pode ser combinado com outros sketches,
+    mantido simultaneamente para vários grupos. Os valores de cada
+    grupo são guardados em níveis, nos quais cada item tem peso
+    `2 ** nivel`. Quando um nível excede a capacidade `k = 1 / erro`,
+    os seus itens são ordenados e metade deles é promovida ao nível
+    seguinte, alternando entre os itens de posição par e ímpar.
+
+    Os quantis são exatos enquanto nenhum nível é compactado, ou seja,
+    enquanto cada grupo tem no máximo `k` valores. Após isso, o erro
+    no posto normalizado é da ordem de `erro * log2(n / k)` para
+    `n` valores, com memória proporcional a `k * log2(n / k)`.
+
+    :param erro: Erro aproximado no posto normalizado dos quantis
+    """
+
+    def __init__(self, erro: float = 0.01):
+        if not 0 < erro < 1:
+            raise ValueError(f"Erro do sketch de quantis inválido: {erro}")
+        self.capacity = max(8, 2 * int(np.ceil(0.5 / erro)))
+        self.levels: list[np.ndarray] = []
+        self._offsets: list[int] = []
+        self.groups = 0
+
+    def resize(self, groups: int):
+        """
+        Aumenta o número de grupos do sketch, sem valores nos novos grupos.
+        """
+        if groups <= self.groups:
+            return
+        self.levels = [
+            np.pad(
+                level,
+                ((0, groups - self.groups), (0, 0)),
+                constant_values=np.nan,
+            )
+            for level in self.levels
+        ]
+        self.groups = groups
+
+    def add(self, values: np.ndarray):
+        """
+        Adiciona valores ao sketch, sendo cada linha da matriz `values`
+        os valores de um grupo. Valores nulos são desconsiderados.
+        """
+        self.resize(values.shape[0])
+        self._extend(0, values.astype(np.float64, copy=False))
+        self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+        """
+        Combina os valores de outro sketch, com os mesmos grupos, a este.
+        """
+        self.resize(other.groups)
+        other.resize(self.groups)
+        for level, values in enumerate(other.levels):
+            self._extend(level, values)
+        self._compress()
+
+    def _extend(self, level: int, values: np.ndarray):
+        if level == len(self.levels):
+            self.levels.append(np.empty((self.groups, 0)))
+            self._offsets.append(0)
+        self.levels[level] = np.concatenate(
+            [self.levels[level], values], axis=1
+        )
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.shape[1] > self.capacity:
+                pairs = items.shape[1] // 2
+                compacted = np.sort(items[:, : 2 * pairs], axis=1)
+                offset = self._offsets[level]
+                self._offsets[level] = 1 - offset
+                self.levels[level] = items[:, 2 * pairs :]
+                self._extend(level + 1, compacted[:, offset::2])
+            level += 1
+
+    @property
+    def exact(self) -> bool:
+        return len(self.levels) <= 1
+
+    def quantiles(self, quantiles: list[float]) -> np.ndarray:
+        """
+        Obtém os quantis de cada grupo, com uma coluna por quantil.
+        """
+        if self.groups == 0 or not self.levels:
+            return np.full((self.groups, len(quantiles)), np.nan)
+        if self.exact:
+            values = self.levels[0]
+            if values.shape[1] == 0:
+                return np.full((self.groups, len(quantiles)), np.nan)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                return np.nanquantile(values, quantiles, axis=1).T
+        values = np.concatenate(self.levels, axis=1)
+        weights = np.concatenate(
+            [
+                np.full(level.shape, 2.0**i)
+                for i, level in enumerate(self.levels)
+            ],
+            axis=1,
+        )
+        weights[np.isnan(values)] = 0.0
+        order = np.argsort(values, axis=1)
+        values = np.take_along_axis(values, order, axis=1)
+        cumulative = np.cumsum(np.take_along_axis(weights, order, axis=1), 1)
+        total = cumulative[:, -1:]
+        result = np.empty((self.groups, len(quantiles)))
+        for i, q in enumerate(quantiles):
+            position = np.argmax(cumulative >= np.maximum(q * total, 1), 1)
+            result[:, i] = values[np.arange(self.groups), position]
+        result[total[:, 0] == 0] = np.nan
+        return result
+
+
+class IncrementalStatistics:
+    """
+    Acumula as estatísticas de uma variável operativa à medida que
+    os cenários são processados, sem manter os cenários em memória.
+    Para cada grupo (entidade, estágio, patamar, etc.) são mantidos
+    a média e a variância pelo método de Welford, combinadas entre
+    lotes pela fórmula de Chan, os valores mínimo e máximo e um
+    sketch de quantis (`QuantileSketch`).
+
+    O resultado contém as mesmas estatísticas de
+    `calc_scenario_statistics`, sendo idêntico a ela enquanto os
+    quantis são exatos.
+
+    :param erro: Erro aproximado no posto dos quantis. Por padrão,
+        é utilizado o valor da variável de ambiente `ERRO_QUANTIS`.
+    """
+
+    def __init__(self, erro: float | None = None):
+        self.erro = Settings().quantile_error if erro is None else erro
+        self._index: pd.Index | None = None
+        self._grouping_columns: list[str] = []
+        self._extract_columns: list[str] = []
+        self._columns: list[str] = []
+        self._count = np.empty((0, 0))
+        self._mean = np.empty((0, 0))
+        self._m2 = np.empty((0, 0))
+        self._min = np.empty((0, 0))
+        self._max = np.empty((0, 0))
+        self._sketches: list[QuantileSketch] = []
+
+    def _register(self, index: pd.Index) -> np.ndarray:
+        """
+        Obtém as posições dos grupos de um lote nas estatísticas
+        acumuladas, incluindo os grupos ainda não conhecidos.
+        """
+        if self._index is None:
+            self._index = index
+            positions = np.arange(len(index))
+        else:
+            positions = self._index.get_indexer(index)
+            new = positions == -1
+            if new.any():
+                positions[new] = np.arange(new.sum()) + len(self._index)
+                self._index = self._index.append(index[new])
+        groups = len(self._index)
+        pad = ((0, groups - self._count.shape[0]), (0, 0))
+        self._count = np.pad(self._count, pad)
+        self._mean = np.pad(self._mean, pad)
+        self._m2 = np.pad(self._m2, pad)
+        self._min = np.pad(self._min, pad, constant_values=np.nan)
+        self._max = np.pad(self._max, pad, constant_values=np.nan)
+        return positions
+
+    def add(self, df: pd.DataFrame):
+        """
+        Adiciona os dados de um ou mais cenários às estatísticas.
+        """
+        grouping_columns, extract_columns = _statistics_columns(df)
+        if self._index is None:
+            self._grouping_columns = grouping_columns
+            self._extract_columns = extract_columns
+            self._columns = [c for c in df.columns]
+            self._count = np.empty((0, len(extract_columns)))
+            self._mean = self._count.copy()
+            self._m2 = self._count.copy()
+            self._min = self._count.copy()
+            self._max = self._count.copy()
+            self._sketches = [
+                QuantileSketch(self.erro) for _ in extract_columns
+            ]
+        grouped = df.groupby(self._grouping_columns, sort=False)[
+            self._extract_columns
+        ]
+        count = grouped.count()
+        positions = self._register(count.index)
+        n_b = count.to_numpy(dtype=np.float64)
+        mean_b = grouped.mean().to_numpy(dtype=np.float64)
+        m2_b = grouped.var(ddof=0).to_numpy(dtype=np.float64) * n_b
+        n_a = self._count[positions]
+        mean_a = self._mean[positions]
+        n = n_a + n_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = np.nan_to_num(mean_b) - mean_a
+            self._mean[positions] = np.where(
+                n > 0, mean_a + delta * n_b / n, 0.0
+            )
+            self._m2[positions] = np.where(
+                n > 0,
+                self._m2[positions]
+                + np.nan_to_num(m2_b)
+                + delta**2 * n_a * n_b / n,
+                0.0,
+            )
+        self._count[positions] = n
+        self._min[positions] = np.fmin(
+            self._min[positions], grouped.min().to_numpy(dtype=np.float64)
+        )
+        self._max[positions] = np.fmax(
+            self._max[positions], grouped.max().to_numpy(dtype=np.float64)
+        )
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        valid = codes >= 0
+        rows = positions[codes[valid]]
+        columns = grouped.cumcount().to_numpy()[valid]
+        groups = self._count.shape[0]
+        for sketch, column in zip(self._sketches, self._extract_columns):
+            values = np.full(
+                (groups, columns.max() + 1 if len(columns) else 0), np.nan
+            )
+            values[rows, columns] = df[column].to_numpy(dtype=np.float64)[valid]
+            sketch.add(values)
+
+    def _statistic_df(self, values: np.ndarray, name: str) -> pd.DataFrame:
+        df = pd.DataFrame(
+            values, columns=self._extract_columns, index=self._index
+        ).reset_index()
+        df[SCENARIO_COL] = name
+        return df
+
+    def result(self) -> pd.DataFrame:
+        """
+        Obtém as estatísticas dos cenários adicionados.
+        """
+        if self._index is None:
+            return pd.DataFrame()
+        count = np.where(self._count > 0, self._count, np.nan)
+        quantiles = np.stack(
+            [s.quantiles(QUANTILES_FOR_STATISTICS) for s in self._sketches],
+            axis=1,
+        )
+        dfs: list[pd.DataFrame] = []
+        for i, q in enumerate(QUANTILES_FOR_STATISTICS):
+            if q == 0:
+                values = self._min
+            elif q == 1:
+                values = self._max
+            else:
+                values = quantiles[:, :, i]
+            dfs.append(self._statistic_df(values, quantile_name(q)))
+        dfs.append(
+            self._statistic_df(np.where(count > 0, self._mean, np.nan), "mean")
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self._m2 / (count - 1))
+        dfs.append(self._statistic_df(np.where(count > 1, std, np.nan), "std"))
+        df = pd.concat(dfs, ignore_index=True)
+        return df[self._columns]
@@ -0,0 +1,101 @@
+import cProfile
+import logging
+import os
+from fnmatch import fnmatch
+from typing import Optional
+
+from app.utils.tracing import Span
+
+SYNTHESIS_STAGE = "sintese"
+
+
+class ProfileTarget:
+    """
+    Alvo de perfilamento, no formato `etapa:alvo` ou apenas `alvo`,
+    quando se refere à chave de uma síntese. O alvo aceita wildcards
+    (`*`), e é comparado com os atributos do intervalo da etapa.
+
+    Exemplos: `GTER_UTE`, `deck:pdo_oper_term`, `leitura:PDO_*`.
+    """
+
+    def __init__(self, spec: str):
+        stage, sep, target = spec.strip().partition(":")
+        if not sep:
+            stage, target = SYNTHESIS_STAGE, stage
+        self.stage = stage
+        self.target = target
+
+    def __str__(self) -> str:
+        return f"{self.stage}:{self.target}"
+
+    def matches(self, span: Span) -> Optional[str]:
+        """
+        Retorna o valor do atributo que satisfaz o alvo, caso o
+        intervalo pertença à etapa e não seja um acesso à cache.
+        """
+        if span.name != self.stage or span.attributes.get("cache", False):
+            return None
+        for value in span.attributes.values():
+            if isinstance(value, str) and fnmatch(value, self.target):
+                return value
+        return None
+
+    @classmethod
+    def parse(cls, specs: str) -> list["ProfileTarget"]:
+        return [cls(s) for s in specs.split(",") if s.strip()]
+
+
+class CallProfiler:
+    """
+    Ouvinte de intervalos que executa o `cProfile` durante as etapas
+    que satisfazem os alvos fornecidos, escrevendo um arquivo `.pstats`
+    por etapa no diretório de saída. Etapas aninhadas em uma etapa já
+    perfilada são incluídas no perfil externo.
+
+    Qualquer função pode ser alvo do perfilamento ao ser decorada
+    com `app.utils.tracing.traced`.
+    """
+
+    def __init__(self, targets: list[ProfileTarget], directory: str):
+        self.targets = targets
+        self.directory = directory
+        self.files: list[str] = []
+        self._active: Optional[tuple[Span, cProfile.Profile]] = None
+        self.logger = logging.getLogger("main")
+
+    def _filename(self, stage: str, target: str) -> str:
+        name = "".join(c if c.isalnum() or c in "-_." else "_" for c in target)
+        path = os.path.join(self.directory, f"{stage}_{name}.pstats")
+        counter = 1
+        while path in self.files:
+            counter += 1
+            path = os.path.join(
+                self.directory, f"{stage}_{name}_{counter}.pstats"
+            )
+        return path
+
+    def on_start(self, span: Span):
+        if self._active is not None:
+            return
+        if not any(t.matches(span) for t in self.targets):
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            self.logger.warning(f"Não foi possível perfilar {span.name}: {e}")
+            return
+        self._active = (span, profile)
+
+    def on_end(self, span: Span):
+        if self._active is None or self._active[0] is not span:
+            return
+        profile = self._active[1]
+        profile.disable()
+        self._active = None
+        target = next(v for t in self.targets if (v := t.matches(span)))
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._filename(span.name, target)
+        profile.dump_stats(path)
+        self.files.append(path)
+        self.logger.info(f"Perfil de {span.name} {target} escrito em {path}")
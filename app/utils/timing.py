@@ -2,6 +2,8 @@ import time
 from logging import INFO, Logger
 from typing import Optional
 
+from app.utils.tracing import Tracer
+
 
 class time_and_log:
     def __init__(
@@ -9,19 +11,28 @@ class time_and_log:
         message_root: Optional[str] = None,
         logger: Optional[Logger] = None,
         level: int = INFO,
+        span: Optional[str] = None,
+        **attributes,
     ) -> None:
         self.message_root = message_root
         self.logger = logger
         self.level = level
+        self.span_name = span
+        self.attributes = attributes
 
     def __enter__(
         self,
     ):
+        self.span = Tracer.span(
+            self.span_name or self.message_root or "tempo", **self.attributes
+        )
+        self.span.__enter__()
         self.start_time = time.perf_counter()
         return self
 
     def __exit__(self, exc_type, exc_value, exc_tb):
         end_time = time.perf_counter()
+        self.span.__exit__(exc_type, exc_value, exc_tb)
         run_time = end_time - self.start_time
         if self.logger:
             message_with_root = (
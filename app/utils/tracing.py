@@ -0,0 +1,271 @@
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar, Token
+from functools import wraps
+from itertools import count
+from typing import Any, Callable, Optional, Protocol
+
+
+class Span:
+    """
+    Intervalo de execução de uma etapa da síntese, com os atributos
+    que a identificam (chave da síntese, arquivo, tabela do deck,
+    número de linhas, bytes, etc.).
+    """
+
+    __slots__ = (
+        "name",
+        "attributes",
+        "span_id",
+        "parent_id",
+        "thread_id",
+        "start_ns",
+        "end_ns",
+        "_token",
+    )
+
+    def __init__(self, name: str, attributes: dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = 0
+        self.parent_id: Optional[int] = None
+        self.thread_id = 0
+        self.start_ns = 0
+        self.end_ns = 0
+        self._token: Optional[Token[Optional[Span]]] = None
+
+    @property
+    def duration(self) -> float:
+        """
+        Duração do intervalo, em segundos.
+        """
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, **attributes):
+        """
+        Adiciona atributos ao intervalo, como o número de linhas
+        de uma tabela conhecido apenas ao final da etapa.
+        """
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        parent = Tracer._current.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.span_id = next(Tracer._ids)
+        self.thread_id = threading.get_ident()
+        self._token = Tracer._current.set(self)
+        for listener in Tracer._listeners:
+            listener.on_start(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attributes["erro"] = exc_type.__name__
+        Tracer._current.reset(self._token)
+        self._token = None
+        for listener in Tracer._listeners:
+            listener.on_end(self)
+        Tracer._finish(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "nome": self.name,
+            "id": self.span_id,
+            "pai": self.parent_id,
+            "thread": self.thread_id,
+            "inicio_ns": self.start_ns,
+            "fim_ns": self.end_ns,
+            "duracao_s": self.duration,
+            "atributos": self.attributes,
+        }
+
+
+class _NullSpan:
+    """
+    Intervalo utilizado quando não há rastreamento ativo, evitando
+    o custo de registrar as etapas em execuções comuns.
+    """
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        pass
+
+
+class SpanListener(Protocol):
+    def on_start(self, span: Span): ...
+
+    def on_end(self, span: Span): ...
+
+
+class Tracer:
+    """
+    Registra intervalos aninhados das etapas da síntese. O aninhamento
+    é mantido por contexto, de modo que cada thread possui a sua
+    própria pilha de intervalos.
+
+    O registro só é feito entre `start()` e `stop()` ou quando há
+    algum ouvinte cadastrado. Caso contrário, `span()` retorna um
+    intervalo nulo.
+    """
+
+    _current: ContextVar[Optional[Span]] = ContextVar(
+        "sintese_span", default=None
+    )
+    _ids = count(1)
+    _spans: Optional[list[Span]] = None
+    _listeners: list[SpanListener] = []
+    _lock = threading.Lock()
+    _NULL_SPAN = _NullSpan()
+
+    @classmethod
+    def active(cls) -> bool:
+        return cls._spans is not None or len(cls._listeners) > 0
+
+    @classmethod
+    def span(cls, name: str, **attributes) -> Span | _NullSpan:
+        if not cls.active():
+            return cls._NULL_SPAN
+        return Span(name, attributes)
+
+    @classmethod
+    def current(cls) -> Optional[Span]:
+        return cls._current.get()
+
+    @classmethod
+    def start(cls):
+        """
+        Inicia o registro dos intervalos, descartando os anteriores.
+        """
+        with cls._lock:
+            cls._spans = []
+
+    @classmethod
+    def stop(cls) -> list[Span]:
+        """
+        Encerra o registro, retornando os intervalos concluídos
+        em ordem de término.
+        """
+        with cls._lock:
+            spans = cls._spans if cls._spans is not None else []
+            cls._spans = None
+        return spans
+
+    @classmethod
+    def add_listener(cls, listener: SpanListener):
+        cls._listeners = cls._listeners + [listener]
+
+    @classmethod
+    def remove_listener(cls, listener: SpanListener):
+        cls._listeners = [lst for lst in cls._listeners if lst is not listener]
+
+    @classmethod
+    def _finish(cls, span: Span):
+        spans = cls._spans
+        if spans is not None:
+            with cls._lock:
+                spans.append(span)
+
+
+def traced(name: str, **attributes) -> Callable:
+    """
+    Decorador que executa a função em um intervalo de rastreamento.
+    Atributos fornecidos como funções são avaliados com os argumentos
+    de cada chamada, permitindo identificar, por exemplo, a chave da
+    síntese em processamento.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not Tracer.active():
+                return func(*args, **kwargs)
+            values = {
+                k: v(*args, **kwargs) if callable(v) else v
+                for k, v in attributes.items()
+            }
+            with Tracer.span(name, **values):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def export_jsonl(spans: list[Span], path: str):
+    """
+    Exporta os intervalos em JSON lines, com um objeto por intervalo.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for span in spans:
+            f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+def export_chrome_trace(spans: list[Span], path: str):
+    """
+    Exporta os intervalos no formato de eventos do Chrome
+    (`chrome://tracing` ou Perfetto), com tempos em microssegundos.
+    """
+    origin = min((s.start_ns for s in spans), default=0)
+    pid = os.getpid()
+    events = [
+        {
+            "name": span.name,
+            "cat": "sintese",
+            "ph": "X",
+            "ts": (span.start_ns - origin) / 1e3,
+            "dur": (span.end_ns - span.start_ns) / 1e3,
+            "pid": pid,
+            "tid": span.thread_id,
+            "args": span.attributes,
+        }
+        for span in sorted(spans, key=lambda s: s.start_ns)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str
+        )
+
+
+class trace_session:
+    """
+    Registra os intervalos executados no contexto e, ao final,
+    exporta o perfil para o diretório fornecido em JSON lines
+    (`perfil.jsonl`) e no formato de eventos do Chrome
+    (`perfil_chrome.json`).
+    """
+
+    JSONL_FILENAME = "perfil.jsonl"
+    CHROME_FILENAME = "perfil_chrome.json"
+
+    def __init__(self, directory: str, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self.spans: list[Span] = []
+
+    def __enter__(self) -> "trace_session":
+        if self.enabled:
+            Tracer.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if not self.enabled:
+            return
+        self.spans = Tracer.stop()
+        os.makedirs(self.directory, exist_ok=True)
+        export_jsonl(
+            self.spans, os.path.join(self.directory, self.JSONL_FILENAME)
+        )
+        export_chrome_trace(
+            self.spans, os.path.join(self.directory, self.CHROME_FILENAME)
+        )
@@ -0,0 +1,4 @@
+"""
+Benchmarks do sintetizador-dessem, executados com o pytest-benchmark
+sobre casos sintéticos gerados em escala configurável.
+"""
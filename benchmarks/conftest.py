@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.generator import SCALES, generate_deck  # noqa: E402
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+# Escalas dos casos sintéticos, separadas por vírgula
+BENCHMARK_SCALES = os.getenv("BENCHMARK_ESCALAS", "pequeno").split(",")
+
+
+@pytest.fixture(scope="session", params=BENCHMARK_SCALES)
+def deck(request, tmp_path_factory) -> str:
+    path = tmp_path_factory.mktemp(f"deck_{request.param}")
+    return str(generate_deck(path, SCALES[request.param]))
+
+
+@pytest.fixture
+def peak_rss():
+    """
+    Executa a síntese em um subprocesso, retornando o pico de
+    memória residente e o tempo total observados.
+    """
+
+    def run(path: str, family: str, variables: list[str]) -> dict:
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.rss", path, family] + variables,
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    return run
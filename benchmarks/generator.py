@@ -0,0 +1,446 @@
+"""
+Gerador de casos sintéticos do DESSEM para benchmarks.
+
+Os arquivos são escritos com os mesmos modelos de linha utilizados
+pelo idessem na leitura, garantindo que sejam sintaticamente válidos,
+e as entidades (submercados, REEs, UHEs, UTEs e eólicas) são
+consistentes entre todos os arquivos do caso. Os arquivos que não
+dependem da escala do caso são copiados do deck de testes.
+"""
+
+import copy
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Type
+
+import click
+import numpy as np
+from cfinterface.components.floatfield import FloatField
+from cfinterface.components.integerfield import IntegerField
+from idessem.dessem.entdados import Entdados
+from idessem.dessem.modelos.blocos.tabelacsv import TabelaCSV
+from idessem.dessem.modelos.entdados import REE, SIST, TM, UH, UT
+from idessem.dessem.modelos.pdo_eco_usih import TabelaPdoEcoUsih190402
+from idessem.dessem.modelos.pdo_eolica import TabelaPdoEolica
+from idessem.dessem.modelos.pdo_hidr import TabelaPdoHidr
+from idessem.dessem.modelos.pdo_inter import TabelaPdoInter
+from idessem.dessem.modelos.pdo_oper_term import TabelaPdoOperTerm
+from idessem.dessem.modelos.pdo_oper_tviag_calha import (
+    TabelaPdoOperTviagCalha,
+)
+from idessem.dessem.modelos.pdo_oper_uct import TabelaPdoOperUct
+from idessem.dessem.modelos.pdo_sist import TabelaPdoSist
+
+TEMPLATE_DIR = (
+    Path(__file__).resolve().parents[1].joinpath("tests", "mocks", "arquivos")
+)
+COPIED_FILES = ["dessem.arq", "dadvaz.dat", "operuh.dat", "LOG_MATRIZ.DAT"]
+# Entradas compartilhadas entre os cenários de um caso
+SHARED_FILES = ["dessem.arq", "ENTDADOS.DAT", "operuh.dat"]
+VERSION = "19.4.5"
+STUDY_DATE = datetime(2022, 9, 3)
+SUBMARKET_MNEMONICS = ["SE", "S", "NE", "N"]
+# Intervalos de hora do dia associados a cada patamar de carga
+BLOCK_HOURS = {"LEVE": range(0, 7), "PESADA": range(18, 21)}
+
+
+@dataclass(frozen=True)
+class DeckScale:
+    """
+    Dimensões de um caso sintético do DESSEM.
+    """
+
+    stages: int = 48
+    hydros: int = 160
+    thermals: int = 100
+    units: int = 2
+    submarkets: int = 4
+    eers_per_submarket: int = 3
+    winds: int = 20
+
+    @property
+    def eers(self) -> int:
+        return self.submarkets * self.eers_per_submarket
+
+
+SCALES = {
+    "pequeno": DeckScale(stages=24, hydros=40, thermals=20, units=1),
+    "medio": DeckScale(stages=48, hydros=160, thermals=100, units=2),
+    "grande": DeckScale(stages=168, hydros=320, thermals=300, units=4),
+}
+
+
+def _submarket_mnemonic(code: int) -> str:
+    if code <= len(SUBMARKET_MNEMONICS):
+        return SUBMARKET_MNEMONICS[code - 1]
+    return f"X{code}"
+
+
+def _block_name(hour: int) -> str:
+    for name, hours in BLOCK_HOURS.items():
+        if hour in hours:
+            return name
+    return "MEDIA"
+
+
+class _CaseWriter:
+    """
+    Escreve os arquivos de um caso sintético a partir de uma escala.
+    """
+
+    def __init__(self, path: Path, scale: DeckScale, seed: int):
+        self.path = path
+        self.scale = scale
+        self.rng = np.random.default_rng(seed)
+        self.stage_starts = [
+            STUDY_DATE + timedelta(hours=i) for i in range(scale.stages)
+        ]
+        self.blocks = [_block_name(d.hour) for d in self.stage_starts]
+        self.hydro_codes = list(range(1, scale.hydros + 1))
+        self.thermal_codes = list(range(1, scale.thermals + 1))
+        self.wind_codes = list(range(1, scale.winds + 1))
+
+    def hydro_eer(self, code: int) -> int:
+        return (code - 1) % self.scale.eers + 1
+
+    def eer_submarket(self, eer: int) -> int:
+        return (eer - 1) % self.scale.submarkets + 1
+
+    def hydro_submarket(self, code: int) -> str:
+        return _submarket_mnemonic(self.eer_submarket(self.hydro_eer(code)))
+
+    def entity_submarket(self, code: int) -> str:
+        return _submarket_mnemonic((code - 1) % self.scale.submarkets + 1)
+
+    def header(self, title: str) -> str:
+        date = STUDY_DATE.strftime("%d/%m/%Y")
+        return (
+            "*" * 71
+            + "\n"
+            + f"*  MODELO DESSEM     - VERSAO {VERSION} - BENCHMARK\n"
+            + "*" * 71
+            + "\n\n"
+            + f" TE  {title} - Data do Caso: {date}\n\n"
+        )
+
+    def _default_value(self, field: Any) -> Any:
+        if isinstance(field, FloatField):
+            limit = max(1.0, min(10.0 ** (field.size - 5), 1e4))
+            return round(float(self.rng.uniform(0.0, limit)), 2)
+        if isinstance(field, IntegerField):
+            return 0
+        return ""
+
+    def write_csv_table(
+        self,
+        filename: str,
+        table: Type[TabelaCSV],
+        rows: list[dict[str, Any]],
+    ):
+        fields = table.LINE_MODEL.fields
+        separator = ";".join("-" * f.size for f in fields) + ";\n"
+        columns = ";".join(
+            c[: f.size].upper().rjust(f.size)
+            for c, f in zip(table.COLUMN_NAMES, fields)
+        )
+        with open(self.path.joinpath(filename), "w", encoding="utf-8") as f:
+            f.write(self.header(filename))
+            f.write(separator)
+            f.write(columns + ";\n")
+            f.write(separator)
+            for row in rows:
+                values = [
+                    row[c] if c in row else self._default_value(field)
+                    for c, field in zip(table.COLUMN_NAMES, fields)
+                ]
+                f.write(table.LINE_MODEL.write(values))
+            f.write("\n")
+
+    def write_entdados(self):
+        entdados = Entdados.read(str(TEMPLATE_DIR.joinpath("ENTDADOS.DAT")))
+        registers: dict[type, list] = {
+            TM: [
+                [d.day, d.hour, 0, 1.0, 0, b]
+                for d, b in zip(self.stage_starts, self.blocks)
+            ],
+            SIST: [
+                [c, _submarket_mnemonic(c), 0, f"SUBMERC{c}"]
+                for c in range(1, self.scale.submarkets + 1)
+            ],
+            REE: [
+                [c, self.eer_submarket(c), f"REE{c}"]
+                for c in range(1, self.scale.eers + 1)
+            ],
+        }
+        template_uh = entdados.data.get_registers_of_type(UH)[0].data
+        registers[UH] = [
+            [c, f"UHE {c:04d}", self.hydro_eer(c), 50.0]
+            + copy.deepcopy(template_uh[4:])
+            for c in self.hydro_codes
+        ]
+        template_ut = entdados.data.get_registers_of_type(UT)[0].data
+        registers[UT] = [
+            [
+                c,
+                f"UTE {c:04d}",
+                (c - 1) % self.scale.submarkets + 1,
+            ]
+            + copy.deepcopy(template_ut[3:])
+            for c in self.thermal_codes
+        ]
+        for register_type, data in registers.items():
+            old = entdados.data.get_registers_of_type(register_type)
+            for values in data:
+                new = register_type()
+                new.data = values
+                entdados.data.add_before(old[0], new)
+            for register in old:
+                entdados.data.remove(register)
+        entdados.write(str(self.path.joinpath("ENTDADOS.DAT")))
+
+    def write_pdo_operacao(self):
+        lines = [self.header("PDO_OPERACAO")]
+        lines.append("  DISCRETIZACAO DE TEMPO PARA O CASO EM ESTUDO\n")
+        lines.append("\n  IPER  INICIO            FIM               DURACAO\n")
+        lines.append("  ---- ----------------- ----------------- -------\n")
+        date_format = "%d/%m/%Y %H:%M"
+        for i, start in enumerate(self.stage_starts):
+            end = start + timedelta(hours=1)
+            lines.append(
+                f"  {i + 1:4d} {start.strftime(date_format)} "
+                + f"{end.strftime(date_format)}  1.0000\n"
+            )
+        lines.append("-----------------\n\n")
+        for i in range(self.scale.stages):
+            present, future = self.rng.uniform(1e3, 1e6, size=2)
+            lines.append(f"PERIODO: {i + 1:4d}\n")
+            lines.append(f"  Custo presente   : {present:15.2f}\n")
+            lines.append(f"  Custo futuro     : {future:15.2f}\n")
+            lines.append("1 - BALANCO HIDRICO\n\n")
+        with open(self.path.joinpath("PDO_OPERACAO.DAT"), "w") as f:
+            f.writelines(lines)
+
+    def write_des_log_relato(self):
+        present, future = self.rng.uniform(1e3, 1e6, size=2)
+        with open(self.path.joinpath("DES_LOG_RELATO.DAT"), "w") as f:
+            f.write(self.header("DES_LOG_RELATO"))
+            f.write("  TEMPO DE PROCESSAMENTO DO MODELO DESSEM:  0:12:34\n\n")
+            f.write(
+                "Funcao objetivo do Problema Linear  : "
+                + f"{present + future:19.2f}\n"
+            )
+            f.write(f"Parcela de custo presente  : {present:19.2f}\n")
+            f.write(f"Parcela de custo Futuro    : {future:19.2f}\n")
+            f.write(f"Custo de violacao de restricoes : {0.0:19.2f}\n")
+            f.write(f"Custo de pequenas penalidades   : {0.0:19.2f}\n")
+            f.write("----------------\n")
+
+    def write_pdo_sist(self):
+        rows = [
+            {
+                "estagio": i + 1,
+                "nome_patamar": block,
+                "nome_submercado": _submarket_mnemonic(c),
+                "perdas": "-",
+            }
+            for i, block in enumerate(self.blocks)
+            for c in range(1, self.scale.submarkets + 1)
+        ]
+        self.write_csv_table("PDO_SIST.DAT", TabelaPdoSist, rows)
+
+    def write_pdo_eco_usih(self):
+        rows = [
+            {
+                "codigo_usina": c,
+                "nome_usina": f"UHE {c:04d}",
+                "nome_submercado": self.hydro_submarket(c),
+                "estagio_inicial": 1,
+                "volume_armazenado_minimo_hm3": 100.0,
+                "volume_armazenado_maximo_hm3": 1100.0,
+                "tipo_reservatorio": "RES",
+                "tipo_regularizacao": "M",
+                "numero_conjuntos": 1,
+            }
+            for c in self.hydro_codes
+        ]
+        self.write_csv_table("PDO_ECO_USIH.DAT", TabelaPdoEcoUsih190402, rows)
+
+    def write_pdo_hidr(self):
+        rows = [
+            {
+                "estagio": i + 1,
+                "nome_patamar": block,
+                "codigo_usina": c,
+                "nome_usina": f"UHE {c:04d}",
+                "nome_submercado": self.hydro_submarket(c),
+                "conjunto": 99,
+                "unidade": 99,
+                "volume_final_percentual": float(self.rng.uniform(0, 100)),
+                "status": "ON",
+            }
+            for i, block in enumerate(self.blocks)
+            for c in self.hydro_codes
+        ]
+        self.write_csv_table("PDO_HIDR.DAT", TabelaPdoHidr, rows)
+
+    def write_pdo_oper_tviag_calha(self):
+        rows = [
+            {
+                "estagio": i + 1,
+                "duracao": 1.0,
+                "codigo_usina_montante": c,
+                "nome_usina_montante": f"UHE {c:04d}",
+                "tipo_elemento_jusante": "USIH",
+                "codigo_elemento_jusante": c + 1,
+                "nome_elemento_jusante": f"UHE {c + 1:04d}",
+                "tipo_tempo_viagem": "TV",
+            }
+            for i in range(self.scale.stages)
+            for c in self.hydro_codes[:-1:10]
+        ]
+        self.write_csv_table(
+            "PDO_OPER_TVIAG_CALHA.DAT", TabelaPdoOperTviagCalha, rows
+        )
+
+    def write_pdo_eolica(self):
+        rows = [
+            {
+                "estagio": i + 1,
+                "codigo_usina": c,
+                "nome_usina": f"EOL {c:04d}",
+                "barra": c,
+                "nome_submercado": self.entity_submarket(c),
+            }
+            for i in range(self.scale.stages)
+            for c in self.wind_codes
+        ]
+        self.write_csv_table("PDO_EOLICA.DAT", TabelaPdoEolica, rows)
+
+    def write_pdo_inter(self):
+        pairs: list[tuple[int, int]] = []
+        for a in range(1, self.scale.submarkets):
+            pairs += [(a, a + 1), (a + 1, a)]
+        rows = [
+            {
+                "estagio": i + 1,
+                "nome_patamar": block,
+                "indice_intercambio": j + 1,
+                "nome_submercado_de": _submarket_mnemonic(a),
+                "nome_submercado_para": _submarket_mnemonic(b),
+            }
+            for i, block in enumerate(self.blocks)
+            for j, (a, b) in enumerate(pairs)
+        ]
+        self.write_csv_table("PDO_INTER.DAT", TabelaPdoInter, rows)
+
+    def _thermal_unit_rows(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "estagio": i + 1,
+                "codigo_usina": c,
+                "codigo_unidade": u,
+                "nome_usina": f"UTE {c:04d}",
+                "nome_submercado": self.entity_submarket(c),
+                "barra": c,
+            }
+            for i in range(self.scale.stages)
+            for c in self.thermal_codes
+            for u in range(1, self.scale.units + 1)
+        ]
+
+    def write_pdo_oper_term(self):
+        self.write_csv_table(
+            "PDO_OPER_TERM.DAT", TabelaPdoOperTerm, self._thermal_unit_rows()
+        )
+
+    def write_pdo_oper_uct(self):
+        rows = self._thermal_unit_rows()
+        for row in rows:
+            row["titulacao"] = "-"
+        self.write_csv_table("PDO_OPER_UCT.DAT", TabelaPdoOperUct, rows)
+
+    def write(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        for filename in COPIED_FILES:
+            shutil.copy(TEMPLATE_DIR.joinpath(filename), self.path)
+        self.write_entdados()
+        self.write_pdo_operacao()
+        self.write_des_log_relato()
+        self.write_pdo_sist()
+        self.write_pdo_eco_usih()
+        self.write_pdo_hidr()
+        self.write_pdo_oper_tviag_calha()
+        self.write_pdo_eolica()
+        self.write_pdo_inter()
+        self.write_pdo_oper_term()
+        self.write_pdo_oper_uct()
+
+
+def generate_deck(path: str | Path, scale: DeckScale, seed: int = 0) -> Path:
+    """
+    Escreve um caso sintético do DESSEM no diretório fornecido.
+
+    :param path: Diretório de escrita do caso
+    :param scale: Dimensões do caso
+    :param seed: Semente para os valores aleatórios das saídas
+    :return: O diretório do caso
+    :rtype: Path
+    """
+    case_path = Path(path)
+    _CaseWriter(case_path, scale, seed).write()
+    return case_path
+
+
+def generate_scenarios(
+    path: str | Path, scale: DeckScale, scenarios: int
+) -> list[Path]:
+    """
+    Escreve um caso com múltiplos cenários, com as entradas
+    compartilhadas no diretório do caso e as saídas de cada
+    cenário em um subdiretório `cenario_XXX`.
+    """
+    root = Path(path)
+    paths = [
+        generate_deck(root.joinpath(f"cenario_{s:03d}"), scale, seed=s)
+        for s in range(1, scenarios + 1)
+    ]
+    for filename in SHARED_FILES:
+        shutil.move(paths[0].joinpath(filename), root.joinpath(filename))
+        for scenario_path in paths[1:]:
+            scenario_path.joinpath(filename).unlink()
+    return paths
+
+
+@click.command("gerar")
+@click.argument("diretorio")
+@click.option("--estagios", default=48, type=int)
+@click.option("--uhes", default=160, type=int)
+@click.option("--utes", default=100, type=int)
+@click.option("--unidades", default=2, type=int)
+@click.option("--submercados", default=4, type=int)
+@click.option("--eolicas", default=20, type=int)
+@click.option("--cenarios", default=1, type=int)
+def main(
+    diretorio, estagios, uhes, utes, unidades, submercados, eolicas, cenarios
+):
+    """
+    Gera casos sintéticos do DESSEM para benchmarks.
+    """
+    scale = DeckScale(
+        stages=estagios,
+        hydros=uhes,
+        thermals=utes,
+        units=unidades,
+        submarkets=submercados,
+        winds=eolicas,
+    )
+    if cenarios > 1:
+        generate_scenarios(diretorio, scale, cenarios)
+    else:
+        generate_deck(diretorio, scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Executa uma síntese em um processo isolado, informando o tempo
+total e o pico de memória residente (RSS) do processo.
+
+    $ python -m benchmarks.rss CASO operacao CMO_SBM GHID_UHE
+"""
+
+import json
+import sys
+import time
+from typing import Optional
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Pico de memória residente do processo atual, em MB.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # O Linux informa o valor em KB e o macOS em bytes
+    if sys.platform == "darwin":
+        return peak / 1024**2
+    return peak / 1024
+
+
+def main(path: str, family: str, variables: list[str]) -> dict:
+    from app.api import run_synthesis
+    from app.services.unitofwork import MemoryUnitOfWork
+
+    start = time.perf_counter()
+    run_synthesis(MemoryUnitOfWork(path), **{family: variables})
+    return {
+        "tempo_s": time.perf_counter() - start,
+        "pico_rss_mb": peak_rss_mb(),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(sys.argv[1], sys.argv[2], sys.argv[3:])))
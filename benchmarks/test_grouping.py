@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.model.settings import Settings
+from app.utils.operations import fast_group_df
+from benchmarks.conftest import BENCHMARK_SCALES
+from benchmarks.generator import SCALES
+
+# Cenários dos casos sintéticos, como nas estatísticas dos casos com
+# múltiplos cenários
+SCENARIOS = 20
+BLOCKS = 3
+KEYS = ["estagio", "patamar", "codigo_usina", "cenario"]
+
+
+@pytest.fixture(scope="session", params=BENCHMARK_SCALES)
+def synthesis_df(request) -> pd.DataFrame:
+    """
+    Síntese de operação por usina de um caso sintético, com uma linha
+    por estágio, patamar, usina e cenário.
+    """
+    scale = SCALES[request.param]
+    plants = scale.hydros + scale.thermals
+    index = pd.MultiIndex.from_product(
+        [
+            range(1, scale.stages + 1),
+            range(1, BLOCKS + 1),
+            range(1, plants + 1),
+            range(1, SCENARIOS + 1),
+        ],
+        names=KEYS,
+    )
+    df = index.to_frame(index=False)
+    df["valor"] = np.random.default_rng(0).random(len(df))
+    return df
+
+
+@pytest.mark.parametrize("kernel", ["PANDAS", "ARROW"])
+@pytest.mark.parametrize("operation", ["sum", "mean", "std"])
+def test_group(benchmark, synthesis_df, kernel, operation):
+    benchmark.group = f"agrupamento-{operation}"
+
+    def group():
+        return fast_group_df(
+            synthesis_df, KEYS[:-1], ["valor"], operation, sort=True
+        )
+
+    with patch.object(Settings(), "grouping_kernel", kernel):
+        df = benchmark.pedantic(group, rounds=5)
+    benchmark.extra_info["linhas"] = len(synthesis_df)
+    assert len(df) == len(synthesis_df) // SCENARIOS
@@ -0,0 +1,42 @@
+import pytest
+
+from app.api import run_synthesis
+from app.services.deck.deck import Deck
+from app.services.synthesis.operation import OperationSynthetizer
+from app.services.unitofwork import MemoryUnitOfWork
+
+OPERATION_VARIABLES = [
+    "CMO_SBM",
+    "EARMF_SBM",
+    "GHID_UHE",
+    "GTER_UTE",
+    "INT_SBP",
+    "QTUR_UHE",
+    "VARMF_UHE",
+]
+
+
+def _clear_caches():
+    Deck.clear_cache()
+    OperationSynthetizer.clear_cache()
+
+
+def _benchmark_synthesis(
+    benchmark, peak_rss, path: str, family: str, variables: list[str]
+):
+    def synthetize():
+        run_synthesis(MemoryUnitOfWork(path), **{family: variables})
+
+    benchmark.pedantic(synthetize, setup=_clear_caches, rounds=3)
+    _clear_caches()
+    benchmark.extra_info.update(peak_rss(path, family, variables))
+
+
+@pytest.mark.parametrize("family", ["sistema", "operacao", "execucao"])
+def test_family(benchmark, peak_rss, deck, family):
+    _benchmark_synthesis(benchmark, peak_rss, deck, family, [])
+
+
+@pytest.mark.parametrize("variable", OPERATION_VARIABLES)
+def test_operation_variable(benchmark, peak_rss, deck, variable):
+    _benchmark_synthesis(benchmark, peak_rss, deck, "operacao", [variable])
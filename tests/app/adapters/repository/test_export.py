@@ -1,6 +1,7 @@
 from unittest.mock import patch
 
 import pandas as pd
+import pyarrow.parquet as pq
 
 from app.adapters.repository.export import factory
 from tests.conftest import DECK_TEST_DIR
@@ -16,3 +17,35 @@ def test_export_parquet(test_settings):
     repo = factory("PARQUET", DECK_TEST_DIR)
     with patch("pyarrow.parquet.write_table"):
         repo.synthetize_df(pd.DataFrame(), "CMO_SBM")
+
+
+def test_export_memory(test_settings):
+    repo = factory("MEMORY", DECK_TEST_DIR)
+    df = pd.DataFrame({"codigo_submercado": [1, 2], "valor": [10.0, 20.0]})
+    repo.synthetize_df(df, "CMO_SBM")
+    assert repo.tables["CMO_SBM"].num_rows == 2
+    pd.testing.assert_frame_equal(repo.read_df("CMO_SBM"), df)
+    assert repo.read_df("MER_SBM") is None
+
+
+def test_export_parquet_writer_row_groups(test_settings, tmp_path):
+    repo = factory("PARQUET", str(tmp_path))
+    writer = repo.open_writer("CMO_SBM")
+    for scenario in [1, 2, 3]:
+        writer.write(
+            pd.DataFrame({"cenario": [scenario] * 2, "valor": [1.0, 2.0]})
+        )
+    writer.close()
+    parquet = pq.ParquetFile(tmp_path.joinpath("CMO_SBM.parquet"))
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().column("cenario").to_pylist() == [1, 1, 2, 2, 3, 3]
+
+
+def test_export_memory_writer(test_settings):
+    repo = factory("MEMORY", DECK_TEST_DIR)
+    writer = repo.open_writer("CMO_SBM")
+    writer.write(pd.DataFrame({"cenario": [1], "valor": [1.0]}))
+    writer.write(pd.DataFrame({"cenario": [2], "valor": [2.0]}))
+    assert "CMO_SBM" not in repo.tables
+    writer.close()
+    assert repo.tables["CMO_SBM"].column("cenario").to_pylist() == [1, 2]
@@ -1,8 +1,19 @@
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from os.path import join
+from unittest.mock import patch
 
 import pandas as pd
 
-from app.adapters.repository.files import factory
+from app.adapters.repository.files import (
+    ScenarioFilesRepository,
+    case_repository,
+    factory,
+    find_scenarios,
+)
+from app.adapters.repository.parsing import ProcessParser
+from app.model.settings import Settings
 from tests.conftest import DECK_TEST_DIR
 
 
@@ -26,6 +37,17 @@ def test_get_entdados(test_settings):
     assert isinstance(entdados.tm(df=True), pd.DataFrame)
 
 
+def test_get_entdados_registers(test_settings):
+    expected = factory("FS", DECK_TEST_DIR).get_entdados()
+    repo = factory("FS", DECK_TEST_DIR)
+    entdados = repo.get_entdados_registers(["SIST", "UH"])
+    pd.testing.assert_frame_equal(
+        entdados.sist(df=True), expected.sist(df=True)
+    )
+    pd.testing.assert_frame_equal(entdados.uh(df=True), expected.uh(df=True))
+    assert entdados.tm(df=True).empty
+
+
 def test_get_log_matriz(test_settings):
     repo = factory("FS", DECK_TEST_DIR)
     log_matriz = repo.get_log_matriz()
@@ -110,3 +132,85 @@ def test_get_operuh(test_settings):
     repo = factory("FS", DECK_TEST_DIR)
     operuh = repo.get_operuh()
     assert isinstance(operuh.rest(df=True), pd.DataFrame)
+
+
+def _make_scenario_case(path):
+    for f in ["dessem.arq", "ENTDADOS.DAT", "operuh.dat", "dadvaz.dat"]:
+        shutil.copy(join(DECK_TEST_DIR, f), path)
+    for name in ["cenario_2", "cenario_10"]:
+        path.joinpath(name).mkdir()
+        shutil.copy(join(DECK_TEST_DIR, "PDO_SIST.DAT"), path.joinpath(name))
+    path.joinpath("sintese").mkdir()
+    return path
+
+
+def test_concurrent_reads(test_settings):
+    repo = factory("FS", DECK_TEST_DIR)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: repo.get_pdo_sist(), range(4)))
+    assert results[0] is not None
+    assert all(r is results[0] for r in results)
+
+
+def test_find_scenarios(test_settings, tmp_path):
+    case = _make_scenario_case(tmp_path)
+    assert find_scenarios(str(case)) == {
+        2: str(case.joinpath("cenario_2")),
+        10: str(case.joinpath("cenario_10")),
+    }
+    assert find_scenarios(DECK_TEST_DIR) == {}
+
+
+def test_scenario_repository_shares_inputs(test_settings, tmp_path):
+    case = _make_scenario_case(tmp_path)
+    repo = case_repository(str(case))
+    assert isinstance(repo, ScenarioFilesRepository)
+    assert repo.scenario == 2
+    other = repo.for_scenario(10)
+    assert other.scenario == 10
+    assert other.get_entdados() is repo.get_entdados()
+    assert other.get_dadvaz() is repo.get_dadvaz()
+    assert other.get_pdo_sist() is not repo.get_pdo_sist()
+    assert repo.loaded == ["get_pdo_sist"]
+
+
+def test_prefetch_in_process_pool(test_settings):
+    expected = factory("FS", DECK_TEST_DIR).get_pdo_oper_term().tabela
+    repo = factory("FS", DECK_TEST_DIR)
+    try:
+        with patch.object(Settings(), "reading_processes", 1):
+            repo.prefetch(["get_pdo_oper_term", "get_pdo_hidr"])
+            pdo = repo.get_pdo_oper_term()
+    finally:
+        ProcessParser.shutdown()
+    pd.testing.assert_frame_equal(pdo.tabela, expected)
+
+
+def test_prefetch_skips_loaded_files(test_settings):
+    repo = factory("FS", DECK_TEST_DIR)
+    repo.get_pdo_sist()
+    with (
+        patch.object(Settings(), "reading_processes", 1),
+        patch.object(ProcessParser, "submit") as submit,
+    ):
+        repo.prefetch(["get_pdo_sist"])
+    submit.assert_not_called()
+
+
+def test_iterate_table(test_settings):
+    expected = factory("FS", DECK_TEST_DIR).get_pdo_oper_term().tabela
+    repo = factory("FS", DECK_TEST_DIR)
+    chunks = list(repo.iterate_table("get_pdo_oper_term", 10, "estagio"))
+    assert len(chunks) > 1
+    for chunk in chunks[:-1]:
+        assert not set(chunk["estagio"]) & set(chunks[-1]["estagio"])
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), expected
+    )
+    # O arquivo já lido é dividido nos mesmos blocos
+    assert not repo._is_loaded("get_pdo_oper_term")
+    repo.get_pdo_oper_term()
+    assert repo._is_loaded("get_pdo_oper_term")
+    assert [
+        len(c) for c in repo.iterate_table("get_pdo_oper_term", 10, "estagio")
+    ] == [len(c) for c in chunks]
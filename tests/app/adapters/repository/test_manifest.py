@@ -0,0 +1,135 @@
+import gzip
+import io
+import tarfile
+import zipfile
+from os.path import join
+
+import pytest
+
+from app.adapters.repository.manifest import (
+    ArchiveManifest,
+    DeckManifest,
+    case_manifest,
+)
+from app.utils.fs import case_fingerprint
+from tests.conftest import DECK_TEST_DIR
+
+
+def test_manifest_resolves_files(test_settings):
+    manifest = DeckManifest(DECK_TEST_DIR)
+    entry = manifest.find("pdo_eco_usih.dat")
+    assert entry.name == "PDO_ECO_USIH.DAT"
+    assert entry.size > 0
+    assert manifest.find("entdados.dat").name == "ENTDADOS.DAT"
+    assert manifest.find("nao_existe.dat", "Dadvaz.DAT").name == "dadvaz.dat"
+    assert not manifest.exists("PDO_OPERACAO.DAT")
+    with pytest.raises(FileNotFoundError):
+        manifest.find("PDO_OPERACAO.DAT")
+    assert manifest.version(entry) == "19.4.5"
+    assert manifest.version(manifest.find("dadvaz.dat")) is None
+    assert manifest.fingerprint == case_fingerprint(DECK_TEST_DIR)
+
+
+def test_manifest_refresh(tmp_path):
+    path = tmp_path.joinpath("PDO_SIST.DAT")
+    path.write_text("*  MODELO DESSEM     - VERSAO 19.4.5 - Teste\n")
+    manifest = DeckManifest(str(tmp_path))
+    entry = manifest.find("PDO_SIST.DAT")
+    assert manifest.version(entry) == "19.4.5"
+    path.write_text("*  MODELO DESSEM     - VERSAO 20.3 - Teste\n")
+    updated = manifest.refresh(entry)
+    assert updated.size != entry.size
+    assert manifest.version(updated) == "20.3"
+
+
+def _make_archive(tmp_path, suffix: str):
+    path = tmp_path.joinpath(f"caso{suffix}")
+    names = ["dessem.arq", "PDO_ECO_USIH.DAT", "dadvaz.dat"]
+    if suffix == ".zip":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name in names:
+                zf.write(join(DECK_TEST_DIR, name), f"caso/{name}")
+            zf.writestr("caso/sub/ENTDADOS.DAT", "")
+    else:
+        with tarfile.open(path, "w:gz") as tf:
+            for name in names:
+                tf.add(join(DECK_TEST_DIR, name), name)
+    return str(path)
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar.gz"])
+def test_archive_manifest(test_settings, tmp_path, suffix):
+    manifest = case_manifest(_make_archive(tmp_path, suffix))
+    assert isinstance(manifest, ArchiveManifest)
+    assert [e.name for e in manifest] == [
+        "PDO_ECO_USIH.DAT",
+        "dadvaz.dat",
+        "dessem.arq",
+    ]
+    assert not manifest.exists("ENTDADOS.DAT")
+    # Leituras fora da ordem do arquivo compactado
+    for name in ["dessem.arq", "DADVAZ.DAT", "PDO_ECO_USIH.DAT"]:
+        entry = manifest.find(name)
+        with open(join(DECK_TEST_DIR, entry.name), "rb") as f:
+            assert manifest.read(entry) == f.read()
+    assert manifest.version(manifest.find("PDO_ECO_USIH.DAT")) == "19.4.5"
+
+
+def test_compressed_files(tmp_path):
+    content = b"*  MODELO DESSEM     - VERSAO 19.4.5 - Teste\n"
+    with gzip.open(tmp_path.joinpath("PDO_SIST.DAT.gz"), "wb") as f:
+        f.write(content)
+    manifest = DeckManifest(str(tmp_path))
+    entry = manifest.find("pdo_sist.dat")
+    assert entry.compression == ".gz"
+    assert not manifest.is_local(entry)
+    assert manifest.read(entry) == content
+    assert manifest.version(entry) == "19.4.5"
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    try:
+        from compression import zstd  # type: ignore
+
+        return zstd.compress(data)
+    except ImportError:
+        pass
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def test_zstd_archive(tmp_path):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tf:
+        for name in ["dessem.arq", "dadvaz.dat"]:
+            tf.add(join(DECK_TEST_DIR, name), name)
+    path = tmp_path.joinpath("caso.tar.zst")
+    path.write_bytes(_zstd_compress(buffer.getvalue()))
+    manifest = case_manifest(str(path))
+    for name in ["dadvaz.dat", "dessem.arq", "dadvaz.dat"]:
+        with open(join(DECK_TEST_DIR, name), "rb") as f:
+            assert manifest.read(manifest.find(name)) == f.read()
+
+
+def test_zstd_file_lines(tmp_path):
+    with open(join(DECK_TEST_DIR, "dadvaz.dat"), "rb") as f:
+        content = f.read()
+    tmp_path.joinpath("dadvaz.dat.zst").write_bytes(_zstd_compress(content))
+    manifest = DeckManifest(str(tmp_path))
+    with manifest.open(manifest.find("dadvaz.dat")) as f:
+        assert list(f) == content.splitlines(keepends=True)
+
+
+def test_zstd_archive_member(tmp_path):
+    with open(join(DECK_TEST_DIR, "dadvaz.dat"), "rb") as f:
+        content = f.read()
+    path = tmp_path.joinpath("caso.zip")
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.write(join(DECK_TEST_DIR, "dessem.arq"), "dessem.arq")
+        zf.writestr("dadvaz.dat.zst", _zstd_compress(content))
+    manifest = case_manifest(str(path))
+    entry = manifest.find("dadvaz.dat")
+    assert entry.compression == ".zst"
+    assert manifest.read(entry) == content
+    with manifest.open(entry) as f:
+        assert list(f) == content.splitlines(keepends=True)
@@ -0,0 +1,34 @@
+from os.path import join
+
+import pandas as pd
+
+from app.adapters.repository.parsing import load_file, parse_file
+from tests.conftest import DECK_TEST_DIR
+
+
+def test_parse_file_round_trip(test_settings, tmp_path):
+    from idessem.dessem.pdo_oper_term import PdoOperTerm
+
+    path = join(DECK_TEST_DIR, "PDO_OPER_TERM.DAT")
+    parsed = parse_file(
+        "idessem.dessem.pdo_oper_term", "PdoOperTerm", path, str(tmp_path)
+    )
+    assert parsed.tables is not None
+    assert len(parsed.offsets) == 1
+    pdo = load_file(parsed)
+    assert not list(tmp_path.iterdir())
+    expected = PdoOperTerm.read(path)
+    assert pdo.versao == expected.versao
+    pd.testing.assert_frame_equal(pdo.tabela, expected.tabela)
+
+
+def test_parse_file_without_tables(test_settings, tmp_path):
+    parsed = parse_file(
+        "idessem.dessem.operuh",
+        "Operuh",
+        join(DECK_TEST_DIR, "operuh.dat"),
+        str(tmp_path),
+    )
+    assert parsed.tables is None
+    operuh = load_file(parsed)
+    assert isinstance(operuh.rest(df=True), pd.DataFrame)
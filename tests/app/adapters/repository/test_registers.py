@@ -0,0 +1,22 @@
+from app.adapters.repository.registers import RegisterIndex
+
+
+def test_register_index(tmp_path):
+    path = tmp_path.joinpath("ENTDADOS.DAT")
+    path.write_bytes(
+        b"& comentario\n"
+        b"TM  01 00 0 1.0 0 LEVE\n"
+        b"SIST  1 SE  0 SUDESTE\n"
+        b"\n"
+        b"TM  01 01 0 1.0 0 MEDIA\n"
+        b"TM  01 02 0 1.0 0 PESADA"
+    )
+    index = RegisterIndex(str(path))
+    assert index.registers == ["TM", "SIST"]
+    assert index.read(["TM"]) == (
+        b"TM  01 00 0 1.0 0 LEVE\n"
+        b"TM  01 01 0 1.0 0 MEDIA\n"
+        b"TM  01 02 0 1.0 0 PESADA\n"
+    )
+    assert index.read(["SIST", "TM"]).splitlines()[1].startswith(b"SIST")
+    assert index.read(["UH"]) == b""
@@ -0,0 +1,55 @@
+import pandas as pd
+from idessem.dessem.pdo_oper_term import PdoOperTerm
+
+from app.adapters.repository.tables import (
+    chunk_table,
+    iterate_table,
+    table_block,
+)
+
+LINES = [
+    "-----;-----;------;--------------;--------;--------;\n",
+    "ESTAG;CODIG;CODIGO;    NOME_USINA;NOME_SUB;   BARRA;\n",
+    "-----;-----;------;--------------;--------;--------;\n",
+    "1;1;1;UTE 1;SE;1;10.00;5.00;1.00;2.00\n",
+    "1;1;2;UTE 1;SE;1;20.00;4.00;1.00;2.00\n",
+    "1;2;1;UTE 2;S;2;30.00;3.00;1.00;2.00\n",
+    "2;1;1;UTE 1;SE;1;40.00;5.00;1.00;2.00\n",
+    "2;1;2;UTE 1;SE;1;50.00;4.00;1.00;2.00\n",
+    "2;2;1;UTE 2;S;2;60.00;3.00;1.00;2.00\n",
+    "3;1;1;UTE 1;SE;1;70.00;5.00;1.00;2.00\n",
+    "\n",
+]
+
+
+def test_iterate_table_key_aligned():
+    chunks = list(iterate_table(LINES, table_block(PdoOperTerm), 2, "estagio"))
+    assert [c["estagio"].unique().tolist() for c in chunks] == [
+        [1],
+        [2],
+        [3],
+    ]
+    df = pd.concat(chunks, ignore_index=True)
+    assert df["geracao"].tolist() == [10, 20, 30, 40, 50, 60, 70]
+    assert df["nome_usina"].tolist()[0] == "UTE 1"
+
+
+def test_iterate_table_without_key():
+    chunks = list(iterate_table(LINES, table_block(PdoOperTerm), 4))
+    assert [len(c) for c in chunks] == [4, 3]
+
+
+def test_iterate_table_empty():
+    chunks = list(iterate_table(LINES[:3], table_block(PdoOperTerm), 4))
+    assert len(chunks) == 1
+    assert chunks[0].empty
+    assert "geracao" in chunks[0].columns
+
+
+def test_chunk_table_matches_stream():
+    block = table_block(PdoOperTerm)
+    df = pd.concat(iterate_table(LINES, block), ignore_index=True)
+    for chunk_rows in [1, 2, 4, 10]:
+        streamed = list(iterate_table(LINES, block, chunk_rows, "estagio"))
+        chunked = list(chunk_table(df, chunk_rows, "estagio"))
+        assert [len(c) for c in chunked] == [len(c) for c in streamed]
@@ -1,5 +1,11 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
 from app.services.deck.deck import Deck
 from app.services.unitofwork import factory
+from benchmarks.generator import DeckScale, generate_deck
 from tests.conftest import DECK_TEST_DIR
 
 uow = factory("FS", DECK_TEST_DIR)
@@ -74,3 +80,102 @@ def test_pdo_oper_term_ute(test_settings):
 def test_pdo_operacao_costs(test_settings):
     val = deck.pdo_operacao_costs("custo_presente", uow)
     assert val.shape == (70, 7)
+
+
+def test_projected_columns(test_settings, tmp_path):
+    generate_deck(tmp_path, DeckScale(stages=4, hydros=2, thermals=2))
+    case_uow = factory("FS", str(tmp_path))
+    Deck.clear_cache()
+    try:
+        expected_cmo = deck.pdo_sist_sbm("cmo", case_uow)
+        expected_qdef = deck.pdo_hidr_hydro("vazao_defluente_m3s", case_uow)
+        Deck.clear_cache()
+        Deck.require_columns("pdo_sist", ["demanda_liquida"])
+        Deck.require_columns("pdo_hidr", ["vazao_defluente_m3s"])
+        df_sist = deck.pdo_sist(case_uow)
+        assert "geracao_renovavel" in df_sist.columns
+        assert "cmo" not in df_sist.columns
+        df_hidr = deck.pdo_hidr(case_uow)
+        assert "vazao_turbinada_m3s" in df_hidr.columns
+        assert "volume_final_absoluto_hm3" not in df_hidr.columns
+        pd.testing.assert_frame_equal(
+            deck.pdo_hidr_hydro("vazao_defluente_m3s", case_uow).reset_index(
+                drop=True
+            ),
+            expected_qdef.reset_index(drop=True),
+        )
+        pd.testing.assert_frame_equal(
+            deck.pdo_sist_sbm("cmo", case_uow), expected_cmo
+        )
+        assert "cmo" in deck.pdo_sist(case_uow).columns
+    finally:
+        Deck.clear_cache()
+
+
+def test_thermal_tables_chunked(test_settings, tmp_path):
+    generate_deck(tmp_path, DeckScale(stages=4, hydros=2, thermals=3))
+    case_uow = factory("FS", str(tmp_path))
+    tables = [
+        Deck.pdo_oper_term,
+        Deck.thermals,
+        Deck.thermal_costs,
+        Deck.thermal_generation_bounds,
+    ]
+    Deck.clear_cache()
+    try:
+        expected = [table(case_uow) for table in tables]
+        Deck.clear_cache()
+        with patch.object(Deck, "UNIT_CHUNK_ROWS", 4):
+            for table, df in zip(tables, expected):
+                pd.testing.assert_frame_equal(table(case_uow), df)
+        with case_uow:
+            units = case_uow.files.get_pdo_oper_term().tabela
+        assert expected[0]["geracao"].sum() == pytest.approx(
+            units["geracao"].sum()
+        )
+    finally:
+        Deck.clear_cache()
+
+
+def test_derived_columns_lazy(test_settings, tmp_path):
+    generate_deck(tmp_path, DeckScale(stages=3, hydros=2, thermals=1))
+    case_uow = factory("FS", str(tmp_path))
+    Deck.clear_cache()
+    try:
+        deck.pdo_hidr_hydro("vazao_turbinada_m3s", case_uow)
+        cached = Deck.DECK_DATA_CACHING["pdo_hidr"]
+        assert "vazao_defluente_m3s" not in cached.columns
+        assert "volume_final_absoluto_hm3" not in cached.columns
+        df = deck.pdo_hidr_hydro("volume_inicial_absoluto_hm3", case_uow)
+        cached = Deck.DECK_DATA_CACHING["pdo_hidr"]
+        assert "volume_final_absoluto_hm3" in cached.columns
+        assert "vazao_defluente_m3s" not in cached.columns
+        # O volume inicial de cada estágio é o final do estágio anterior
+        final = deck.pdo_hidr_hydro("volume_final_absoluto_hm3", case_uow)
+        for _, hydro in df.groupby("codigo_usina"):
+            previous = final.loc[hydro.index, "valor"].to_numpy()[:-1]
+            assert (hydro["valor"].to_numpy()[1:] == previous).all()
+    finally:
+        Deck.clear_cache()
+
+
+def test_entity_code_maps(test_settings, tmp_path):
+    generate_deck(tmp_path, DeckScale(stages=2, hydros=3, thermals=2))
+    case_uow = factory("FS", str(tmp_path))
+    Deck.clear_cache()
+    try:
+        with patch.object(
+            Deck, "submarkets", wraps=Deck.submarkets
+        ) as submarkets:
+            deck.pdo_sist(case_uow)
+            deck.pdo_inter(case_uow)
+            assert submarkets.call_count == 1
+        hydros = deck.hydro_eer_submarket_map(case_uow)
+        df = deck.pdo_hidr(case_uow)
+        expected = df[["codigo_usina"]].merge(
+            hydros, how="left", on="codigo_usina"
+        )
+        for col in ["codigo_ree", "codigo_submercado"]:
+            assert (df[col].to_numpy() == expected[col].to_numpy()).all()
+    finally:
+        Deck.clear_cache()
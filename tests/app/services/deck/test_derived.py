@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from app.services.deck.derived import (
+    DerivedColumn,
+    derive_columns,
+    source_columns,
+)
+
+DERIVED = {
+    "c": DerivedColumn(["a", "b"], lambda df, ctx: df["a"] + df["b"]),
+    "d": DerivedColumn(["c"], lambda df, ctx: ctx * df["c"]),
+}
+
+
+def test_source_columns():
+    assert source_columns(DERIVED, ["d"]) == {"a", "b", "c", "d"}
+    assert source_columns(DERIVED, ["a"]) == {"a"}
+
+
+def test_derive_columns_in_dependency_order():
+    df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    assert derive_columns("t", df, DERIVED, ["d"], 10) == ["c", "d"]
+    assert df["d"].tolist() == [40, 60]
+    # As colunas já calculadas não são recalculadas
+    assert derive_columns("t", df, DERIVED, ["c", "d"], 0) == []
+    assert df["d"].tolist() == [40, 60]
+
+
+def test_derive_columns_circular():
+    derived = {
+        "x": DerivedColumn(["y"], lambda df, ctx: df["y"]),
+        "y": DerivedColumn(["x"], lambda df, ctx: df["x"]),
+    }
+    with pytest.raises(ValueError):
+        derive_columns("t", pd.DataFrame({"a": [1]}), derived, ["x"], None)
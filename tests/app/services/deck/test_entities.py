@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from app.services.deck.entities import CodeMap, EntityRegistry
+
+
+def test_code_map_lookup():
+    code_map = CodeMap(["SE", "S", "NE"], [1, 2, 3])
+    codes = code_map.lookup(pd.Series(["NE", "SE", "SE"]))
+    assert codes.dtype == np.int64
+    assert codes.tolist() == [3, 1, 1]
+    # Chaves inexistentes resultam em NaN, assim como no `map` do pandas
+    codes = code_map.lookup(["S", "N"])
+    assert codes[0] == 2
+    assert np.isnan(codes[1])
+
+
+def test_code_map_repeated_keys_and_compose():
+    hydro_eer = CodeMap([6, 8, 6], [10, 11, 12])
+    assert hydro_eer.lookup([6]).tolist() == [12]
+    eer_submarket = CodeMap([10, 11, 12], [1, 1, 2])
+    hydro_submarket = hydro_eer.compose(eer_submarket)
+    assert hydro_submarket.lookup([8, 6]).tolist() == [1, 2]
+    assert len(hydro_submarket) == 2
+
+
+def test_entity_registry_builds_once():
+    calls = []
+
+    def build(context):
+        calls.append(context)
+        return CodeMap([1, 2], [5, 6])
+
+    registry = EntityRegistry({"hydro_eer": build})
+    assert registry.lookup("hydro_eer", [2, 1], "uow").tolist() == [6, 5]
+    assert registry.lookup("hydro_eer", [1], "uow").tolist() == [5]
+    assert calls == ["uow"]
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+import pandas as pd
+
+from app.adapters.repository.files import RawFilesRepository
+from app.services.deck.deck import Deck
+from app.services.deck.store import DeckTableStore
+from app.services.unitofwork import factory
+from benchmarks.generator import DeckScale, generate_deck
+
+
+def test_publish_and_attach(tmp_path):
+    store = DeckTableStore(str(tmp_path), "caso")
+    assert store.attach("pdo_sist") is None
+    df = pd.DataFrame(
+        {
+            "estagio": [1, 2, 3],
+            "nome_submercado": ["SE", "S", "NE"],
+            "valor": [1.0, 2.0, 3.0],
+            "data_inicio": pd.date_range("2023-01-01", periods=3),
+        },
+        index=[2, 0, 1],
+    )
+    store.publish("pdo_sist", df)
+    assert store.tables() == ["pdo_sist"]
+    attached = store.attach("pdo_sist")
+    pd.testing.assert_frame_equal(attached, df)
+    # As colunas numéricas referenciam diretamente a memória mapeada
+    assert not attached["valor"].to_numpy().flags.writeable
+    store.clear()
+    assert store.tables() == []
+
+
+def test_deck_tables_shared_between_processes(test_settings, tmp_path):
+    generate_deck(tmp_path, DeckScale(stages=4, hydros=2, thermals=3))
+    case_uow = factory("FS", str(tmp_path))
+    store = DeckTableStore(str(tmp_path.joinpath("tabelas")), "caso")
+    tables = [Deck.pdo_sist, Deck.pdo_hidr, Deck.thermals]
+    Deck.clear_cache()
+    try:
+        expected = [table(case_uow).reset_index(drop=True) for table in tables]
+        Deck.clear_cache()
+        Deck.use_store(store)
+        Deck.require_columns("pdo_sist", ["cmo"])
+        for table, df in zip(tables, expected):
+            pd.testing.assert_frame_equal(
+                table(case_uow).reset_index(drop=True), df
+            )
+        assert {"pdo_sist", "pdo_hidr", "thermals"} <= set(store.tables())
+        # Com o cache vazio, como em um novo processo, as tabelas são
+        # anexadas do repositório, sem leitura dos arquivos do caso
+        Deck.clear_cache()
+        with (
+            patch.object(RawFilesRepository, "get_pdo_sist") as pdo_sist,
+            patch.object(RawFilesRepository, "get_pdo_hidr") as pdo_hidr,
+        ):
+            for table, df in zip(tables, expected):
+                pd.testing.assert_frame_equal(
+                    table(case_uow).reset_index(drop=True), df
+                )
+        pdo_sist.assert_not_called()
+        pdo_hidr.assert_not_called()
+    finally:
+        Deck.use_store(None)
+        Deck.clear_cache()
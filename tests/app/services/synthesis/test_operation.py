@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pandas as pd
+import pytest
 from idessem.dessem.pdo_eolica import PdoEolica
 from idessem.dessem.pdo_hidr import PdoHidr
 from idessem.dessem.pdo_inter import PdoInter
@@ -21,8 +22,11 @@ from app.internal.constants import (
 )
 from app.model.operation.operationsynthesis import UNITS, OperationSynthesis
 from app.services.deck.bounds import OperationVariableBounds
+from app.services.deck.deck import Deck
 from app.services.synthesis.operation import OperationSynthetizer
 from app.services.unitofwork import factory
+from app.utils.operations import calc_scenario_statistics
+from benchmarks.generator import DeckScale, generate_scenarios
 from tests.conftest import DECK_TEST_DIR
 
 uow = factory("FS", DECK_TEST_DIR)
@@ -916,3 +920,36 @@ def test_sintese_int_sbp(test_settings):
         nome_submercado_para=["IV"],
     )
     __valida_metadata(synthesis_str, df_meta, False)
+
+
+def test_sintese_multiplos_cenarios(test_settings, tmp_path):
+    scale = DeckScale(
+        stages=4,
+        hydros=2,
+        thermals=2,
+        units=1,
+        submarkets=2,
+        eers_per_submarket=1,
+        winds=1,
+    )
+    generate_scenarios(tmp_path, scale, 2)
+    case_uow = factory("MEMORY", str(tmp_path))
+    Deck.clear_cache()
+    try:
+        OperationSynthetizer.synthetize(["CMO_SBM"], case_uow)
+    finally:
+        OperationSynthetizer.clear_cache()
+        Deck.clear_cache()
+    tables = case_uow.export.tables
+    df = tables["CMO_SBM"].to_pandas()
+    assert df["cenario"].unique().tolist() == [1, 2]
+    for scenario in [1, 2]:
+        pdo = PdoSist.read(
+            join(str(tmp_path), f"cenario_{scenario:03d}", "PDO_SIST.DAT")
+        ).tabela
+        df_scenario = df.loc[df["cenario"] == scenario]
+        assert df_scenario[VALUE_COL].sum() == pytest.approx(
+            pdo.loc[pdo["nome_submercado"] != "FC", "cmo"].sum()
+        )
+    df_stats = tables["ESTATISTICAS_OPERACAO_SBM"].to_pandas()
+    assert len(df_stats) == len(calc_scenario_statistics(df))
@@ -0,0 +1,67 @@
+from app.model.operation.operationsynthesis import (
+    SUPPORTED_SYNTHESIS,
+    SYNTHESIS_SOURCES,
+    OperationSynthesis,
+)
+from app.services.deck.bounds import OperationVariableBounds
+from app.services.deck.deck import Deck
+from app.services.synthesis.operation import OperationSynthetizer
+from app.services.synthesis.planner import TABLE_READERS, SynthesisPlan
+
+
+def __synthesis(*names: str) -> list[OperationSynthesis]:
+    return [OperationSynthesis.factory(n) for n in names]
+
+
+def test_registry_covers_supported_synthesis():
+    for name in SUPPORTED_SYNTHESIS:
+        source = SYNTHESIS_SOURCES[OperationSynthesis.factory(name)]
+        assert callable(getattr(OperationSynthetizer, source.resolver))
+        assert source.table in TABLE_READERS
+        if source.bounds is not None:
+            assert callable(
+                getattr(OperationVariableBounds, source.bounds.method)
+            )
+            for table in source.bounds.tables:
+                assert callable(getattr(Deck, table))
+                assert table in TABLE_READERS
+
+
+def test_synthesis_hash_and_equality():
+    s = OperationSynthesis.factory("VARMF_UHE")
+    assert s == OperationSynthesis.factory("VARMF_UHE")
+    assert s != OperationSynthesis.factory("VARMF_SBM")
+    assert {s: 1}[OperationSynthesis.factory("VARMF_UHE")] == 1
+    assert str(s) == "VARMF_UHE"
+
+
+def test_plan_readers_columns_and_bounds():
+    plan = SynthesisPlan.build(__synthesis("CMO_SBM", "QTUR_UHE", "GTER_UTE"))
+    assert plan.readers == [
+        "get_pdo_sist",
+        "get_pdo_operacao",
+        "get_pdo_hidr",
+        "get_pdo_oper_term",
+        "get_pdo_oper_uct",
+    ]
+    assert plan.columns["pdo_sist"] == {"cmo"}
+    assert plan.columns["pdo_hidr"] == {
+        "vazao_turbinada_m3s",
+        "vazao_turbinada_minima_m3s",
+        "vazao_turbinada_maxima_m3s",
+        "engolimento_maximo_m3s",
+    }
+
+
+def test_plan_repeated_synthesis_and_bounds_readers():
+    synthesis = __synthesis("VARMF_UHE", "VARMF_SBM", "VARMF_SIN", "MER_SBM")
+    plan = SynthesisPlan.build(synthesis + synthesis[:1])
+    assert plan.synthesis == synthesis
+    assert "get_pdo_eco_usih" in plan.readers
+
+
+def test_plan_ignores_unregistered_synthesis():
+    plan = SynthesisPlan.build(__synthesis("VAGUA_SBM"))
+    assert plan.synthesis == []
+    assert plan.readers == []
+    assert plan.columns == {}
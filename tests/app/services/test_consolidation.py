@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pandas as pd  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+
+from app.services.consolidation import MANIFEST_FILENAME, CaseConsolidator
+
+
+def _make_case(path, start: datetime, value: float = 1.0):
+    outdir = path.joinpath("sintese")
+    outdir.mkdir(parents=True)
+    pd.DataFrame(
+        {
+            "estagio": [1, 2],
+            "data_inicio": [start, start + pd.Timedelta(hours=1)],
+        }
+    ).to_parquet(outdir.joinpath("EST.parquet"))
+    pd.DataFrame(
+        {
+            "codigo_submercado": [1, 2],
+            "estagio": [1, 1],
+            "valor": [value, 2 * value],
+        }
+    ).to_parquet(outdir.joinpath("CMO_SBM.parquet"))
+    return path
+
+
+def _read(destination, output: str) -> pd.DataFrame:
+    dataset = ds.dataset(destination, partitioning="hive")
+    return dataset.to_table(filter=ds.field("saida") == output).to_pandas()
+
+
+def test_consolidate_partitions_cases(tmp_path):
+    _make_case(tmp_path.joinpath("casos", "a"), datetime(2023, 1, 1))
+    _make_case(tmp_path.joinpath("casos", "b"), datetime(2023, 1, 2))
+    destination = tmp_path.joinpath("historico")
+    entries = CaseConsolidator(str(destination)).consolidate(
+        [str(tmp_path.joinpath("casos"))]
+    )
+    assert sorted(e.caso for e in entries) == ["a", "b"]
+    assert destination.joinpath(
+        "saida=CMO_SBM", "data_caso=2023-01-02"
+    ).is_dir()
+    df = _read(destination, "CMO_SBM")
+    assert len(df) == 4
+    assert sorted(df["caso"].unique()) == ["a", "b"]
+    assert set(df["data_caso"].astype(str)) == {"2023-01-01", "2023-01-02"}
+
+
+def test_consolidate_skips_ingested_cases(tmp_path):
+    _make_case(tmp_path.joinpath("casos", "a"), datetime(2023, 1, 1))
+    destination = str(tmp_path.joinpath("historico"))
+    assert len(CaseConsolidator(destination).consolidate([str(tmp_path)])) == 1
+    _make_case(tmp_path.joinpath("casos", "b"), datetime(2023, 1, 2))
+    entries = CaseConsolidator(destination).consolidate([str(tmp_path)])
+    assert [e.caso for e in entries] == ["b"]
+    assert CaseConsolidator(destination).consolidate([str(tmp_path)]) == []
+    lines = tmp_path.joinpath("historico", MANIFEST_FILENAME).read_text()
+    assert len(lines.splitlines()) == 2
+
+
+def test_consolidate_reingests_modified_case(tmp_path):
+    case = _make_case(tmp_path.joinpath("casos", "a"), datetime(2023, 1, 1))
+    destination = str(tmp_path.joinpath("historico"))
+    CaseConsolidator(destination).consolidate([str(tmp_path.joinpath("casos"))])
+    pd.DataFrame(
+        {"codigo_submercado": [1, 2], "estagio": [1, 1], "valor": [5.0, 6.0]}
+    ).to_parquet(case.joinpath("sintese", "CMO_SBM.parquet"))
+    entries = CaseConsolidator(destination).consolidate(
+        [str(tmp_path.joinpath("casos"))]
+    )
+    assert [e.caso for e in entries] == ["a"]
+    df = _read(destination, "CMO_SBM")
+    assert sorted(df["valor"]) == [5.0, 6.0]
@@ -0,0 +1,41 @@
+import pandas as pd
+
+import app.domain.commands as commands
+import app.services.handlers as handlers
+from app.services.deck.deck import Deck
+from app.services.synthesis.operation import OperationSynthetizer
+from app.services.unitofwork import factory
+from benchmarks.generator import DeckScale, generate_deck
+
+
+def __synthetize_complete(path, concurrent: bool) -> dict[str, pd.DataFrame]:
+    Deck.clear_cache()
+    OperationSynthetizer.clear_cache()
+    uow = factory("MEMORY", str(path))
+    command = commands.SynthetizeComplete(
+        ["EST", "UTE", "CVU"],
+        ["CMO_SBM", "GTER_UTE", "VARMF_UHE"],
+        ["CUSTOS", "TEMPO"],
+        concurrent=concurrent,
+    )
+    handlers.synthetize_complete(command, uow)
+    return {
+        name: table.to_pandas() for name, table in uow.export.tables.items()
+    }
+
+
+def test_synthetize_complete_concurrent(test_settings, tmp_path):
+    generate_deck(tmp_path, DeckScale(stages=4, hydros=2, thermals=3))
+    try:
+        expected = __synthetize_complete(tmp_path, concurrent=False)
+        result = __synthetize_complete(tmp_path, concurrent=True)
+    finally:
+        Deck.clear_cache()
+        OperationSynthetizer.clear_cache()
+    for name in ["EST", "UTE", "CMO_SBM", "GTER_UTE", "VARMF_UHE", "CUSTOS"]:
+        assert name in result
+    assert sorted(result) == sorted(expected)
+    for name, df in expected.items():
+        if name.startswith("METADADOS"):
+            continue
+        pd.testing.assert_frame_equal(result[name], df)
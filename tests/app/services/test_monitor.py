@@ -0,0 +1,106 @@
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app.model.settings import Settings
+from app.services.monitor import CaseMonitor, InotifyWatcher
+from tests.conftest import DECK_TEST_DIR
+
+CASE_FILES = ["dessem.arq", "ENTDADOS.DAT", "dadvaz.dat"]
+
+
+def _make_case(path, with_log: bool = True):
+    path.mkdir(parents=True)
+    for f in CASE_FILES:
+        shutil.copy(os.path.join(DECK_TEST_DIR, f), path)
+    if with_log:
+        path.joinpath("DES_LOG_RELATO.DAT").write_text("")
+    return path
+
+
+def test_scan_debounces_cases(tmp_path):
+    case = _make_case(tmp_path.joinpath("caso"))
+    _make_case(tmp_path.joinpath("incompleto"), with_log=False)
+    monitor = CaseMonitor(str(tmp_path), debounce=5.0)
+    assert monitor.scan(0.0) == []
+    assert monitor.scan(3.0) == []
+    case.joinpath("DES_LOG_RELATO.DAT").write_text("...")
+    assert monitor.scan(6.0) == []
+    assert monitor.scan(12.0) == [case]
+
+
+def test_scan_respects_capacity(tmp_path):
+    for name in ["caso1", "caso2", "caso3"]:
+        _make_case(tmp_path.joinpath(name))
+    monitor = CaseMonitor(str(tmp_path), workers=2, debounce=1.0)
+    assert monitor.scan(0.0) == []
+    assert len(monitor.scan(2.0)) == 2
+    assert len(monitor.scan(3.0)) == 1
+
+
+def test_scan_archive_cases(tmp_path):
+    case = _make_case(tmp_path.joinpath("caso"))
+    archive = shutil.make_archive(
+        str(tmp_path.joinpath("arquivado")), "zip", case
+    )
+    shutil.rmtree(case)
+    monitor = CaseMonitor(str(tmp_path), debounce=1.0)
+    assert monitor.scan(0.0) == []
+    assert monitor.scan(2.0) == [Path(archive)]
+    outdir = tmp_path.joinpath("arquivado", Settings().synthesis_dir)
+    outdir.mkdir(parents=True)
+    outdir.joinpath("METADADOS_SISTEMA.parquet").write_text("")
+    assert CaseMonitor(str(tmp_path), debounce=0.0).scan(0.0) == []
+
+
+def test_scan_skips_synthetized_cases(tmp_path):
+    case = _make_case(tmp_path.joinpath("caso"))
+    outdir = case.joinpath(Settings().synthesis_dir)
+    outdir.mkdir()
+    outdir.joinpath("METADADOS_SISTEMA.parquet").write_text("")
+    monitor = CaseMonitor(str(tmp_path), debounce=0.0)
+    assert monitor.scan(0.0) == []
+    assert monitor.scan(1.0) == []
+
+
+@pytest.mark.parametrize(
+    "use_inotify",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not InotifyWatcher.available(), reason="inotify indisponível"
+            ),
+        ),
+    ],
+)
+def test_monitor_synthetizes_finished_cases(
+    test_settings, monkeypatch, tmp_path, use_inotify
+):
+    monkeypatch.setattr(Settings(), "synthesis_format", "PARQUET")
+    monitor = CaseMonitor(
+        str(tmp_path),
+        workers=1,
+        debounce=0.2,
+        interval=0.1,
+        sistema=["REE"],
+        use_inotify=use_inotify,
+    )
+    stop = threading.Event()
+    thread = threading.Thread(target=monitor.run, args=(stop,))
+    thread.start()
+    try:
+        case = _make_case(tmp_path.joinpath("rodada", "caso"))
+        output = case.joinpath(Settings().synthesis_dir, "REE.parquet")
+        deadline = time.monotonic() + 60.0
+        while not output.exists() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert output.exists()
+    finally:
+        stop.set()
+        thread.join()
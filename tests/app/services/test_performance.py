@@ -0,0 +1,62 @@
+from app.api import run_synthesis
+from app.internal.constants import PERFORMANCE_METADATA_OUTPUT
+from app.services.deck.deck import Deck
+from app.services.performance import PerformanceCollector, performance_session
+from app.services.unitofwork import MemoryUnitOfWork
+from app.utils.tracing import Tracer
+from tests.conftest import DECK_TEST_DIR
+
+
+def test_performance_report_from_spans():
+    collector = PerformanceCollector()
+    Tracer.add_listener(collector)
+    try:
+        with Tracer.span("familia", familia="operacao"):
+            with Tracer.span("sintese", chave="CMO_SBM"):
+                with Tracer.span("resolucao", chave="CMO_SBM"):
+                    with Tracer.span("deck", tabela="pdo_sist", cache=False):
+                        with Tracer.span(
+                            "leitura", arquivo="PDO_SIST.DAT", bytes=2048
+                        ):
+                            pass
+                    with Tracer.span("deck", tabela="pdo_sist", cache=True):
+                        pass
+                with Tracer.span("exportacao", chave="CMO_SBM"):
+                    with Tracer.span("escrita", arquivo="CMO_SBM.parquet") as s:
+                        s.set(linhas=10, colunas=4, bytes=1000)
+            with Tracer.span("escrita", arquivo="METADADOS_OPERACAO.parquet"):
+                Tracer.current().set(linhas=1, colunas=8, bytes=500)
+    finally:
+        Tracer.remove_listener(collector)
+
+    df = collector.report().set_index(["tipo", "chave"])
+    synthesis = df.loc[("sintese", "CMO_SBM")]
+    assert synthesis["familia"] == "operacao"
+    assert (synthesis["linhas"], synthesis["colunas"]) == (10, 4)
+    assert synthesis["bytes"] == 1000
+    assert (synthesis["acertos_cache"], synthesis["faltas_cache"]) == (1, 1)
+    assert 0 < synthesis["tempo_resolucao_s"] <= synthesis["tempo_s"]
+    assert df.loc[("saida", "METADADOS_OPERACAO"), "linhas"] == 1
+    assert df.loc[("arquivo", "PDO_SIST.DAT"), "bytes"] == 2048
+    total = df.loc[("total", "")]
+    assert (total["linhas"], total["bytes"]) == (11, 1500)
+    assert total["linhas_por_s"] > 0 and total["mb_por_s"] > 0
+
+
+def test_performance_session_exports_report(test_settings):
+    uow = MemoryUnitOfWork(DECK_TEST_DIR)
+    Deck.clear_cache()
+    try:
+        with performance_session(uow):
+            run_synthesis(uow, sistema=["SBM", "UTE"])
+    finally:
+        Deck.clear_cache()
+    assert not Tracer.active()
+
+    df = uow.export.tables[PERFORMANCE_METADATA_OUTPUT].to_pandas()
+    synthesis = df.loc[df["tipo"] == "sintese"].set_index("chave")
+    assert synthesis.loc["UTE", "linhas"] == uow.export.tables["UTE"].num_rows
+    assert synthesis.loc["UTE", "bytes"] > 0
+    files = df.loc[df["tipo"] == "arquivo", "chave"].tolist()
+    assert "ENTDADOS.DAT" in files
+    assert df["tipo"].iloc[-1] == "total"
@@ -0,0 +1,46 @@
+import json
+from os.path import join
+
+from app.api import run_synthesis
+from app.services.deck.deck import Deck
+from app.services.profiling import memory_session, profiling_session
+from app.services.synthesis.operation import OperationSynthetizer
+from app.services.unitofwork import MemoryUnitOfWork
+from app.utils.tracing import Tracer, trace_session
+from tests.conftest import DECK_TEST_DIR
+
+
+def test_memory_session_reports_caches(test_settings, tmp_path):
+    Deck.clear_cache()
+    OperationSynthetizer.clear_cache()
+    try:
+        with memory_session(str(tmp_path)) as session:
+            run_synthesis(MemoryUnitOfWork(DECK_TEST_DIR), sistema=["UTE"])
+    finally:
+        Deck.clear_cache()
+    assert not Tracer.active()
+
+    targets = {(r.stage, r.target) for r in session.profiler.records}
+    assert ("sintese", "UTE") in targets
+    assert ("deck", "thermals") in targets
+    assert ("leitura", "ENTDADOS.DAT") in targets
+    with open(join(tmp_path, memory_session.FILENAME)) as f:
+        report = json.load(f)
+    assert report["caches"]["deck"]["entdados_sist"] > 0
+    assert report["caches"]["deck"]["thermals"] > 0
+    assert len(report["maiores_consumidores"]) <= 10
+
+
+def test_profiling_session_disabled(tmp_path):
+    with profiling_session(str(tmp_path)):
+        assert not Tracer.active()
+    assert list(tmp_path.iterdir()) == []
+
+    with profiling_session(str(tmp_path), perfil=True, memoria=True):
+        assert Tracer.active()
+    assert not Tracer.active()
+    assert {p.name for p in tmp_path.iterdir()} == {
+        memory_session.FILENAME,
+        trace_session.JSONL_FILENAME,
+        trace_session.CHROME_FILENAME,
+    }
@@ -0,0 +1,89 @@
+import io
+from datetime import datetime
+
+import pandas as pd  # type: ignore
+import pyarrow as pa  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from app.services.consolidation import CaseConsolidator
+from app.services.query import SynthesisQuery, write_query
+
+
+def _make_case(path, start: datetime):
+    outdir = path.joinpath("sintese")
+    outdir.mkdir(parents=True)
+    dates = [start + pd.Timedelta(hours=h) for h in range(3)]
+    pd.DataFrame({"estagio": [1, 2, 3], "data_inicio": dates}).to_parquet(
+        outdir.joinpath("EST.parquet")
+    )
+    pd.DataFrame(
+        {
+            "codigo_usina": [1, 1, 1, 2, 2, 2],
+            "codigo_submercado": [1] * 6,
+            "estagio": [1, 2, 3] * 2,
+            "data_inicio": dates * 2,
+            "patamar": [1, 2, 1, 2, 1, 2],
+            "valor": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        }
+    ).to_parquet(outdir.joinpath("GHID_UHE.parquet"))
+    return path
+
+
+def test_query_filters_and_projects(tmp_path):
+    case = _make_case(tmp_path.joinpath("caso"), datetime(2023, 1, 1))
+    df = (
+        SynthesisQuery(
+            str(case),
+            "GHID_UHE",
+            codigos=[2],
+            filtros={"patamar": ["2"]},
+            estagios=(1, 3),
+            inicio="2023-01-01 00:00",
+            fim=datetime(2023, 1, 1, 1),
+            colunas=["estagio", "valor"],
+        )
+        .to_table()
+        .to_pandas()
+    )
+    assert df.columns.tolist() == ["estagio", "valor"]
+    assert df["valor"].tolist() == [4.0]
+
+
+def test_query_consolidated_history(tmp_path):
+    _make_case(tmp_path.joinpath("casos", "a"), datetime(2023, 1, 1))
+    _make_case(tmp_path.joinpath("casos", "b"), datetime(2023, 1, 2))
+    destination = str(tmp_path.joinpath("historico"))
+    CaseConsolidator(destination).consolidate([str(tmp_path.joinpath("casos"))])
+    table = SynthesisQuery(
+        destination, "GHID_UHE", codigos=[1], casos=["b"]
+    ).to_table()
+    assert table.num_rows == 3
+    assert set(table.column("caso").to_pylist()) == {"b"}
+    assert set(table.column("data_caso").to_pylist()) == {"2023-01-02"}
+
+
+def test_query_validates_inputs(tmp_path):
+    case = _make_case(tmp_path.joinpath("caso"), datetime(2023, 1, 1))
+    with pytest.raises(FileNotFoundError):
+        SynthesisQuery(str(case), "CMO_SBM").to_table()
+    with pytest.raises(ValueError):
+        SynthesisQuery(str(case), "EST", codigos=[1]).to_table()
+    with pytest.raises(ValueError):
+        SynthesisQuery(str(case), "GHID_UHE", colunas=["foo"]).to_table()
+
+
+@pytest.mark.parametrize("formato", ["CSV", "PARQUET", "ARROW"])
+def test_write_query_formats(tmp_path, formato):
+    case = _make_case(tmp_path.joinpath("caso"), datetime(2023, 1, 1))
+    query = SynthesisQuery(str(case), "GHID_UHE", codigos=[1])
+    sink = io.BytesIO()
+    write_query(query.reader(), formato, sink)
+    data = sink.getvalue()
+    if formato == "CSV":
+        df = pd.read_csv(io.BytesIO(data))
+    elif formato == "PARQUET":
+        df = pq.read_table(pa.BufferReader(data)).to_pandas()
+    else:
+        df = pa.ipc.open_stream(data).read_all().to_pandas()
+    assert df["valor"].tolist() == [1.0, 2.0, 3.0]
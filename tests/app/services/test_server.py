@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import threading
+import urllib.request
+
+import pyarrow as pa
+
+from app.services.deck.deck import Deck
+from app.services.server import (
+    ARROW_STREAM_CONTENT_TYPE,
+    SynthesisServer,
+    SynthesisService,
+)
+from app.utils.fs import case_fingerprint
+from tests.conftest import DECK_TEST_DIR
+
+CASE_FILES = ["dessem.arq", "ENTDADOS.DAT", "dadvaz.dat"]
+
+
+def _copy_case(tmp_path):
+    for f in CASE_FILES:
+        shutil.copy(os.path.join(DECK_TEST_DIR, f), tmp_path)
+    return tmp_path
+
+
+def _post(url: str, job: dict):
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(job).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req) as res:
+        return res.headers["Content-Type"], res.read()
+
+
+def test_case_fingerprint_changes_with_files(tmp_path):
+    case = _copy_case(tmp_path)
+    before = case_fingerprint(case)
+    assert case_fingerprint(case) == before
+    with open(case.joinpath("dadvaz.dat"), "a") as f:
+        f.write("\n")
+    assert case_fingerprint(case) != before
+
+
+def test_service_reuses_warm_case(test_settings, tmp_path):
+    case = _copy_case(tmp_path)
+    service = SynthesisService()
+    tables = service.synthesize(str(case), sistema=["REE"])
+    assert tables["REE"].num_rows == 12
+    assert service.misses == 1
+    tables = service.synthesize(str(case), sistema=["REE"])
+    assert tables["REE"].num_rows == 12
+    assert service.hits == 1
+    os.utime(case.joinpath("ENTDADOS.DAT"), ns=(0, 0))
+    service.synthesize(str(case), sistema=["REE"])
+    assert service.misses == 2
+    assert service.num_cases == 1
+    Deck.clear_cache()
+
+
+def test_service_restores_deck_state(test_settings, tmp_path):
+    case = _copy_case(tmp_path)
+    Deck.clear_cache()
+    deck_data = Deck.DECK_DATA_CACHING
+    required_columns = Deck.REQUIRED_COLUMNS
+    service = SynthesisService()
+    service.synthesize(str(case), sistema=["REE"])
+    # O estado do caso é mantido no serviço, sem alterar o do Deck
+    assert Deck.DECK_DATA_CACHING is deck_data
+    assert Deck.REQUIRED_COLUMNS is required_columns
+    assert Deck.STORE is None
+    assert not deck_data
+    assert service._cases[case.resolve()].deck_data
+
+
+def test_server_arrow_stream(test_settings, tmp_path):
+    case = _copy_case(tmp_path)
+    server = SynthesisServer(("127.0.0.1", 0), SynthesisService())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        url = f"http://{host}:{port}"
+        job = {
+            "caminho": str(case),
+            "sistema": ["REE"],
+            "saida": "arrow",
+            "chave": "REE",
+        }
+        content_type, body = _post(f"{url}/sintese", job)
+        assert content_type == ARROW_STREAM_CONTENT_TYPE
+        table = pa.ipc.open_stream(body).read_all()
+        assert table.num_rows == 12
+        _post(f"{url}/sintese", job)
+        with urllib.request.urlopen(f"{url}/saude") as res:
+            health = json.loads(res.read())
+        assert health == {"casos": 1, "acertos_cache": 1, "faltas_cache": 1}
+    finally:
+        server.shutdown()
+        server.server_close()
+        Deck.clear_cache()
@@ -1,7 +1,12 @@
+import os
+import pathlib
+import zipfile
 from unittest.mock import patch
 
 import pandas as pd
+import pytest
 
+from app.model.settings import Settings
 from app.services.unitofwork import factory
 from tests.conftest import DECK_TEST_DIR
 
@@ -13,3 +18,61 @@ def test_fs_uow(test_settings):
         assert entdados is not None
         with patch("pyarrow.parquet.write_table"):
             uow.export.synthetize_df(pd.DataFrame(), "CMO_SBM")
+
+
+def test_memory_uow(test_settings):
+    uow = factory("MEMORY", DECK_TEST_DIR)
+    with uow:
+        entdados = uow.files.get_entdados()
+        assert entdados is not None
+        uow.export.synthetize_df(pd.DataFrame({"valor": [1.0]}), "CMO_SBM")
+    assert "CMO_SBM" in uow.export.tables
+
+
+def test_fs_uow_archive(test_settings, tmp_path):
+    archive = tmp_path.joinpath("caso.zip")
+    with zipfile.ZipFile(archive, "w") as zf:
+        for name in os.listdir(DECK_TEST_DIR):
+            path = os.path.join(DECK_TEST_DIR, name)
+            if os.path.isfile(path):
+                zf.write(path, name)
+    uow = factory("FS", str(archive))
+    with uow:
+        pdo = uow.files.get_pdo_sist()
+        assert isinstance(pdo.tabela, pd.DataFrame)
+        assert os.getcwd() == str(tmp_path.joinpath("caso"))
+    assert tmp_path.joinpath("caso", Settings().synthesis_dir).is_dir()
+
+
+def test_fs_uow_fork(test_settings):
+    uow = factory("FS", DECK_TEST_DIR)
+    previous = os.getcwd()
+    workdir = str(pathlib.Path(DECK_TEST_DIR).resolve())
+    system = uow.fork()
+    operation = uow.fork()
+    system.subdir = "sistema"
+    operation.subdir = "operacao"
+    with system:
+        with operation:
+            assert system.files is operation.files
+            assert system.export is not operation.export
+            assert system.export.path.name == "sistema"
+            assert operation.export.path.name == "operacao"
+        # O diretório de trabalho é restaurado apenas na última saída
+        assert os.getcwd() == workdir
+    assert os.getcwd() == previous
+
+
+def test_concurrent_uow_other_directory(test_settings, tmp_path):
+    previous = os.getcwd()
+    workdir = str(pathlib.Path(DECK_TEST_DIR).resolve())
+    uow = factory("MEMORY", DECK_TEST_DIR)
+    other = factory("MEMORY", str(tmp_path))
+    with uow:
+        # O diretório de trabalho do processo não é trocado enquanto
+        # outra unidade de trabalho estiver em uso
+        with pytest.raises(RuntimeError):
+            with other:
+                pass
+        assert os.getcwd() == workdir
+    assert os.getcwd() == previous
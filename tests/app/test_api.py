@@ -0,0 +1,20 @@
+import pyarrow as pa
+
+from app.api import synthesize
+from app.internal.constants import SYSTEM_SYNTHESIS_METADATA_OUTPUT
+from app.services.deck.deck import Deck
+from tests.conftest import DECK_TEST_DIR
+
+
+def test_synthesize_in_memory(test_settings):
+    tables = synthesize(DECK_TEST_DIR, sistema=["SBM", "REE", "UTE"])
+    assert set(tables.keys()) == {
+        "SBM",
+        "REE",
+        "UTE",
+        SYSTEM_SYNTHESIS_METADATA_OUTPUT,
+    }
+    assert all(isinstance(t, pa.Table) for t in tables.values())
+    assert tables["REE"].num_rows == 12
+    assert tables[SYSTEM_SYNTHESIS_METADATA_OUTPUT].num_rows == 3
+    assert len(Deck.DECK_DATA_CACHING) == 0
@@ -0,0 +1,74 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from app.app import app
+
+HEAVY_MODULES = ["pandas", "pyarrow", "numpy", "idessem"]
+# Orçamento para importação da CLI, em microssegundos
+IMPORT_TIME_BUDGET = 300_000
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_help_does_not_import_heavy_modules():
+    result = _run_python(
+        "-c",
+        "import sys, main; "
+        "print(','.join(m for m in sys.modules if '.' not in m))",
+    )
+    loaded = set(result.stdout.strip().split(","))
+    assert loaded.isdisjoint(HEAVY_MODULES)
+
+
+def test_cli_import_time_budget():
+    result = _run_python("-X", "importtime", "-c", "import main")
+    cumulative = [
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.split("|")[-1].strip() == "main"
+    ]
+    assert len(cumulative) == 1
+    assert cumulative[0] < IMPORT_TIME_BUDGET
+
+
+def test_help_lists_commands():
+    result = CliRunner().invoke(app, ["--help"])
+    assert result.exit_code == 0
+    for command in ["sistema", "operacao", "execucao", "completa", "limpeza"]:
+        assert command in result.output
+
+
+@pytest.mark.parametrize(
+    "option",
+    [["--codigos", "a,b"], ["--estagios", "x"], ["--estagios", "1-y"]],
+)
+def test_consulta_invalid_option(tmp_path, option):
+    result = CliRunner().invoke(
+        app, ["consulta", str(tmp_path), "CMO_SBM", *option]
+    )
+    assert result.exit_code == 2
+    assert option[0] in result.output
+    assert not isinstance(result.exception, ValueError)
+
+
+@pytest.mark.parametrize(
+    "command", ["sistema", "operacao", "execucao", "completa"]
+)
+def test_profiling_options(command):
+    result = CliRunner().invoke(app, [command, "--help"])
+    assert result.exit_code == 0
+    for option in ["--perfil", "--memoria", "--sem-desempenho", "--perfilar"]:
+        assert option in result.output
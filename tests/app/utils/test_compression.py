@@ -0,0 +1,27 @@
+import io
+import sys
+import types
+
+from app.utils.compression import open_zstd
+
+
+def test_open_zstd_prefers_stdlib(monkeypatch):
+    # O módulo `compression.zstd` também define um `ZstdDecompressor`,
+    # sem o fluxo de leitura do pacote zstandard
+    class ZstdDecompressor:
+        pass
+
+    class ZstdFile(io.BytesIO):
+        def __init__(self, fileobj):
+            super().__init__(fileobj.read())
+
+    zstd = types.ModuleType("compression.zstd")
+    zstd.ZstdDecompressor = ZstdDecompressor  # type: ignore
+    zstd.ZstdFile = ZstdFile  # type: ignore
+    compression = types.ModuleType("compression")
+    compression.zstd = zstd  # type: ignore
+    monkeypatch.setitem(sys.modules, "compression", compression)
+    monkeypatch.setitem(sys.modules, "compression.zstd", zstd)
+    f = open_zstd(io.BytesIO(b"conteudo"))
+    assert isinstance(f, ZstdFile)
+    assert f.read() == b"conteudo"
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.memory import MemoryProfiler, deep_sizeof
+from app.utils.tracing import Tracer
+
+
+class _Slotted:
+    __slots__ = ("__data",)
+
+    def __init__(self, data):
+        self.__data = data
+
+
+def test_deep_sizeof_counts_nested_buffers():
+    df = pd.DataFrame({"valor": np.zeros(10_000)})
+    assert deep_sizeof(df) >= 80_000
+    # Objetos compartilhados são contados uma única vez
+    assert deep_sizeof({"a": df, "b": [df, df]}) < 2 * deep_sizeof(df)
+    assert deep_sizeof(_Slotted(df)) >= deep_sizeof(df)
+
+
+def test_memory_profiler_nested_peaks():
+    import tracemalloc
+
+    profiler = MemoryProfiler()
+    tracemalloc.start()
+    Tracer.add_listener(profiler)
+    try:
+        with Tracer.span("sintese", chave="CMO_SBM"):
+            with Tracer.span("deck", tabela="pdo_sist", cache=False):
+                temporary = np.ones(1_000_000)
+                del temporary
+            with Tracer.span("deck", tabela="pdo_sist", cache=True):
+                pass
+            retained = np.ones(100_000)
+    finally:
+        Tracer.remove_listener(profiler)
+        tracemalloc.stop()
+
+    deck, synthesis = profiler.records
+    assert (deck.stage, deck.target) == ("deck", "pdo_sist")
+    assert (synthesis.stage, synthesis.target) == ("sintese", "CMO_SBM")
+    assert deck.peak >= 8_000_000
+    assert deck.allocated < 1_000_000
+    assert synthesis.peak >= deck.peak
+    assert synthesis.allocated >= 800_000
+    assert profiler.top(1) == [synthesis]
+    assert retained.size == 100_000
@@ -0,0 +1,105 @@
+from os.path import join
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from idessem.dessem.pdo_oper_term import PdoOperTerm
+
+from app.model.settings import Settings
+from app.utils.operations import (
+    IncrementalStatistics,
+    QuantileSketch,
+    calc_scenario_statistics,
+    calc_statistics,
+    fast_group_df,
+    numeric_columns,
+)
+from tests.conftest import DECK_TEST_DIR
+
+
+def __group_with_kernel(kernel: str, *args, **kwargs) -> pd.DataFrame:
+    with patch.object(Settings(), "grouping_kernel", kernel):
+        return fast_group_df(*args, **kwargs)
+
+
+@pytest.mark.parametrize("operation", ["sum", "min", "max", "mean", "std"])
+@pytest.mark.parametrize("sort", [True, False])
+def test_arrow_kernel_matches_pandas(test_settings, operation, sort):
+    df = pd.DataFrame(
+        {
+            "estagio": [2, 1, 2, 1, 3, 3, 1],
+            "codigo_submercado": pd.array([1, 2, 1, 2, 1, None, 2], "Int64"),
+            "valor": [1.0, np.nan, 3.0, 4.0, np.nan, 6.0, 7.0],
+        }
+    )
+    args = (df, ["estagio", "codigo_submercado"], ["valor"], operation)
+    df_pandas = __group_with_kernel("PANDAS", *args, sort=sort)
+    df_arrow = __group_with_kernel("ARROW", *args, sort=sort)
+    pd.testing.assert_frame_equal(df_pandas, df_arrow)
+
+
+def test_arrow_kernel_matches_pandas_pdo_oper_term(test_settings):
+    df = PdoOperTerm.read(join(DECK_TEST_DIR, "PDO_OPER_TERM.DAT")).tabela
+    keys = ["estagio", "codigo_usina", "nome_submercado"]
+    args = (df, keys, numeric_columns(df, keys), "sum")
+    df_pandas = __group_with_kernel("PANDAS", *args, sort=True)
+    df_arrow = __group_with_kernel("ARROW", *args, sort=True)
+    pd.testing.assert_frame_equal(df_pandas, df_arrow)
+
+
+def test_calc_statistics_mean_only():
+    df = pd.DataFrame(
+        {
+            "estagio": [1, 2, 1, 2],
+            "cenario": [1, 1, 2, 2],
+            "valor": [1.0, 2.0, 3.0, 6.0],
+        }
+    )
+    df_stats = calc_statistics(df)
+    assert df_stats["cenario"].unique().tolist() == ["mean"]
+    assert df_stats["valor"].tolist() == [2.0, 4.0]
+
+
+def test_incremental_statistics_matches_calc_scenario_statistics(test_settings):
+    df = pd.DataFrame(
+        {
+            "estagio": [1, 2, 1, 2, 3, 1, 2],
+            "patamar": [1, 1, 1, 1, 1, 1, 1],
+            "cenario": [1, 1, 2, 2, 2, 3, 3],
+            "valor": [1.0, 2.0, 3.0, np.nan, 4.0, 5.0, 6.0],
+        }
+    )
+    statistics = IncrementalStatistics()
+    for _, df_scenario in df.groupby("cenario"):
+        statistics.add(df_scenario)
+    pd.testing.assert_frame_equal(
+        statistics.result(), calc_scenario_statistics(df), check_dtype=False
+    )
+
+
+def test_quantile_sketch_exact_up_to_capacity():
+    sketch = QuantileSketch(erro=0.01)
+    for value in range(100):
+        sketch.add(np.array([[float(value)]]))
+    assert sketch.exact
+    assert sketch.quantiles([0.5])[0, 0] == 49.5
+    sketch.add(np.array([[100.0]]))
+    assert not sketch.exact
+
+
+def test_quantile_sketch_error_bound():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(4, 4000))
+    sketch = QuantileSketch(erro=0.01)
+    other = QuantileSketch(erro=0.01)
+    for i in range(0, 2000, 10):
+        sketch.add(values[:, i : i + 10])
+        other.add(values[:, 2000 + i : 2010 + i])
+    sketch.merge(other)
+    assert not sketch.exact
+    quantiles = [0.05, 0.5, 0.95]
+    estimates = sketch.quantiles(quantiles)
+    ranks = (values[:, :, None] <= estimates[:, None, :]).mean(axis=1)
+    assert np.abs(ranks - quantiles).max() < 0.05
+    assert sum(level.shape[1] for level in sketch.levels) < 1000
@@ -0,0 +1,46 @@
+import pstats
+
+from app.utils.profiler import CallProfiler, ProfileTarget
+from app.utils.tracing import Span, Tracer, traced
+
+
+@traced("deck", tabela="pdo_oper_term", coluna=lambda col: col)
+def _build(col: str) -> int:
+    return sum(range(1000))
+
+
+def test_parse_targets():
+    synthesis, deck = ProfileTarget.parse("GTER_UTE, deck:pdo_oper_*,")
+    assert (synthesis.stage, synthesis.target) == ("sintese", "GTER_UTE")
+    assert (deck.stage, deck.target) == ("deck", "pdo_oper_*")
+    assert deck.matches(Span("deck", {"tabela": "pdo_oper_term"}))
+    assert not deck.matches(
+        Span("deck", {"tabela": "pdo_oper_term", "cache": True})
+    )
+    assert not deck.matches(Span("leitura", {"arquivo": "pdo_oper_term"}))
+    assert synthesis.matches(Span("sintese", {"chave": "GTER_UTE"}))
+
+
+def test_call_profiler_writes_pstats(tmp_path):
+    profiler = CallProfiler(
+        ProfileTarget.parse("deck:pdo_oper_term,GTER_UTE"), str(tmp_path)
+    )
+    Tracer.add_listener(profiler)
+    try:
+        _build("geracao")
+        _build("geracao")
+        with Tracer.span("sintese", chave="GTER_UTE"):
+            # Incluído no perfil da síntese
+            _build("geracao")
+        with Tracer.span("sintese", chave="CMO_SBM"):
+            pass
+    finally:
+        Tracer.remove_listener(profiler)
+
+    assert [p.split("/")[-1] for p in profiler.files] == [
+        "deck_pdo_oper_term.pstats",
+        "deck_pdo_oper_term_2.pstats",
+        "sintese_GTER_UTE.pstats",
+    ]
+    stats = pstats.Stats(profiler.files[-1])
+    assert any(f[2] == "_build" for f in stats.stats)
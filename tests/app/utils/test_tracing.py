@@ -0,0 +1,85 @@
+import json
+from os.path import join
+
+import pytest
+
+from app.api import synthesize
+from app.utils.timing import time_and_log
+from app.utils.tracing import Tracer, trace_session, traced
+from tests.conftest import DECK_TEST_DIR
+
+
+def test_span_inactive_is_null():
+    with Tracer.span("leitura", arquivo="PDO_SIST.DAT") as span:
+        span.set(linhas=10)
+    assert not Tracer.active()
+    assert Tracer.stop() == []
+
+
+def test_nested_spans():
+    @traced("interno")
+    def inner():
+        return 1
+
+    Tracer.start()
+    with (
+        time_and_log(message_root="Externo", span="externo", chave="CMO_SBM"),
+        Tracer.span("meio") as span,
+    ):
+        inner()
+        span.set(linhas=5)
+    spans = {s.name: s for s in Tracer.stop()}
+    assert spans["interno"].parent_id == spans["meio"].span_id
+    assert spans["meio"].parent_id == spans["externo"].span_id
+    assert spans["externo"].parent_id is None
+    assert spans["externo"].attributes == {"chave": "CMO_SBM"}
+    assert spans["meio"].attributes == {"linhas": 5}
+    assert spans["externo"].duration >= spans["meio"].duration
+
+
+def test_span_records_error():
+    Tracer.start()
+    with pytest.raises(ValueError), Tracer.span("falha"):
+        raise ValueError()
+    [span] = Tracer.stop()
+    assert span.attributes["erro"] == "ValueError"
+
+
+def test_trace_session_exports_profiles(test_settings, tmp_path):
+    with trace_session(str(tmp_path)) as session:
+        synthesize(DECK_TEST_DIR, sistema=["SBM", "UTE"])
+    assert not Tracer.active()
+
+    names = {s.name for s in session.spans}
+    assert {
+        "leitura",
+        "deck",
+        "familia",
+        "sintese",
+        "resolucao",
+        "exportacao",
+        "escrita",
+    } <= names
+    resolve = next(
+        s
+        for s in session.spans
+        if s.name == "resolucao" and s.attributes["chave"] == "UTE"
+    )
+    assert resolve.attributes["linhas"] > 0
+    reads = [s for s in session.spans if s.name == "leitura"]
+    assert all(s.attributes["bytes"] > 0 for s in reads)
+    builds = [
+        s
+        for s in session.spans
+        if s.name == "deck" and s.attributes["tabela"] == "thermals"
+    ]
+    assert builds[0].attributes["cache"] is False
+    assert builds[0].attributes["linhas"] == resolve.attributes["linhas"]
+
+    with open(join(tmp_path, trace_session.JSONL_FILENAME)) as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == len(session.spans)
+    with open(join(tmp_path, trace_session.CHROME_FILENAME)) as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == len(session.spans)
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)